@@ -0,0 +1,73 @@
+"""
+Benchmark the compiled layout kernels (generator_cy) against the pure Python ones.
+
+Build the extension first with `python setup.py build_ext --inplace`.
+
+Usage:
+    python benchmarks/bench_cython.py [--words 1000] [--repeat 50]
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import config
+from src.quote_maker import layout
+from src.quote_maker.font_cache import get_font
+
+
+WORDS = "the quick brown fox jumps over a lazy dog while wisdom begins in wonder and ends in action".split()
+
+
+def best(func, repeat):
+    """Best wall time of a single call, in milliseconds."""
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def bench_stages(kernels, metrics, words, max_width, repeat):
+    """Time the measure, wrap and place stages with the given kernels."""
+    measured_words, widths = kernels['measure_words'](metrics, words, max_width)
+    lines = kernels['wrap_widths'](widths, metrics.space_width, max_width)
+    line_widths = [line_width for _, _, line_width in lines]
+    return {
+        'measure': best(lambda: kernels['measure_words'](metrics, words, max_width), repeat),
+        'wrap': best(lambda: kernels['wrap_widths'](widths, metrics.space_width, max_width), repeat),
+        'place': best(lambda: kernels['place_lines'](line_widths, metrics.line_height,
+                                                     config.IMAGE_WIDTH, config.IMAGE_HEIGHT), repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark compiled layout kernels')
+    parser.add_argument('--words', type=int, default=1000, help='Number of words per input')
+    parser.add_argument('--repeat', type=int, default=50, help='Number of timed runs')
+    args = parser.parse_args()
+
+    try:
+        from src.quote_maker import generator_cy
+    except ImportError:
+        sys.exit("generator_cy is not built; run `python setup.py build_ext --inplace` first")
+
+    rng = random.Random(0)
+    words = [rng.choice(WORDS) for _ in range(args.words)]
+    metrics = layout.get_word_metrics(get_font(config.FONT_PATH, config.FONT_SIZE))
+    max_width = config.IMAGE_WIDTH - 2 * config.TEXT_MARGIN
+    metrics.widths.clear()
+    layout.PY_KERNELS['measure_words'](metrics, words, max_width)
+
+    compiled_kernels = {name: getattr(generator_cy, name) for name in layout.PY_KERNELS}
+    python = bench_stages(layout.PY_KERNELS, metrics, words, max_width, args.repeat)
+    compiled = bench_stages(compiled_kernels, metrics, words, max_width, args.repeat)
+
+    print(f"{args.words} words, best of {args.repeat} (warm width cache)")
+    print(f"  {'stage':<10} {'python':>10} {'compiled':>10} {'speedup':>8}")
+    for stage in python:
+        print(f"  {stage:<10} {python[stage]:8.3f}ms {compiled[stage]:8.3f}ms {python[stage] / compiled[stage]:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark random quote selection from SQLite as the table grows.
+
+Compares the old per-call connect + ORDER BY RANDOM() query with the pooled
+rowid-seek selection of DatabaseQuoteSource.
+
+Usage:
+    python benchmarks/bench_database.py [--sizes 10000 100000 1000000] [--picks 200]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.quote_maker.quote_fetcher import DatabaseQuoteSource
+
+
+def create_database(db_path, rows):
+    """Create a quotes table with the given number of rows."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE quotes (id INTEGER PRIMARY KEY, text TEXT, author TEXT)")
+    conn.executemany("INSERT INTO quotes (text, author) VALUES (?, ?)",
+                     ((f"Quote number {i} about patience and time", f"Author {i % 500}") for i in range(rows)))
+    conn.commit()
+    conn.close()
+
+
+def legacy_pick(db_path):
+    """The previous implementation: new connection and a full-table random sort."""
+    conn = sqlite3.connect(db_path)
+    result = conn.execute("SELECT text, author FROM quotes ORDER BY RANDOM() LIMIT 1").fetchone()
+    conn.close()
+    return result
+
+
+def mean_ms(func, picks):
+    """Mean wall time of one call, in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(picks):
+        func()
+    return (time.perf_counter() - start) / picks * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark DatabaseQuoteSource selection')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000], help='Table sizes')
+    parser.add_argument('--picks', type=int, default=200, help='Random picks per measurement')
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'legacy':>12} {'pooled':>12} {'pooled x100':>14}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for rows in args.sizes:
+            db_path = os.path.join(temp_dir, f"quotes_{rows}.db")
+            create_database(db_path, rows)
+            source = DatabaseQuoteSource(db_path)
+            source.get_quote()
+
+            legacy = mean_ms(lambda: legacy_pick(db_path), max(args.picks // 10, 1))
+            pooled = mean_ms(source.get_quote, args.picks)
+            batched = mean_ms(lambda: source.get_quotes(100), max(args.picks // 100, 1))
+            print(f"{rows:>10} {legacy:>10.3f}ms {pooled:>10.3f}ms {batched:>12.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark the pixel layout engine against the legacy character-based wrapping.
+
+Usage:
+    python benchmarks/bench_layout.py [--words 1000] [--repeat 20]
+"""
+
+import argparse
+import random
+import sys
+import textwrap
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import config
+from src.quote_maker import layout
+from src.quote_maker.font_cache import get_font
+
+
+WORDS = "the quick brown fox jumps over a lazy dog while wisdom begins in wonder and ends in action".split()
+
+
+def legacy_layout(text, font):
+    """The previous path: wrap at FONT_SIZE characters, getbbox on every line."""
+    lines = textwrap.TextWrapper(width=config.FONT_SIZE).wrap(text=text)
+    y_text = (config.IMAGE_HEIGHT - len(lines) * config.FONT_SIZE) / 2
+    placed = []
+    for line in lines:
+        bbox = font.getbbox(line)
+        placed.append((line, (config.IMAGE_WIDTH - (bbox[2] - bbox[0])) / 2, y_text))
+        y_text += bbox[3] - bbox[1]
+    return placed
+
+
+def pixel_layout(text, font):
+    """The layout engine with memoized word widths."""
+    return layout.TextLayout(font, config.IMAGE_WIDTH, config.IMAGE_HEIGHT, config.TEXT_MARGIN).layout(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark text layout')
+    parser.add_argument('--words', type=int, default=1000, help='Number of words per input')
+    parser.add_argument('--repeat', type=int, default=20, help='Number of timed runs')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    text = ' '.join(rng.choice(WORDS) for _ in range(args.words))
+    font = get_font(config.FONT_PATH, config.FONT_SIZE)
+
+    layout._metrics.clear()
+    cold = timeit.timeit(lambda: pixel_layout(text, font), number=1)
+    results = {
+        'legacy': min(timeit.repeat(lambda: legacy_layout(text, font), number=1, repeat=args.repeat)),
+        'layout (cold cache)': cold,
+        'layout (warm cache)': min(timeit.repeat(lambda: pixel_layout(text, font), number=1, repeat=args.repeat)),
+    }
+
+    print(f"{args.words} words, best of {args.repeat}")
+    for name, seconds in results.items():
+        print(f"  {name:<20} {seconds * 1000:8.2f} ms")
+    print(f"  speedup (warm)       {results['legacy'] / results['layout (warm cache)']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
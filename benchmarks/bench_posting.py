@@ -0,0 +1,138 @@
+"""
+Benchmark posting throughput and tail latency against the local mock Graph API.
+
+Modes:
+    sequential  one FacebookPoster.post_image call after another
+    concurrent  SocialPoster.post_to_all_platforms fanning out over --pages pages
+    queued      PostQueue + PostScheduler draining posts for --pages pages
+
+Usage:
+    python benchmarks/bench_posting.py [--posts 200] [--pages 4] [--latency 0.05]
+                                       [--error-rate 0.0] [--rate-limit 50] [--modes sequential concurrent queued]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.config import ConfigManager
+from src.quote_maker.facebook import FacebookPoster, SocialPoster
+from src.quote_maker.http_session import HTTPClient
+from src.quote_maker.mock_graph import MockGraphServer
+from src.quote_maker.post_queue import PostQueue, PostScheduler
+
+
+IMAGE = b"\x89PNG\r\n\x1a\n" + os.urandom(64 * 1024)
+
+
+class TimedPoster(FacebookPoster):
+    """FacebookPoster recording the latency and outcome of every call."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+        self.successes = 0
+        self._lock = threading.Lock()
+
+    def post_image(self, image_path, message):
+        start = time.perf_counter()
+        success = super().post_image(image_path, message)
+        with self._lock:
+            self.latencies.append(time.perf_counter() - start)
+            self.successes += success
+        return success
+
+
+def make_poster(server, client, pages):
+    """SocialPoster with one timed Facebook platform per page."""
+    config_manager = ConfigManager()
+    config_manager.set('FACEBOOK_ACCESS_TOKEN', None)
+    poster = SocialPoster(config_manager)
+    for page in range(pages):
+        poster.add_platform(f"page_{page}", TimedPoster(f"page_{page}", 'token', server.url, client))
+    return poster
+
+
+def run_sequential(poster, posts):
+    platform = next(iter(poster.platforms.values()))
+    for number in range(posts):
+        platform.post_image(IMAGE, f"Quote {number}")
+
+
+def run_concurrent(poster, posts):
+    for number in range(max(posts // len(poster.platforms), 1)):
+        poster.post_to_all_platforms(IMAGE, f"Quote {number}")
+
+
+def run_queued(poster, posts, temp_dir, rate_limit):
+    queue = PostQueue(os.path.join(temp_dir, f"queue_{time.monotonic_ns()}.db"))
+    platform_names = list(poster.platforms)
+    for number in range(posts):
+        queue.enqueue(platform_names[number % len(platform_names)], IMAGE, f"Quote {number}")
+    rate_limits = {name: rate_limit * 60 / len(platform_names) for name in platform_names} if rate_limit else None
+    scheduler = PostScheduler(queue, poster, rate_limits=rate_limits, batch_size=10, max_attempts=20,
+                              backoff_base=0.05, backoff_max=1.0, poll_interval=0.01)
+    try:
+        scheduler.drain()
+    finally:
+        scheduler.close()
+        queue.pool.close()
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark posting against a mock Graph API')
+    parser.add_argument('--posts', type=int, default=200, help='Posts per mode')
+    parser.add_argument('--pages', type=int, default=4, help='Pages (platforms) for the concurrent and queued modes')
+    parser.add_argument('--latency', type=float, default=0.05, help='Mock server seconds per post')
+    parser.add_argument('--jitter', type=float, default=0.02, help='Mock server random extra seconds per post')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of posts failing with 500')
+    parser.add_argument('--rate-limit', type=float, help='Mock server posts per second before 429')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds of 429 responses')
+    parser.add_argument('--modes', nargs='+', default=['sequential', 'concurrent', 'queued'],
+                        choices=['sequential', 'concurrent', 'queued'], help='Modes to run')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'mode':>10} {'posted':>7} {'calls':>6} {'posts/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'429s':>5}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for mode in args.modes:
+            server = MockGraphServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                                     rate_limit=args.rate_limit, retry_after=args.retry_after).start()
+            client = HTTPClient(pool_size=args.pages * 2, retries=0, max_per_host=args.pages * 2)
+            client.session.trust_env = False
+            poster = make_poster(server, client, 1 if mode == 'sequential' else args.pages)
+
+            start = time.perf_counter()
+            if mode == 'sequential':
+                run_sequential(poster, args.posts)
+            elif mode == 'concurrent':
+                run_concurrent(poster, args.posts)
+            else:
+                run_queued(poster, args.posts, temp_dir, args.rate_limit)
+            elapsed = time.perf_counter() - start
+
+            latencies = [latency for platform in poster.platforms.values() for latency in platform.latencies]
+            posted = sum(platform.successes for platform in poster.platforms.values())
+            print(f"{mode:>10} {posted:>7} {len(latencies):>6} {posted / elapsed:>9.1f} "
+                  f"{percentile(latencies, 0.5) * 1000:>7.1f}ms {percentile(latencies, 0.95) * 1000:>7.1f}ms "
+                  f"{percentile(latencies, 0.99) * 1000:>7.1f}ms {server.stats()['throttled']:>5}")
+
+            client.close()
+            server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,95 @@ Configuration management for the Quote Maker application.
 import os
 import json
 import logging
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
 
+# Image modes the background colors and white text are drawn in
+RENDER_IMAGE_TYPES = ('RGB', 'RGBA')
+
+
+@dataclass(frozen=True, slots=True)
+class RenderSettings:
+    """
+    Immutable snapshot of the settings used to render an image.
+
+    A snapshot is validated once when it is created; renders then read
+    plain attributes and cannot see configuration changes half-way.
+    """
+    font_path: str
+    font_size: int
+    image_type: str
+    image_width: int
+    image_height: int
+    bg_colors: Tuple[Tuple[int, ...], ...]
+    text_margin: int = 0
+    render_cache_dir: Optional[str] = None
+    render_cache_max_bytes: int = 512 * 1024 * 1024
+    batch_workers: Optional[int] = None
+    
+    def __post_init__(self):
+        """Validate the settings."""
+        for key, value in (('FONT_SIZE', self.font_size), ('IMAGE_WIDTH', self.image_width),
+                           ('IMAGE_HEIGHT', self.image_height),
+                           ('RENDER_CACHE_MAX_BYTES', self.render_cache_max_bytes)):
+            if not _is_positive_int(value):
+                raise ValueError(f"{key} must be a positive integer, got {value!r}")
+        if self.batch_workers is not None and not _is_positive_int(self.batch_workers):
+            raise ValueError(f"BATCH_WORKERS must be a positive integer, got {self.batch_workers!r}")
+        if not isinstance(self.font_path, str) or not self.font_path:
+            raise ValueError("FONT_PATH must be a file path")
+        if self.image_type not in RENDER_IMAGE_TYPES:
+            raise ValueError(f"IMAGE_TYPE must be one of {', '.join(RENDER_IMAGE_TYPES)}, got {self.image_type!r}")
+        if not isinstance(self.text_margin, int) or not 0 <= 2 * self.text_margin < self.image_width:
+            raise ValueError(f"TEXT_MARGIN must leave room for text, got {self.text_margin!r}")
+        if not self.bg_colors:
+            raise ValueError("IMAGE_BG_COLORS must list at least one color")
+        for color in self.bg_colors:
+            if len(color) not in (3, 4) or not all(isinstance(c, int) and 0 <= c <= 255 for c in color):
+                raise ValueError(f"IMAGE_BG_COLORS entries must be RGB(A) values from 0 to 255, got {color!r}")
+    
+    @classmethod
+    def from_config(cls, config_manager) -> 'RenderSettings':
+        """
+        Create a snapshot of the render settings in the configuration.
+        
+        Args:
+            config_manager: Configuration manager instance, or the config module
+            
+        Returns:
+            The validated settings.
+            
+        Raises:
+            ValueError: If a setting is invalid.
+        """
+        def get(key, default=None):
+            return getattr(config_manager, key, default)
+        
+        try:
+            bg_colors = tuple(tuple(color) for color in get('IMAGE_BG_COLORS') or ())
+        except TypeError:
+            raise ValueError(f"IMAGE_BG_COLORS must be a list of colors, got {get('IMAGE_BG_COLORS')!r}")
+        return cls(
+            font_path=get('FONT_PATH'),
+            font_size=get('FONT_SIZE'),
+            image_type=get('IMAGE_TYPE'),
+            image_width=get('IMAGE_WIDTH'),
+            image_height=get('IMAGE_HEIGHT'),
+            bg_colors=bg_colors,
+            text_margin=get('TEXT_MARGIN') or 0,
+            render_cache_dir=get('RENDER_CACHE_DIR') or None,
+            render_cache_max_bytes=get('RENDER_CACHE_MAX_BYTES') or 512 * 1024 * 1024,
+            batch_workers=get('BATCH_WORKERS') or None,
+        )
+
+
+def _is_positive_int(value: Any) -> bool:
+    """Check for an int above zero, rejecting bools."""
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
 class ConfigManager:
     """Manages application configuration from multiple sources."""
     
@@ -21,6 +106,7 @@ class ConfigManager:
             config_file: Path to configuration file (optional)
         """
         self.logger = logging.getLogger(__name__)
+        self.config_file = config_file
         self.config_data: Dict[str, Any] = {}
         self._load_defaults()
         
@@ -37,19 +123,68 @@ class ConfigManager:
             'FONT_SIZE': 50,
             
             # Image settings
-            'IMAGE_TYPE': 'RGBA',
+            'IMAGE_TYPE': 'RGB',
             'IMAGE_WIDTH': 1200,
             'IMAGE_HEIGHT': 600,
             'IMAGE_BG_COLORS': [(255, 0, 0), (51, 0, 51), (0, 0, 255), (0, 0, 0)],
+            'TEXT_MARGIN': 40,
+            
+            # Output encoder settings
+            'OUTPUT_FORMAT': 'PNG',
+            'ENCODER_PROFILE': None,
+            'PNG_COMPRESS_LEVEL': 6,
+            'JPEG_QUALITY': 85,
+            'WEBP_QUALITY': 80,
+            
+            # Render cache settings (disabled unless a directory is set)
+            'RENDER_CACHE_DIR': None,
+            'RENDER_CACHE_MAX_BYTES': 512 * 1024 * 1024,
+            
+            # Batch rendering settings
+            'BATCH_WORKERS': None,
             
             # Facebook API settings
             'FACEBOOK_PAGE_ID': 'your_page_id',
             'FACEBOOK_ACCESS_TOKEN': None,
+            'FACEBOOK_GRAPH_URL': 'https://graph.facebook.com',
+            
+            # Seconds each platform may take when posting to all platforms,
+            # overridden per platform by POST_TIMEOUTS (e.g. {'facebook': 30})
+            'POST_TIMEOUT': 45,
+            'POST_TIMEOUTS': {},
+            
+            # Durable post queue (disabled unless a path is set)
+            'POST_QUEUE_PATH': None,
+            'POST_RATE_LIMITS': {'facebook': 30},  # Posts per minute per platform
+            'POST_BATCH_SIZE': 10,
+            'POST_MAX_ATTEMPTS': 8,
+            'POST_BACKOFF_BASE': 30.0,
+            'POST_BACKOFF_MAX': 3600.0,
+            'POST_CLAIM_LEASE': 900.0,  # Seconds before posts claimed by a stopped scheduler are sent again
+            
+            # Scheduled campaigns (see the readme for the entry format)
+            'CAMPAIGNS': [],
+            'CAMPAIGN_STATE_PATH': 'campaign_state.json',
+            'CAMPAIGN_PRERENDER_SECONDS': 600,
+            'CAMPAIGN_GRACE_SECONDS': 300,
+            
+            # Daemon mode settings
+            'DAEMON_HOST': '127.0.0.1',
+            'DAEMON_PORT': 8080,
+            'DAEMON_DRAIN_TIMEOUT': 30,
+            
+            # HTTP session settings shared by API sources and platforms
+            'HTTP_POOL_SIZE': 10,
+            'HTTP_RETRIES': 3,
+            'HTTP_BACKOFF_FACTOR': 0.5,
+            'HTTP_MAX_PER_HOST': 8,
             
             # Quote sources
             'DEFAULT_QUOTE_SOURCE': 'manual',
             'QUOTE_API_URL': 'https://api.quotable.io/random',
             'QUOTE_FILE_PATH': 'quotes.json',
+            'QUOTE_STORE_PATH': None,
+            'QUOTE_REPOST_DAYS': 30,
             
             # Logging settings
             'LOG_LEVEL': 'INFO',
@@ -61,20 +196,25 @@ class ConfigManager:
         try:
             config_path = Path(config_file)
             if config_path.exists():
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    file_config = json.load(f)
-                    self.config_data.update(file_config)
-                    self.logger.info(f"Configuration loaded from {config_file}")
+                self.config_data.update(self._read_file(config_path))
+                self.logger.info(f"Configuration loaded from {config_file}")
             else:
                 self.logger.warning(f"Configuration file not found: {config_file}")
         except (json.JSONDecodeError, IOError) as e:
             self.logger.error(f"Error loading configuration file: {e}")
     
+    @staticmethod
+    def _read_file(config_path: Path) -> Dict[str, Any]:
+        """Read the values of a JSON configuration file."""
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
     def _load_from_env(self):
         """Load configuration from environment variables."""
         env_mappings = {
             'FACEBOOK_ACCESS_TOKEN': 'FACEBOOK_ACCESS_TOKEN',
             'FACEBOOK_PAGE_ID': 'FACEBOOK_PAGE_ID',
+            'FACEBOOK_GRAPH_URL': 'FACEBOOK_GRAPH_URL',
             'QUOTE_API_URL': 'QUOTE_API_URL',
             'LOG_LEVEL': 'LOG_LEVEL',
         }
@@ -117,6 +257,45 @@ class ConfigManager:
         """
         self.config_data.update(config_dict)
     
+    def snapshot(self) -> RenderSettings:
+        """
+        Get an immutable snapshot of the current render settings.
+        
+        Returns:
+            The validated settings.
+            
+        Raises:
+            ValueError: If a setting is invalid.
+        """
+        return RenderSettings.from_config(self)
+    
+    def reload(self) -> RenderSettings:
+        """
+        Re-read the configuration file and environment and swap them in at once.
+        
+        The new values are validated before they replace the current ones, so
+        an unreadable file or invalid setting keeps the current configuration.
+        Values changed with set() or update() since loading are dropped.
+        
+        Returns:
+            The render settings of the new configuration.
+            
+        Raises:
+            ValueError: If the file cannot be read or a setting is invalid.
+        """
+        fresh = ConfigManager()
+        if self.config_file:
+            try:
+                fresh.config_data.update(self._read_file(Path(self.config_file)))
+            except (json.JSONDecodeError, IOError) as e:
+                raise ValueError(f"Cannot reload {self.config_file}: {e}")
+            # Environment variables take precedence over the file, as on start-up
+            fresh._load_from_env()
+        settings = fresh.snapshot()
+        self.config_data = fresh.config_data
+        self.logger.info("Configuration reloaded")
+        return settings
+    
     def save_to_file(self, config_file: str):
         """
         Save current configuration to a file.
@@ -139,7 +318,7 @@ class ConfigManager:
     
     def __setattr__(self, name: str, value: Any):
         """Allow attribute-style setting of configuration values."""
-        if name in ['config_data', 'logger']:
+        if name in ['config_data', 'logger', 'config_file']:
             super().__setattr__(name, value)
         else:
             if hasattr(self, 'config_data'):
@@ -148,15 +327,25 @@ class ConfigManager:
                 super().__setattr__(name, value)
 
 
-# Global configuration instance for backward compatibility
-_config_manager = ConfigManager()
+# Global configuration instance for backward compatibility, created on first use
+_config_manager: Optional[ConfigManager] = None
+
+
+def get_config_manager() -> ConfigManager:
+    """Get the global configuration, loading it on first use."""
+    global _config_manager
+    if _config_manager is None:
+        _config_manager = ConfigManager()
+    return _config_manager
+
 
-# Expose configuration values as module-level attributes for backward compatibility
-FONT_PATH = _config_manager.FONT_PATH
-FONT_SIZE = _config_manager.FONT_SIZE
-IMAGE_TYPE = _config_manager.IMAGE_TYPE
-IMAGE_WIDTH = _config_manager.IMAGE_WIDTH
-IMAGE_HEIGHT = _config_manager.IMAGE_HEIGHT
-IMAGE_BG_COLORS = _config_manager.IMAGE_BG_COLORS
-FACEBOOK_PAGE_ID = _config_manager.FACEBOOK_PAGE_ID
-FACEBOOK_ACCESS_TOKEN = _config_manager.FACEBOOK_ACCESS_TOKEN
+def __getattr__(name: str) -> Any:
+    """
+    Expose configuration values such as FONT_PATH as module-level attributes
+    for backward compatibility, without loading the configuration on import.
+    """
+    if not name.startswith('__'):
+        config_data = get_config_manager().config_data
+        if name in config_data:
+            return config_data[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,262 @@
+"""
+Asyncio quote sources and fetcher for the Quote Maker application.
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.quote_maker.http_session import HTTPClient
+from src.quote_maker.quote_fetcher import (
+    QuoteSource, APIQuoteSource, FileQuoteSource, DatabaseQuoteSource, ManualQuoteSource
+)
+
+
+# Thread pool running the blocking I/O (pooled HTTP, sqlite3, mmap reads) of sources used
+# outside an AsyncQuoteFetcher; each fetcher sizes its own pool from max_in_flight
+_IO_WORKERS = 64
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared I/O thread pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_IO_WORKERS, thread_name_prefix='quote-io')
+        return _executor
+
+
+class AsyncQuoteSource(ABC):
+    """Abstract base class for asyncio quote sources."""
+
+    @abstractmethod
+    async def get_quote(self) -> Optional[Dict[str, str]]:
+        """Get a quote from the source."""
+        pass
+
+
+class ThreadedAsyncQuoteSource(AsyncQuoteSource):
+    """Runs a blocking QuoteSource on a thread pool (the fetcher's, or the shared I/O pool)."""
+
+    def __init__(self, source: QuoteSource):
+        self.source = source
+
+    async def get_quote(self) -> Optional[Dict[str, str]]:
+        """Get a quote without blocking the event loop."""
+        return await self.get_quote_in(_get_executor())
+
+    async def get_quote_in(self, executor: ThreadPoolExecutor) -> Optional[Dict[str, str]]:
+        """Get a quote on the given thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.source.get_quote)
+
+
+class AsyncAPIQuoteSource(ThreadedAsyncQuoteSource):
+    """Asyncio quote source from external API, sharing the pooled HTTP session."""
+
+    def __init__(self, api_url: str, headers: Optional[Dict[str, str]] = None, client=None):
+        super().__init__(APIQuoteSource(api_url, headers, client))
+
+
+class AsyncFileQuoteSource(ThreadedAsyncQuoteSource):
+    """Asyncio quote source from local files."""
+
+    def __init__(self, file_path: str):
+        super().__init__(FileQuoteSource(file_path))
+
+
+class AsyncDatabaseQuoteSource(ThreadedAsyncQuoteSource):
+    """Asyncio quote source from SQLite database."""
+
+    def __init__(self, db_path: str, table_name: str = 'quotes'):
+        super().__init__(DatabaseQuoteSource(db_path, table_name))
+
+    async def get_quotes(self, count: int) -> List[Dict[str, str]]:
+        """Get several random quotes in one round trip to the pool."""
+        return await self.get_quotes_in(_get_executor(), count)
+
+    async def get_quotes_in(self, executor: ThreadPoolExecutor, count: int) -> List[Dict[str, str]]:
+        """Get several random quotes on the given thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.source.get_quotes, count)
+
+
+class AsyncQuoteFetcher:
+    """Fans quote requests out across many asyncio sources with timeouts."""
+
+    def __init__(self, max_in_flight: int = 100, timeout: Optional[float] = 10.0,
+                 max_per_host: Optional[int] = None):
+        """
+        Initialize the AsyncQuoteFetcher.
+
+        Blocking sources run on a thread pool of max_in_flight threads owned by
+        the fetcher, and API sources it creates share an HTTP client of their
+        own, so neither the shared I/O pool nor HTTP_MAX_PER_HOST caps them.
+
+        Args:
+            max_in_flight: Maximum number of concurrent fetches
+            timeout: Seconds before a single fetch is abandoned (None waits forever)
+            max_per_host: Maximum concurrent API requests per host (defaults to max_in_flight)
+        """
+        self.sources: List[AsyncQuoteSource] = []
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.max_per_host = max_per_host or max_in_flight
+        self.logger = logging.getLogger(__name__)
+        # One max_in_flight limit per event loop, as asyncio primitives are bound to their loop
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._http_client: Optional[HTTPClient] = None
+        self._lock = threading.Lock()
+
+    def add_source(self, source: AsyncQuoteSource):
+        """Add a quote source."""
+        self.sources.append(source)
+
+    def create_source(self, source_type: str, **kwargs) -> Optional[AsyncQuoteSource]:
+        """Create an asyncio quote source of the given type, or None if the type is unknown."""
+        if source_type == 'api':
+            return AsyncAPIQuoteSource(kwargs.get('api_url'), kwargs.get('headers'), self._get_http_client())
+        elif source_type == 'file':
+            return AsyncFileQuoteSource(kwargs.get('file_path'))
+        elif source_type == 'database':
+            return AsyncDatabaseQuoteSource(kwargs.get('db_path'), kwargs.get('table_name', 'quotes'))
+        elif source_type == 'manual':
+            return ThreadedAsyncQuoteSource(ManualQuoteSource(kwargs.get('text'), kwargs.get('author', 'Unknown')))
+
+        self.logger.error(f"Unknown source type: {source_type}")
+        return None
+
+    async def get_quote(self, source_type: str = 'manual', **kwargs) -> Optional[Dict[str, str]]:
+        """Get quote from specified source type."""
+        source = self.create_source(source_type, **kwargs)
+        if source is None:
+            return None
+        return await self.fetch(source)
+
+    async def fetch(self, source: AsyncQuoteSource) -> Optional[Dict[str, str]]:
+        """
+        Fetch one quote, bounded by max_in_flight and the timeout.
+
+        Args:
+            source: Source to fetch from
+
+        Returns:
+            Quote dictionary or None on timeout or error.
+        """
+        if isinstance(source, ThreadedAsyncQuoteSource):
+            executor = self._get_executor()
+            return await self._bounded(lambda: source.get_quote_in(executor), threaded=True)
+        return await self._bounded(source.get_quote, threaded=False)
+
+    async def fetch_quotes(self, source: AsyncDatabaseQuoteSource, count: int) -> List[Dict[str, str]]:
+        """
+        Fetch several quotes from a database source in one call, bounded like fetch().
+
+        Args:
+            source: Database source to fetch from
+            count: Number of quotes
+
+        Returns:
+            The quotes, or an empty list on timeout or error.
+        """
+        executor = self._get_executor()
+        return await self._bounded(lambda: source.get_quotes_in(executor, count), threaded=True, default=[])
+
+    async def fetch_many(self, source: AsyncQuoteSource, count: int) -> List[Dict[str, str]]:
+        """
+        Fetch several quotes from one source concurrently.
+
+        Args:
+            source: Source to fetch from
+            count: Number of fetches to run
+
+        Returns:
+            The quotes that arrived in time.
+        """
+        quotes = await asyncio.gather(*(self.fetch(source) for _ in range(count)))
+        return [quote for quote in quotes if quote]
+
+    async def get_quotes_from_sources(self) -> List[Optional[Dict[str, str]]]:
+        """Query every source at once and return their results in source order."""
+        return list(await asyncio.gather(*(self.fetch(source) for source in self.sources)))
+
+    async def get_quote_from_sources(self) -> Optional[Dict[str, str]]:
+        """Query every source at once and return the first valid quote."""
+        tasks = [asyncio.ensure_future(self.fetch(source)) for source in self.sources]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                quote = await next_done
+                if quote:
+                    return quote
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def close(self):
+        """Shut down the fetcher's thread pool and HTTP connections."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            http_client, self._http_client = self._http_client, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if http_client is not None:
+            http_client.close()
+
+    async def _bounded(self, request: Callable[[], Awaitable[Any]], threaded: bool, default: Any = None) -> Any:
+        """
+        Run a request under the max_in_flight limit and the timeout.
+
+        A thread cannot be stopped, so a threaded request that times out or is
+        cancelled keeps its slot until its thread finishes; abandoned calls
+        count against the limit instead of piling up on the thread pool.
+        """
+        semaphore = self._get_semaphore()
+        await semaphore.acquire()
+        task = asyncio.ensure_future(request())
+
+        def release(done: asyncio.Future):
+            if not done.cancelled():
+                # Retrieve the outcome so an abandoned failure is not reported as unhandled
+                done.exception()
+            semaphore.release()
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(task) if threaded else task, self.timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Quote fetch timed out after {self.timeout}s")
+        except Exception as e:
+            self.logger.error(f"Error fetching quote: {e}")
+        finally:
+            task.add_done_callback(release)
+        return default
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the max_in_flight limit of the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+        return semaphore
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool running blocking sources, sized to max_in_flight."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight,
+                                                    thread_name_prefix='async-quote-io')
+            return self._executor
+
+    def _get_http_client(self) -> HTTPClient:
+        """Get the HTTP client of the API sources this fetcher creates."""
+        with self._lock:
+            if self._http_client is None:
+                self._http_client = HTTPClient(pool_size=self.max_per_host, max_per_host=self.max_per_host)
+            return self._http_client
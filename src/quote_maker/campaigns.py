@@ -0,0 +1,520 @@
+"""
+Scheduled posting campaigns for the Quote Maker application.
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from src.quote_maker.generator import ImageGenerator
+from src.quote_maker.facebook import SocialPoster
+from src.quote_maker.quote_fetcher import QuoteFetcher, QuoteSource
+
+
+_ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+}
+
+# (low, high) of the minute, hour, day of month, month and day of week fields
+_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+CATCH_UP_POLICIES = ('latest', 'all', 'none')
+
+
+def _parse_field(field: str, low: int, high: int) -> Set[int]:
+    """Parse one cron field (*, lists, ranges and steps) into the values it matches."""
+    values = set()
+    for part in field.split(','):
+        expression, _, step = part.partition('/')
+        if expression == '*':
+            start, end = low, high
+        elif '-' in expression:
+            start, end = (int(value) for value in expression.split('-', 1))
+        else:
+            start = end = int(expression)
+            if step:
+                end = high
+        step = int(step) if step else 1
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"Cron field '{field}' is out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """Five-field cron expression (minute hour day-of-month month day-of-week) in local time."""
+
+    def __init__(self, expression: str):
+        """
+        Initialize the CronSchedule.
+
+        Args:
+            expression: Cron expression such as '30 9 * * 1-5', or an alias such as '@daily'
+
+        Raises:
+            ValueError: If the expression is invalid.
+        """
+        self.expression = expression
+        fields = _ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' must have 5 fields")
+        try:
+            minutes, hours, days, months, weekdays = (
+                _parse_field(field, low, high) for field, (low, high) in zip(fields, _FIELD_RANGES)
+            )
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression '{expression}': {e}")
+        self.minutes = minutes
+        self.hours = hours
+        self.days = days
+        self.months = months
+        self.weekdays = {day % 7 for day in weekdays}
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Get the first time matching the schedule strictly after a moment.
+
+        Args:
+            moment: Local time to search from
+
+        Returns:
+            The next matching local time, to the minute.
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year, month = (candidate.year + 1, 1) if candidate.month == 12 else (candidate.year, candidate.month + 1)
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._matches_day(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+    def last_until(self, moment: datetime) -> datetime:
+        """
+        Get the last time matching the schedule at or before a moment.
+
+        Args:
+            moment: Local time to search back from
+
+        Returns:
+            The previous matching local time, to the minute.
+        """
+        candidate = moment.replace(second=0, microsecond=0)
+        limit = candidate - timedelta(days=366 * 5)
+        while candidate > limit:
+            if candidate.month not in self.months:
+                candidate = candidate.replace(day=1, hour=23, minute=59) - timedelta(days=1)
+            elif not self._matches_day(candidate):
+                candidate = candidate.replace(hour=23, minute=59) - timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=59) - timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate -= timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+    def _matches_day(self, moment: datetime) -> bool:
+        """Check the day of month and day of week, combined like cron does."""
+        day_matches = moment.day in self.days
+        weekday_matches = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day:
+            return weekday_matches
+        if self._any_weekday:
+            return day_matches
+        return day_matches or weekday_matches
+
+
+class Campaign:
+    """One scheduled posting campaign read from the CAMPAIGNS configuration."""
+
+    DEFAULT_TEMPLATE = "Published by, -{page_name}-"
+
+    def __init__(self, name: str, schedule: str, source: str, source_options: Optional[Dict[str, Any]] = None,
+                 template: str = DEFAULT_TEMPLATE, page_name: Optional[str] = None,
+                 platforms: Optional[List[str]] = None, jitter: float = 0.0, catch_up: str = 'latest',
+                 queue: bool = False, enabled: bool = True):
+        """
+        Initialize the Campaign.
+
+        Args:
+            name: Unique campaign name (key of its saved state)
+            schedule: Cron expression of the posting slots
+            source: Quote source type (api, file, database, store, ...)
+            source_options: Arguments of the quote source (optional)
+            template: Post message and logo, formatted with {text}, {author} and {page_name}
+            page_name: Page name used in the template (defaults to the quote author)
+            platforms: Platform names, or ['all'] (defaults to ['facebook'])
+            jitter: Maximum random seconds added to every slot
+            catch_up: Missed slots to post after downtime: 'latest', 'all' or 'none'
+            queue: Add the posts to the post queue instead of posting them directly
+            enabled: Whether the campaign runs
+
+        Raises:
+            ValueError: If the schedule or the catch-up policy is invalid.
+        """
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"Campaign '{name}': catch_up must be one of {', '.join(CATCH_UP_POLICIES)}")
+        self.name = name
+        self.schedule = CronSchedule(schedule)
+        self.source = source
+        self.source_options = source_options or {}
+        self.template = template
+        self.page_name = page_name
+        self.platforms = platforms or ['facebook']
+        self.jitter = float(jitter)
+        self.catch_up = catch_up
+        self.queue = queue
+        self.enabled = enabled
+
+    @classmethod
+    def from_config(cls, definition: Dict[str, Any]) -> 'Campaign':
+        """
+        Create a campaign from its configuration entry.
+
+        Args:
+            definition: Dict with 'name', 'schedule', 'source' and optional campaign settings
+
+        Returns:
+            The campaign.
+
+        Raises:
+            ValueError: If a required key is missing or a setting is invalid.
+        """
+        missing = [key for key in ('name', 'schedule', 'source') if not definition.get(key)]
+        if missing:
+            raise ValueError(f"Campaign {definition.get('name', definition)!r} is missing {', '.join(missing)}")
+        try:
+            return cls(**definition)
+        except TypeError as e:
+            raise ValueError(f"Campaign '{definition['name']}' has an unknown setting: {e}")
+
+    def jitter_for(self, slot: float) -> float:
+        """Random delay of a slot, stable across restarts."""
+        if not self.jitter:
+            return 0.0
+        return random.Random(f"{self.name}:{slot:.0f}").uniform(0, self.jitter)
+
+    def message(self, quote: Dict[str, str]) -> str:
+        """Format the post message and logo for a quote."""
+        author = quote.get('author') or 'Unknown'
+        return self.template.format(text=quote['text'], author=author, page_name=self.page_name or author)
+
+
+class CampaignScheduler:
+    """
+    Posts campaigns on their cron slots from one long-lived process.
+
+    The next post of every campaign is fetched and rendered ahead of its slot,
+    slots are delayed by a stable per-slot jitter, and the last handled slot
+    of every campaign is saved so missed slots can be caught up after downtime.
+    """
+
+    # Fetches attempted before accepting a quote that was posted recently
+    MAX_DUPLICATE_RETRIES = 5
+
+    # Most missed slots posted at once by the 'all' catch-up policy
+    MAX_CATCH_UP = 10
+
+    def __init__(self, campaigns: List[Campaign], generator: ImageGenerator, poster: SocialPoster,
+                 state_path: str, fetcher: Optional[QuoteFetcher] = None, prerender_seconds: float = 600.0,
+                 grace_seconds: float = 300.0, poll_interval: float = 30.0, post_queue=None, quote_store=None,
+                 repost_days: Optional[float] = None, clock: Callable[[], float] = time.time):
+        """
+        Initialize the CampaignScheduler.
+
+        Args:
+            campaigns: Campaigns to run
+            generator: Image generator rendering the posts
+            poster: Poster holding the configured platforms
+            state_path: JSON file recording the last handled slot of every campaign
+            fetcher: Quote fetcher creating the campaign sources (optional)
+            prerender_seconds: How long before its slot a post is fetched and rendered
+            grace_seconds: How late a slot may be dispatched before it counts as missed
+            poll_interval: Maximum seconds between two checks
+            post_queue: PostQueue used by campaigns with queue enabled (optional)
+            quote_store: QuoteStore recording posts and filtering reposts (optional)
+            repost_days: Skip quotes posted within this many days (optional)
+            clock: Function returning the current Unix time
+        """
+        self.campaigns = [campaign for campaign in campaigns if campaign.enabled]
+        self.generator = generator
+        self.poster = poster
+        self.state_path = state_path
+        self.fetcher = fetcher or QuoteFetcher()
+        self.prerender_seconds = prerender_seconds
+        self.grace_seconds = grace_seconds
+        self.poll_interval = poll_interval
+        self.post_queue = post_queue
+        self.quote_store = quote_store
+        self.repost_days = repost_days
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self._state: Dict[str, Dict[str, Any]] = self._load_state()
+        self._sources: Dict[str, QuoteSource] = {}
+        self._prepared: Dict[Tuple[str, float], Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='campaign-prepare')
+        self._stop = threading.Event()
+
+    def run_once(self) -> List[Dict[str, Any]]:
+        """
+        Dispatch every due slot and start preparing upcoming ones.
+
+        Returns:
+            One dict per dispatched slot, with 'campaign', 'slot', 'status'
+            ('posted' or 'failed') and 'results', plus one 'skipped' dict per
+            campaign covering its missed slots from 'first_slot' to 'slot'.
+        """
+        outcomes = []
+        for campaign in self.campaigns:
+            try:
+                outcomes.extend(self._run_campaign(campaign, self.clock()))
+            except Exception as e:
+                self.logger.error(f"Campaign '{campaign.name}' failed: {e}")
+        return outcomes
+
+    def run_forever(self, on_outcome: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Run until stop() is called, sleeping until the next slot or preparation.
+
+        Args:
+            on_outcome: Callback receiving every dispatched slot and skipped range (optional)
+        """
+        while not self._stop.is_set():
+            for outcome in self.run_once():
+                if on_outcome:
+                    on_outcome(outcome)
+            self._stop.wait(self._idle_delay())
+
+    def stop(self):
+        """Ask run_forever to return."""
+        self._stop.set()
+
+    def close(self):
+        """Stop and release the preparation threads."""
+        self.stop()
+        self._executor.shutdown(cancel_futures=True)
+
+    def upcoming(self) -> List[Dict[str, Any]]:
+        """Next slot and dispatch time of every campaign."""
+        upcoming = []
+        for campaign in self.campaigns:
+            slot = self._next_slot(campaign, self._last_slot(campaign, self.clock()))
+            upcoming.append({'campaign': campaign.name, 'slot': slot, 'dispatch_at': slot + campaign.jitter_for(slot)})
+        return upcoming
+
+    def _run_campaign(self, campaign: Campaign, now: float) -> List[Dict[str, Any]]:
+        """Dispatch the due slots of one campaign and prepare its next one."""
+        last_slot = self._last_slot(campaign, now)
+        next_slot = self._next_slot(campaign, last_slot)
+        outcomes = []
+        if next_slot + campaign.jitter_for(next_slot) <= now:
+            # Search back from now so a long downtime costs no more than a short one
+            final = self._previous_slot(campaign, now, inclusive=True)
+            while final > next_slot and final + campaign.jitter_for(final) > now:
+                final = self._previous_slot(campaign, final)
+
+            dispatch = self._catch_up_slots(campaign, final, last_slot, now)
+            skipped_until = self._previous_slot(campaign, dispatch[0]) if dispatch else final
+            if skipped_until > last_slot:
+                self._skip(campaign, next_slot, skipped_until)
+                outcomes.append({'campaign': campaign.name, 'slot': skipped_until, 'first_slot': next_slot,
+                                 'status': 'skipped', 'results': {}})
+            for slot in dispatch:
+                outcomes.append(self._dispatch(campaign, slot))
+            self._save_slot(campaign, final)
+            next_slot = self._next_slot(campaign, final)
+
+        if next_slot + campaign.jitter_for(next_slot) - now <= self.prerender_seconds:
+            self._prepare(campaign, next_slot)
+        return outcomes
+
+    def _catch_up_slots(self, campaign: Campaign, final: float, last_slot: float, now: float) -> List[float]:
+        """Due slots to post, oldest first, walking back from the last due slot."""
+        slots = []
+        slot = final
+        while slot > last_slot:
+            if campaign.catch_up == 'all':
+                if len(slots) >= self.MAX_CATCH_UP:
+                    break
+            elif now - slot - campaign.jitter_for(slot) > self.grace_seconds:
+                break
+            slots.append(slot)
+            slot = self._previous_slot(campaign, slot)
+        if not slots and campaign.catch_up == 'latest':
+            slots.append(final)
+        return slots[::-1]
+
+    def _skip(self, campaign: Campaign, first_slot: float, last_slot: float):
+        """Drop the prepared posts of missed slots and report them in one line."""
+        for name, slot in list(self._prepared):
+            if name == campaign.name and slot <= last_slot:
+                self._forget(campaign, slot)
+        if first_slot == last_slot:
+            self.logger.warning(f"Campaign '{campaign.name}' skipped missed slot {_format(last_slot)}")
+        else:
+            self.logger.warning(f"Campaign '{campaign.name}' skipped missed slots "
+                                f"{_format(first_slot)} to {_format(last_slot)}")
+
+    def _dispatch(self, campaign: Campaign, slot: float) -> Dict[str, Any]:
+        """Post the prepared content of a slot."""
+        outcome = {'campaign': campaign.name, 'slot': slot, 'status': 'failed', 'results': {}}
+        try:
+            prepared = self._prepare(campaign, slot).result()
+        except Exception as e:
+            self.logger.error(f"Campaign '{campaign.name}' could not prepare slot {_format(slot)}: {e}")
+            return {**outcome, 'error': str(e)}
+        finally:
+            self._forget(campaign, slot)
+
+        quote, message, image_data = prepared['quote'], prepared['message'], prepared['image']
+        platforms = self.poster.get_available_platforms() if campaign.platforms == ['all'] else campaign.platforms
+        if campaign.queue and self.post_queue is not None:
+            for platform_name in platforms:
+                self.post_queue.enqueue(platform_name, image_data, message,
+                                        {'text': quote['text'], 'author': quote.get('author')})
+            results = {platform_name: True for platform_name in platforms}
+        else:
+            results = {platform_name: self.poster.post_to_platform(platform_name, image_data, message)
+                       for platform_name in platforms}
+            if any(results.values()) and self.quote_store:
+                self.quote_store.mark_posted(quote['text'], quote.get('author'))
+
+        status = 'posted' if any(results.values()) else 'failed'
+        self.logger.info(f"Campaign '{campaign.name}' slot {_format(slot)}: {status} {results}")
+        return {**outcome, 'status': status, 'results': results, 'text': quote['text']}
+
+    def _prepare(self, campaign: Campaign, slot: float) -> Future:
+        """Start (once) fetching and rendering the post of a slot."""
+        key = (campaign.name, slot)
+        future = self._prepared.get(key)
+        if future is None:
+            future = self._prepared[key] = self._executor.submit(self._render_post, campaign)
+            self.logger.debug(f"Preparing campaign '{campaign.name}' slot {_format(slot)}")
+        return future
+
+    def _forget(self, campaign: Campaign, slot: float):
+        """Drop the prepared post of a slot."""
+        future = self._prepared.pop((campaign.name, slot), None)
+        if future is not None:
+            future.cancel()
+
+    def _render_post(self, campaign: Campaign) -> Dict[str, Any]:
+        """Fetch a quote and render the post of a campaign."""
+        source = self._sources.get(campaign.name)
+        if source is None:
+            source = self.fetcher.create_source(campaign.source, **campaign.source_options)
+            if source is None:
+                raise ValueError(f"Unknown quote source '{campaign.source}'")
+            self._sources[campaign.name] = source
+
+        for _ in range(self.MAX_DUPLICATE_RETRIES):
+            quote = source.get_quote()
+            if not quote:
+                raise ValueError(f"No quote from source '{campaign.source}'")
+            if not (self.quote_store and self.repost_days and
+                    self.quote_store.posted_within(quote['text'], self.repost_days)):
+                break
+
+        message = campaign.message(quote)
+        image_data = self.generator.create_quote_bytes(quote['text'], message)
+        if not image_data:
+            raise ValueError("Image generation failed")
+        return {'quote': quote, 'message': message, 'image': image_data}
+
+    def _last_slot(self, campaign: Campaign, now: float) -> float:
+        """Last handled slot of a campaign; a new campaign starts from now."""
+        last_slot = self._state.get(campaign.name, {}).get('last_slot')
+        if last_slot is None:
+            last_slot = now
+            self._save_slot(campaign, now)
+        return last_slot
+
+    def _next_slot(self, campaign: Campaign, after: float) -> float:
+        """First slot of a campaign after a Unix time."""
+        return campaign.schedule.next_after(datetime.fromtimestamp(after)).timestamp()
+
+    def _previous_slot(self, campaign: Campaign, before: float, inclusive: bool = False) -> float:
+        """Last slot of a campaign before (or, if inclusive, at) a Unix time."""
+        moment = datetime.fromtimestamp(before)
+        if not inclusive:
+            moment -= timedelta(minutes=1)
+        return campaign.schedule.last_until(moment).timestamp()
+
+    def _idle_delay(self) -> float:
+        """Seconds until the next dispatch or preparation, capped at poll_interval."""
+        now = self.clock()
+        delay = self.poll_interval
+        for entry in self.upcoming():
+            until_dispatch = entry['dispatch_at'] - now
+            until_prepare = until_dispatch - self.prerender_seconds
+            for until in (until_dispatch, until_prepare):
+                if until > 0:
+                    delay = min(delay, until)
+        return max(delay, 0.1)
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        """Read the saved campaign state."""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, IOError) as e:
+            self.logger.error(f"Error reading campaign state {self.state_path}: {e}")
+            return {}
+
+    def _save_slot(self, campaign: Campaign, slot: float):
+        """Record the last handled slot of a campaign, replacing the state file atomically."""
+        self._state[campaign.name] = {'last_slot': slot, 'last_slot_at': _format(slot)}
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, indent=2)
+        os.replace(temp_path, self.state_path)
+
+
+def load_campaigns(definitions: List[Dict[str, Any]]) -> List[Campaign]:
+    """
+    Create campaigns from the CAMPAIGNS configuration.
+
+    Args:
+        definitions: Campaign configuration entries
+
+    Returns:
+        The campaigns.
+
+    Raises:
+        ValueError: If an entry is invalid or a name is used twice.
+    """
+    campaigns = [Campaign.from_config(definition) for definition in definitions or []]
+    names = [campaign.name for campaign in campaigns]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate campaign names: {', '.join(sorted(duplicates))}")
+    return campaigns
+
+
+def _format(timestamp: float) -> str:
+    """Local time of a Unix time, for logs and the state file."""
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M')
@@ -0,0 +1,88 @@
+"""
+Background canvas pool for the Quote Maker application.
+"""
+
+import threading
+from typing import Dict, List, Sequence, Tuple
+from PIL import Image
+
+
+class CanvasPool:
+    """Keeps one pristine background per (mode, size, color) and recycles image buffers."""
+
+    def __init__(self, max_free: int = 4):
+        """
+        Initialize the CanvasPool.
+
+        Args:
+            max_free: Number of released buffers kept per (mode, size)
+        """
+        self.max_free = max_free
+        self.created = 0
+        self.reused = 0
+        self._templates: Dict[Tuple, Image.Image] = {}
+        self._free: Dict[Tuple[str, Tuple[int, int]], List[Image.Image]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, mode: str, size: Tuple[int, int], color: Sequence[int]) -> Image.Image:
+        """
+        Get a canvas filled with the background color.
+
+        Args:
+            mode: Image mode (e.g. 'RGB')
+            size: Image (width, height)
+            color: Background color
+
+        Returns:
+            An image the caller may draw on; hand it back with release().
+        """
+        size = tuple(size)
+        color = tuple(color)
+        with self._lock:
+            template = self._templates.get((mode, size, color))
+            if template is None:
+                template = self._templates[(mode, size, color)] = Image.new(mode, size, color)
+            free = self._free.get((mode, size))
+            canvas = free.pop() if free else None
+            if canvas is None:
+                self.created += 1
+            else:
+                self.reused += 1
+
+        if canvas is None:
+            return template.copy()
+
+        canvas.paste(template)
+        return canvas
+
+    def release(self, canvas: Image.Image):
+        """
+        Return a canvas to the pool once it is no longer used.
+
+        Args:
+            canvas: Image previously returned by acquire()
+        """
+        with self._lock:
+            free = self._free.setdefault((canvas.mode, canvas.size), [])
+            if len(free) < self.max_free:
+                free.append(canvas)
+
+    def clear(self):
+        """Drop all templates and free buffers."""
+        with self._lock:
+            self._templates.clear()
+            self._free.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of templates and created/reused canvases."""
+        with self._lock:
+            return {
+                'templates': len(self._templates),
+                'free': sum(len(free) for free in self._free.values()),
+                'created': self.created,
+                'reused': self.reused,
+            }
+
+
+# Pool shared by every ImageGenerator in this process
+canvas_pool = CanvasPool()
@@ -0,0 +1,292 @@
+"""
+Indexed and streaming access to quote files for the Quote Maker application.
+"""
+
+import io
+import os
+import re
+import csv
+import json
+import mmap
+import random
+import struct
+import logging
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Strings are matched whole so braces and newlines inside them are skipped
+_JSON_TOKENS = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.DOTALL)
+_CSV_TOKENS = re.compile(rb'"(?:[^"]|"")*"|\r?\n')
+
+_INDEX_MAGIC = b'QMIDX001'
+_INDEX_HEADER = struct.Struct('<8sQQQ')
+_INDEX_ENTRY = struct.Struct('<QQ')
+
+
+def normalize_quote(record: Dict[str, str]) -> Dict[str, str]:
+    """
+    Normalize a raw quote record.
+
+    Args:
+        record: Parsed record using 'text' or 'quote' and an optional 'author'
+
+    Returns:
+        Quote dictionary with 'text' and 'author' keys.
+    """
+    return {
+        'text': record.get('text', record.get('quote', '')),
+        'author': record.get('author') or 'Unknown'
+    }
+
+
+def scan_json_records(data) -> Iterator[Tuple[int, int]]:
+    """
+    Find the byte span of every object in a top-level JSON array.
+
+    Args:
+        data: Bytes-like object (e.g. an mmap) holding the JSON document
+
+    Yields:
+        (start, end) byte offsets of each object.
+    """
+    depth = 0
+    start = 0
+    for match in _JSON_TOKENS.finditer(data):
+        token = match.group()[:1]
+        if token in (b'[', b'{'):
+            if token == b'{' and depth == 1:
+                start = match.start()
+            depth += 1
+        elif token in (b']', b'}'):
+            depth -= 1
+            if token == b'}' and depth == 1:
+                yield start, match.end()
+
+
+def scan_csv_records(data) -> Iterator[Tuple[int, int]]:
+    """
+    Find the byte span of every CSV record, honouring quoted newlines.
+
+    Args:
+        data: Bytes-like object (e.g. an mmap) holding the CSV document
+
+    Yields:
+        (start, end) byte offsets of each non-empty record, header included.
+    """
+    start = 3 if data[:3] == b'\xef\xbb\xbf' else 0
+    for match in _CSV_TOKENS.finditer(data, start):
+        if match.group()[:1] == b'"':
+            continue
+        if match.start() > start:
+            yield start, match.start()
+        start = match.end()
+    if len(data) > start:
+        yield start, len(data)
+
+
+def iter_quotes(file_path: str) -> Iterator[Dict[str, str]]:
+    """
+    Stream quotes from a file with constant memory.
+
+    Supports NDJSON (.jsonl/.ndjson), CSV, JSON arrays (.json) and plain text
+    with one quote per line.
+
+    Args:
+        file_path: Path to the quotes file
+
+    Yields:
+        Quote dictionaries with 'text' and 'author' keys.
+    """
+    if file_path.endswith('.json'):
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for start, end in scan_json_records(data):
+                    yield normalize_quote(json.loads(data[start:end]))
+        return
+
+    with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+        if file_path.endswith(('.jsonl', '.ndjson')):
+            for line in f:
+                if line.strip():
+                    yield normalize_quote(json.loads(line))
+        elif file_path.endswith('.csv'):
+            for row in csv.DictReader(f):
+                yield normalize_quote(row)
+        else:
+            for line in f:
+                if line.strip():
+                    yield {'text': line.strip(), 'author': 'Unknown'}
+
+
+class QuoteCorpus:
+    """Random access to the records of a JSON array or CSV quote file through a byte-offset index."""
+
+    def __init__(self, file_path: str, index_path: Optional[str] = None):
+        """
+        Initialize the QuoteCorpus.
+
+        The index is built on first use, stored next to the file and rebuilt
+        whenever the file's modification time or size changes.
+
+        Args:
+            file_path: Path to a .json (array of objects) or .csv quote file
+            index_path: Path of the persistent index (defaults to file_path + '.idx')
+        """
+        self.file_path = file_path
+        self.index_path = index_path or f"{file_path}.idx"
+        self.is_csv = file_path.endswith('.csv')
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._data = None
+        self._index = None
+        self._count = 0
+        self._header = None
+
+    def __len__(self) -> int:
+        """Number of quote records in the corpus."""
+        with self._lock:
+            self._refresh()
+            return self._record_count()
+
+    def random_quote(self, rng: Optional[random.Random] = None) -> Optional[Dict[str, str]]:
+        """
+        Pick a random quote by seeking straight to one record.
+
+        Args:
+            rng: Random number generator (optional)
+
+        Returns:
+            Quote dictionary or None if the corpus is empty.
+        """
+        # Count and read under one lock so a concurrent refresh cannot shrink the file in between
+        with self._lock:
+            self._refresh()
+            count = self._record_count()
+            if count <= 0:
+                return None
+            raw, header = self._read_quote((rng or random).randrange(count))
+        return self._parse(raw, header)
+
+    def get(self, position: int) -> Dict[str, str]:
+        """
+        Read a single quote record.
+
+        Args:
+            position: Zero-based record number
+
+        Returns:
+            Quote dictionary with 'text' and 'author' keys.
+        """
+        with self._lock:
+            self._refresh()
+            raw, header = self._read_quote(position)
+        return self._parse(raw, header)
+
+    def close(self):
+        """Release the memory maps."""
+        with self._lock:
+            self._release(self._data, self._index)
+            self._data = self._index = None
+            self._signature = None
+
+    def _record_count(self) -> int:
+        """Number of quote records, without the CSV header row."""
+        return self._count - 1 if self.is_csv else self._count
+
+    def _read_quote(self, position: int) -> Tuple[str, Optional[List[str]]]:
+        """Read the raw text of a quote record and the CSV header it is parsed with."""
+        return self._read_record(position + 1 if self.is_csv else position), self._header
+
+    def _parse(self, raw: str, header: Optional[List[str]]) -> Dict[str, str]:
+        """Parse the raw text of a quote record."""
+        if self.is_csv:
+            record = dict(zip(header, next(csv.reader(io.StringIO(raw)))))
+        else:
+            record = json.loads(raw)
+        return normalize_quote(record)
+
+    def _read_record(self, position: int) -> str:
+        """Read the raw text of one record from the memory map."""
+        start, end = _INDEX_ENTRY.unpack_from(self._index, _INDEX_HEADER.size + position * _INDEX_ENTRY.size)
+        return self._data[start:end].decode('utf-8')
+
+    def _refresh(self):
+        """
+        Open the file and its index, rebuilding the index if the file changed.
+
+        Called with the lock held. The new maps are fully built before they
+        replace the old ones, so a failed reopen keeps serving the old file.
+        """
+        stat = os.stat(self.file_path)
+        if (stat.st_mtime_ns, stat.st_size) == self._signature:
+            return
+
+        with open(self.file_path, 'rb') as f:
+            # Stat the open file: the path may have been replaced since the check above
+            stat = os.fstat(f.fileno())
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self._signature:
+                return
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b''
+        try:
+            index = self._load_index(signature) or self._build_index(data, signature)
+        except Exception:
+            self._release(data)
+            raise
+        count = _INDEX_HEADER.unpack_from(index)[3]
+        header = None
+        if self.is_csv and count:
+            start, end = _INDEX_ENTRY.unpack_from(index, _INDEX_HEADER.size)
+            header = next(csv.reader(io.StringIO(data[start:end].decode('utf-8'))))
+
+        old_data, old_index = self._data, self._index
+        self._data, self._index, self._count, self._header = data, index, count, header
+        self._signature = signature
+        self._release(old_data, old_index)
+
+    @staticmethod
+    def _release(*maps):
+        """Close the memory maps among the given buffers."""
+        for mapped in maps:
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+
+    def _load_index(self, signature: Tuple[int, int]):
+        """Map the persistent index if it matches the file signature."""
+        try:
+            with open(self.index_path, 'rb') as f:
+                index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        if len(index) >= _INDEX_HEADER.size:
+            magic, mtime_ns, size, count = _INDEX_HEADER.unpack_from(index)
+            if (magic, mtime_ns, size) == (_INDEX_MAGIC, *signature) and \
+                    len(index) == _INDEX_HEADER.size + count * _INDEX_ENTRY.size:
+                return index
+        index.close()
+        return None
+
+    def _build_index(self, data, signature: Tuple[int, int]) -> bytes:
+        """Scan the file once and persist the offset of every record."""
+        scan = scan_csv_records if self.is_csv else scan_json_records
+        entries = bytearray()
+        count = 0
+        for start, end in scan(data):
+            entries += _INDEX_ENTRY.pack(start, end)
+            count += 1
+        index = _INDEX_HEADER.pack(_INDEX_MAGIC, *signature, count) + bytes(entries)
+
+        temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(index)
+            os.replace(temp_path, self.index_path)
+            self.logger.info(f"Indexed {count} records of {self.file_path}")
+        except OSError as e:
+            self.logger.warning(f"Could not persist corpus index {self.index_path}: {e}")
+        return index
@@ -0,0 +1,398 @@
+"""
+Long-running HTTP service mode for the Quote Maker application.
+
+Endpoints:
+    POST /render  {"text", "logo" | "page_name"}            -> encoded image
+    POST /post    {"text", "author", "page_name", "platform", "queue"} -> JSON outcome
+    GET  /stats                                              -> per-endpoint job latency
+    GET  /healthz                                            -> "ok" or "draining"
+"""
+
+import os
+import json
+import time
+import signal
+import logging
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from src.quote_maker.generator import ImageGenerator, render_in_worker
+from src.quote_maker.facebook import SocialPoster
+
+
+class DaemonError(Exception):
+    """A job failed with an HTTP status to report."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _DaemonHandler(BaseHTTPRequestHandler):
+    """Routes requests to the QuoteDaemon."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        daemon = self.server.quote_daemon
+        if self.path == '/stats':
+            self._send_json(200, daemon.stats())
+        elif self.path == '/healthz':
+            self._send_json(503 if daemon.draining else 200, {'status': 'draining' if daemon.draining else 'ok'})
+        else:
+            self._send_json(404, {'error': f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        daemon = self.server.quote_daemon
+        handlers = {'/render': daemon.render_job, '/post': daemon.post_job}
+        handler = handlers.get(self.path)
+        try:
+            payload = self._read_json()
+            if handler is None:
+                raise DaemonError(404, f"Unknown path {self.path}")
+            status, body, headers = daemon.run_job(self.path.strip('/'), handler, payload)
+        except DaemonError as e:
+            self._send_json(e.status, {'error': str(e)})
+            return
+        except Exception as e:
+            daemon.logger.exception(f"Request to {self.path} failed")
+            self._send_json(500, {'error': f"Request failed: {e}"})
+            return
+
+        if isinstance(body, bytes):
+            self._send(status, body, headers.pop('Content-Type'), headers)
+        else:
+            self._send_json(status, body, headers)
+
+    def _read_json(self) -> Dict[str, Any]:
+        """Read the JSON request body."""
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > self.server.quote_daemon.MAX_REQUEST_BYTES:
+            raise DaemonError(413, "Request body too large")
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            raise DaemonError(400, "Request body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise DaemonError(400, "Request body must be a JSON object")
+        return payload
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        """Send a JSON response."""
+        self._send(status, json.dumps(payload).encode('utf-8'), 'application/json', headers)
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        """Send a response."""
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        self.server.quote_daemon.logger.debug(f"{self.address_string()} {format % args}")
+
+
+class QuoteDaemon:
+    """HTTP service rendering and posting quote cards on warm worker processes."""
+
+    # Largest accepted request body, in bytes
+    MAX_REQUEST_BYTES = 64 * 1024
+
+    # Latencies kept per endpoint for the percentiles in stats()
+    LATENCY_WINDOW = 1000
+
+    def __init__(self, generator: ImageGenerator, poster: Optional[SocialPoster] = None,
+                 host: str = '127.0.0.1', port: int = 8080, workers: Optional[int] = None,
+                 render_timeout: float = 30.0, drain_timeout: float = 30.0, post_queue=None, quote_store=None):
+        """
+        Initialize the QuoteDaemon.
+
+        Args:
+            generator: Image generator whose settings the workers render with
+            poster: Poster used by /post (optional; /post is refused without it)
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            workers: Number of render processes (defaults to BATCH_WORKERS or the CPU count)
+            render_timeout: Seconds a render may take before the job fails
+            drain_timeout: Seconds to wait for running jobs when shutting down
+            post_queue: PostQueue used by /post requests with "queue": true (optional)
+            quote_store: QuoteStore recording posted quotes (optional)
+        """
+        self.generator = generator
+        self.poster = poster
+        self.workers = workers
+        self.render_timeout = render_timeout
+        self.drain_timeout = drain_timeout
+        self.post_queue = post_queue
+        self.quote_store = quote_store
+        self.draining = False
+        self.logger = logging.getLogger(__name__)
+        self._server = ThreadingHTTPServer((host, port), _DaemonHandler)
+        self._server.daemon_threads = True
+        self._server.quote_daemon = self
+        self._pool = None
+        self._worker_count = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._job_ids = itertools.count(1)
+        self._in_flight = 0
+        self._started = time.time()
+        self._jobs: Dict[str, Dict[str, int]] = {}
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    @property
+    def url(self) -> str:
+        """Base URL of the service."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'QuoteDaemon':
+        """Start the warm worker processes and serve in a background thread."""
+        if self._thread is None:
+            self._worker_count = self.workers or self.generator.settings.batch_workers or os.cpu_count() or 1
+            self._pool = self.generator.create_worker_pool(self._worker_count, warm_up=True)
+            self._warm_workers()
+            self._thread = threading.Thread(target=self._server.serve_forever, name='quote-daemon', daemon=True)
+            self._thread.start()
+            self.logger.info(f"Quote Maker daemon listening on {self.url}")
+        return self
+
+    def serve_until_signalled(self):
+        """
+        Serve until SIGTERM or SIGINT, then drain and shut down (main thread only).
+
+        SIGHUP reloads the configuration without restarting.
+        """
+        reload_requested = threading.Event()
+
+        def request_stop(signum, frame):
+            self.logger.info(f"Received signal {signum}, draining")
+            self._stop.set()
+
+        def request_reload(signum, frame):
+            reload_requested.set()
+
+        previous = {signum: signal.signal(signum, request_stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+        if hasattr(signal, 'SIGHUP'):
+            previous[signal.SIGHUP] = signal.signal(signal.SIGHUP, request_reload)
+        try:
+            self.start()
+            while not self._stop.wait(0.5):
+                if reload_requested.is_set():
+                    reload_requested.clear()
+                    self.reload()
+        finally:
+            self.close()
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+    def close(self) -> bool:
+        """
+        Refuse new jobs, wait for running ones and stop the server and workers.
+
+        Returns:
+            True if every running job finished within drain_timeout.
+        """
+        drained = self.drain(self.drain_timeout)
+        self._stop.set()
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        self.logger.info("Quote Maker daemon stopped")
+        return drained
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Refuse new jobs and wait for the running ones.
+
+        Args:
+            timeout: Maximum number of seconds to wait (None waits until done)
+
+        Returns:
+            True if no job is running anymore.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            self.draining = True
+            while self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self.logger.warning(f"Stopped waiting for {self._in_flight} running jobs")
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def reload(self) -> bool:
+        """
+        Reload the configuration and render later jobs with its settings.
+
+        Jobs already running finish with the settings they started with; the
+        workers switch to the new snapshot with their next job.
+
+        Returns:
+            True if the new settings are in use, False if they were invalid.
+        """
+        try:
+            self.generator.reload()
+        except ValueError as e:
+            self.logger.error(f"Keeping the current settings: {e}")
+            return False
+        self.logger.info("Render settings reloaded")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the job counters and latency percentiles per endpoint."""
+        with self._lock:
+            endpoints = {}
+            for name, counters in self._jobs.items():
+                latencies = sorted(self._latencies[name])
+                endpoints[name] = {
+                    **counters,
+                    'mean_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+                    'p50_ms': _percentile(latencies, 0.5),
+                    'p95_ms': _percentile(latencies, 0.95),
+                    'p99_ms': _percentile(latencies, 0.99),
+                    'max_ms': latencies[-1] if latencies else 0.0,
+                }
+            return {
+                'uptime_s': time.time() - self._started,
+                'in_flight': self._in_flight,
+                'draining': self.draining,
+                'workers': self._worker_count if self._pool is not None else 0,
+                'endpoints': endpoints,
+            }
+
+    def run_job(self, endpoint: str, handler, payload: Dict[str, Any]) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Run one job, tracking it for draining and latency stats.
+
+        Args:
+            endpoint: Name the job is counted under
+            handler: Callable receiving the job id and payload, returning (status, body, headers)
+            payload: Request payload
+
+        Returns:
+            (status, body, headers) with X-Job-Id and X-Job-Ms added; a failed
+            job returns its error status with an {"error": ...} body.
+        """
+        with self._lock:
+            if self.draining:
+                raise DaemonError(503, "Service is draining")
+            self._in_flight += 1
+            job_id = next(self._job_ids)
+
+        start = time.perf_counter()
+        status = 500
+        try:
+            status, body, headers = handler(job_id, payload)
+        except DaemonError as e:
+            status, body, headers = e.status, {'error': str(e)}, {}
+        except Exception as e:
+            self.logger.exception(f"Job {job_id} /{endpoint} failed")
+            status, body, headers = 500, {'error': f"Job failed: {e}"}, {}
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._idle:
+                self._in_flight -= 1
+                counters = self._jobs.setdefault(endpoint, {'jobs': 0, 'failed': 0})
+                counters['jobs'] += 1
+                counters['failed'] += status >= 400
+                self._latencies.setdefault(endpoint, deque(maxlen=self.LATENCY_WINDOW)).append(elapsed_ms)
+                self._idle.notify_all()
+
+        self.logger.info(f"Job {job_id} /{endpoint} finished with {status} in {elapsed_ms:.1f} ms")
+        return status, body, {**headers, 'X-Job-Id': str(job_id), 'X-Job-Ms': f"{elapsed_ms:.1f}"}
+
+    def render_job(self, job_id: int, payload: Dict[str, Any]) -> Tuple[int, Any, Dict[str, str]]:
+        """Render an image and return the encoded bytes."""
+        result = self._render(payload)
+        headers = {
+            'Content-Type': f"image/{result['format'].lower()}",
+            'X-Render-Ms': f"{result['render_ms']:.1f}",
+            'X-Cache': 'hit' if result.get('cached') else 'miss',
+        }
+        return 200, result['image'], headers
+
+    def post_job(self, job_id: int, payload: Dict[str, Any]) -> Tuple[int, Any, Dict[str, str]]:
+        """Render an image and post it (or add it to the post queue)."""
+        if self.poster is None:
+            raise DaemonError(503, "Posting is not configured")
+        platform = payload.get('platform', 'facebook')
+        use_queue = bool(payload.get('queue'))
+        if use_queue and self.post_queue is None:
+            raise DaemonError(400, "POST_QUEUE_PATH is not configured")
+        if platform != 'all' and platform not in self.poster.platforms:
+            raise DaemonError(400, f"Platform '{platform}' not configured")
+
+        result = self._render(payload)
+        start = time.perf_counter()
+        platforms = self.poster.get_available_platforms() if platform == 'all' else [platform]
+        if use_queue:
+            for platform_name in platforms:
+                self.post_queue.enqueue(platform_name, result['image'], result['logo'],
+                                        {'text': payload['text'], 'author': payload.get('author')})
+            results = {platform_name: True for platform_name in platforms}
+        elif platform == 'all':
+            results = self.poster.post_to_all_platforms(result['image'], result['logo'])
+        else:
+            results = {platform: self.poster.post_to_platform(platform, result['image'], result['logo'])}
+        post_ms = (time.perf_counter() - start) * 1000
+
+        posted = any(results.values())
+        if posted and self.quote_store and not use_queue:
+            self.quote_store.mark_posted(payload['text'], payload.get('author'))
+        body = {'job_id': job_id, 'posted': posted, 'queued': use_queue, 'results': results,
+                'render_ms': result['render_ms'], 'post_ms': post_ms}
+        return (200 if posted else 502), body, {}
+
+    def _render(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Render the payload's quote on a worker process."""
+        text = payload.get('text')
+        if not isinstance(text, str) or not text.strip():
+            raise DaemonError(400, "A non-empty 'text' is required")
+        logo = payload.get('logo')
+        if logo is None:
+            page_name = payload.get('page_name') or payload.get('author') or 'Unknown'
+            logo = f"Published by, -{page_name}-"
+
+        start = time.perf_counter()
+        try:
+            future = self._pool.submit(render_in_worker, {'text': text, 'logo': logo}, self.generator.settings)
+            result = future.result(self.render_timeout)
+        except FutureTimeoutError:
+            raise DaemonError(504, f"Rendering took longer than {self.render_timeout}s")
+        if result['error']:
+            raise DaemonError(500, f"Rendering failed: {result['error']}")
+        return {**result, 'render_ms': (time.perf_counter() - start) * 1000}
+
+    def _warm_workers(self):
+        """Start every worker process and wait until each has warmed up."""
+        # Workers warm up in their initializer and wait for each other, so these
+        # jobs start one process each and finish only once all are warm
+        list(self._pool.map(_worker_ready, range(self._worker_count)))
+        self.logger.debug(f"Warmed up {self._worker_count} worker processes")
+
+
+def _worker_ready(_: int) -> bool:
+    """Job that returns once a worker process has started."""
+    return True
+
+
+def _percentile(ordered, fraction: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else 0.0
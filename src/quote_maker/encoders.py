@@ -0,0 +1,132 @@
+"""
+Image encoders for the Quote Maker application.
+"""
+
+import io
+import time
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+# Named encoder settings trading CPU time against output size
+ENCODER_PROFILES: Dict[str, Dict[str, Any]] = {
+    'default': {'format': 'PNG', 'compress_level': 6},
+    'fast': {'format': 'PNG', 'compress_level': 1},
+    'small': {'format': 'WEBP', 'quality': 80, 'method': 6},
+    'jpeg': {'format': 'JPEG', 'quality': 85, 'optimize': True, 'progressive': True},
+}
+
+FORMAT_EXTENSIONS = {'PNG': '.png', 'JPEG': '.jpg', 'WEBP': '.webp'}
+
+
+class ImageEncoder:
+    """Encodes rendered images to PNG, JPEG or WebP bytes."""
+
+    def __init__(self, image_format: str = 'PNG', **options):
+        """
+        Initialize the ImageEncoder.
+
+        Args:
+            image_format: Output format ('PNG', 'JPEG' or 'WEBP')
+            **options: Pillow save options such as compress_level or quality
+        """
+        self.image_format = image_format.upper()
+        if self.image_format not in FORMAT_EXTENSIONS:
+            raise ValueError(f"Unsupported output format: {image_format}")
+        self.options = options
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_profile(cls, profile: str) -> 'ImageEncoder':
+        """
+        Create an encoder from a named profile.
+
+        Args:
+            profile: Name of a profile in ENCODER_PROFILES
+
+        Returns:
+            The configured encoder.
+        """
+        if profile not in ENCODER_PROFILES:
+            raise ValueError(f"Unknown encoder profile: {profile}")
+        options = dict(ENCODER_PROFILES[profile])
+        return cls(options.pop('format'), **options)
+
+    @classmethod
+    def from_config(cls, config_manager) -> 'ImageEncoder':
+        """
+        Create an encoder from configuration.
+
+        ENCODER_PROFILE selects a named profile; otherwise OUTPUT_FORMAT is used
+        with PNG_COMPRESS_LEVEL, JPEG_QUALITY or WEBP_QUALITY.
+
+        Args:
+            config_manager: Configuration manager instance
+
+        Returns:
+            The configured encoder.
+        """
+        profile = getattr(config_manager, 'ENCODER_PROFILE', None)
+        if profile:
+            return cls.from_profile(profile)
+
+        image_format = (getattr(config_manager, 'OUTPUT_FORMAT', None) or 'PNG').upper()
+        if image_format == 'JPEG':
+            return cls('JPEG', quality=getattr(config_manager, 'JPEG_QUALITY', 85), optimize=True, progressive=True)
+        if image_format == 'WEBP':
+            return cls('WEBP', quality=getattr(config_manager, 'WEBP_QUALITY', 80))
+        return cls(image_format, compress_level=getattr(config_manager, 'PNG_COMPRESS_LEVEL', 6))
+
+    @property
+    def extension(self) -> str:
+        """File extension of the encoded images."""
+        return FORMAT_EXTENSIONS[self.image_format]
+
+    def settings(self) -> Dict[str, Any]:
+        """Get the format and options that determine the encoded output."""
+        return {'format': self.image_format, **self.options}
+
+    def encode(self, img: 'Image.Image') -> Tuple[bytes, Dict[str, Any]]:
+        """
+        Encode an image.
+
+        Args:
+            img: Rendered image
+
+        Returns:
+            Tuple of the encoded bytes and stats with 'format', 'encode_ms' and 'size'.
+        """
+        start = time.perf_counter()
+        if self.image_format == 'JPEG' and img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        buffer = io.BytesIO()
+        img.save(buffer, format=self.image_format, **self.options)
+        data = buffer.getvalue()
+
+        stats = {
+            'format': self.image_format,
+            'encode_ms': (time.perf_counter() - start) * 1000,
+            'size': len(data),
+        }
+        self.logger.debug(f"Encoded {stats['format']} image: {stats['size']} bytes in {stats['encode_ms']:.1f} ms")
+        return data, stats
+
+
+def get_encoder(config_manager=None, profile: Optional[str] = None) -> ImageEncoder:
+    """
+    Get an encoder for a profile or the given configuration.
+
+    Args:
+        config_manager: Configuration manager instance (optional)
+        profile: Name of a profile, overriding the configuration (optional)
+
+    Returns:
+        The configured encoder.
+    """
+    if profile:
+        return ImageEncoder.from_profile(profile)
+    return ImageEncoder.from_config(config_manager)
@@ -3,76 +3,206 @@
 Social media posting logic for the Quote Maker application.
 """
 
-import requests
+import io
+import time
 import logging
+import threading
+from dataclasses import dataclass
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, BinaryIO, Optional, Dict, Union
 from config import config
 
+if TYPE_CHECKING:
+    import requests
+
+
+# An image is either a path on disk or the encoded image itself
+ImageSource = Union[str, bytes]
+
+
+def _guess_extension(image_data: bytes) -> str:
+    """Guess the file extension of encoded image bytes from their signature."""
+    header = bytes(image_data[:12])
+    if header.startswith(b"\xff\xd8"):
+        return ".jpg"
+    if header.startswith(b"RIFF") and header[8:12] == b"WEBP":
+        return ".webp"
+    return ".png"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date.
+    
+    Args:
+        value: Header value (optional)
+        
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def open_image(image_path: ImageSource) -> BinaryIO:
+    """
+    Open an image for upload.
+    
+    Args:
+        image_path: Path to the image, or the encoded image bytes
+        
+    Returns:
+        A binary file object positioned at the start of the image.
+    """
+    if isinstance(image_path, (bytes, bytearray, memoryview)):
+        image_file = io.BytesIO(image_path)
+        image_file.name = f"quote{_guess_extension(image_path)}"
+        return image_file
+    return open(image_path, "rb")
+
+
+@dataclass(frozen=True)
+class PostResult:
+    """Outcome of one post."""
+    
+    success: bool
+    # Seconds the platform asked callers to wait when the post was throttled
+    retry_after: Optional[float] = None
+
 
 class SocialPlatform(ABC):
     """Abstract base class for social media platforms."""
     
     @abstractmethod
-    def post_image(self, image_path: str, message: str) -> bool:
-        """Post an image with a message to the platform."""
+    def post_image(self, image_path: ImageSource, message: str) -> bool:
+        """Post an image (path or encoded bytes) with a message to the platform."""
         pass
+    
+    def post(self, image_path: ImageSource, message: str) -> PostResult:
+        """
+        Post an image and report whether the platform throttled it.
+        
+        Platforms that can be throttled override this; the result belongs to
+        this call alone, so concurrent posts never see each other's delays.
+        
+        Args:
+            image_path: Path to the image, or the encoded image bytes
+            message: Message to post
+            
+        Returns:
+            The outcome of the post.
+        """
+        return PostResult(self.post_image(image_path, message))
 
 
 class FacebookPoster(SocialPlatform):
     """Facebook posting implementation."""
     
-    def __init__(self, page_id: str, access_token: str):
+    # Graph API error codes reporting that a rate limit was reached
+    THROTTLE_ERROR_CODES = {4, 17, 32, 613}
+    
+    # Seconds to wait after throttling when the response has no Retry-After header
+    DEFAULT_RETRY_AFTER = 60.0
+    
+    def __init__(self, page_id: str, access_token: str, graph_url: str = 'https://graph.facebook.com',
+                 client=None):
         """
         Initialize Facebook poster.
         
         Args:
             page_id: Facebook page ID
             access_token: Facebook access token
+            graph_url: Base URL of the Graph API (e.g. a local mock server)
+            client: HTTP client to post with (defaults to the shared client)
         """
         self.page_id = page_id
         self.access_token = access_token
+        self.graph_url = graph_url.rstrip('/')
+        self.client = client
         self.logger = logging.getLogger(__name__)
     
-    def post_image(self, image_path: str, message: str) -> bool:
+    def post_image(self, image_path: ImageSource, message: str) -> bool:
         """
         Posts an image to a Facebook page.
 
         Args:
-            image_path: The path to the image to post.
+            image_path: The path to the image to post, or the encoded image bytes.
             message: The message to accompany the image.
             
         Returns:
             True if successful, False otherwise.
         """
+        return self.post(image_path, message).success
+    
+    def post(self, image_path: ImageSource, message: str) -> PostResult:
+        """
+        Posts an image to a Facebook page and reports throttling.
+
+        Args:
+            image_path: The path to the image to post, or the encoded image bytes.
+            message: The message to accompany the image.
+            
+        Returns:
+            The outcome of the post; when it was throttled, retry_after holds
+            the number of seconds to wait.
+        """
         if not self.access_token:
             self.logger.error("Facebook access token is not configured")
-            return False
+            return PostResult(False)
+        
+        import requests
+        from src.quote_maker.http_session import get_http_client
         
-        url = f"https://graph.facebook.com/{self.page_id}/photos"
+        url = f"{self.graph_url}/{self.page_id}/photos"
         params = {
             "access_token": self.access_token,
             "message": message,
         }
         
         try:
-            with open(image_path, "rb") as image_file:
+            with open_image(image_path) as image_file:
                 files = {"source": image_file}
-                response = requests.post(url, params=params, files=files, timeout=30)
+                response = (self.client or get_http_client()).post(url, params=params, files=files, timeout=30)
             
+            if self._is_throttled(response):
+                retry_after = parse_retry_after(response.headers.get('Retry-After')) or self.DEFAULT_RETRY_AFTER
+                self.logger.warning(f"Facebook rate limit reached, retry after {retry_after:.0f}s")
+                return PostResult(False, retry_after)
             response.raise_for_status()
             self.logger.info("Quote posted successfully to Facebook!")
-            return True
+            return PostResult(True)
             
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error posting to Facebook: {e}")
-            return False
+            return PostResult(False)
         except FileNotFoundError:
             self.logger.error(f"Image file not found at {image_path}")
-            return False
+            return PostResult(False)
         except Exception as e:
             self.logger.error(f"Unexpected error occurred: {e}")
+            return PostResult(False)
+    
+    def _is_throttled(self, response: 'requests.Response') -> bool:
+        """Check whether a Graph API response reports a rate limit."""
+        if response.status_code in (429, 503):
+            return True
+        if response.status_code < 400:
             return False
+        try:
+            error = response.json().get('error', {})
+        except ValueError:
+            return False
+        return isinstance(error, dict) and error.get('code') in self.THROTTLE_ERROR_CODES
 
 
 class TwitterPoster(SocialPlatform):
@@ -94,12 +224,12 @@ class TwitterPoster(SocialPlatform):
         self.access_token_secret = access_token_secret
         self.logger = logging.getLogger(__name__)
     
-    def post_image(self, image_path: str, message: str) -> bool:
+    def post_image(self, image_path: ImageSource, message: str) -> bool:
         """
         Posts an image to Twitter (placeholder implementation).
         
         Args:
-            image_path: The path to the image to post.
+            image_path: The path to the image to post, or the encoded image bytes.
             message: The message to accompany the image.
             
         Returns:
@@ -122,12 +252,12 @@ class InstagramPoster(SocialPlatform):
         self.access_token = access_token
         self.logger = logging.getLogger(__name__)
     
-    def post_image(self, image_path: str, message: str) -> bool:
+    def post_image(self, image_path: ImageSource, message: str) -> bool:
         """
         Posts an image to Instagram (placeholder implementation).
         
         Args:
-            image_path: The path to the image to post.
+            image_path: The path to the image to post, or the encoded image bytes.
             message: The message to accompany the image.
             
         Returns:
@@ -159,20 +289,21 @@ class SocialPoster:
             if self.config_manager.FACEBOOK_ACCESS_TOKEN:
                 self.platforms['facebook'] = FacebookPoster(
                     self.config_manager.FACEBOOK_PAGE_ID,
-                    self.config_manager.FACEBOOK_ACCESS_TOKEN
+                    self.config_manager.FACEBOOK_ACCESS_TOKEN,
+                    getattr(self.config_manager, 'FACEBOOK_GRAPH_URL', None) or 'https://graph.facebook.com'
                 )
     
     def add_platform(self, name: str, platform: SocialPlatform):
         """Add a social media platform."""
         self.platforms[name] = platform
     
-    def post_to_platform(self, platform_name: str, image_path: str, message: str) -> bool:
+    def post_to_platform(self, platform_name: str, image_path: ImageSource, message: str) -> bool:
         """
         Post to a specific platform.
         
         Args:
             platform_name: Name of the platform
-            image_path: Path to the image
+            image_path: Path to the image, or the encoded image bytes
             message: Message to post
             
         Returns:
@@ -184,22 +315,79 @@ class SocialPoster:
         
         return self.platforms[platform_name].post_image(image_path, message)
     
-    def post_to_all_platforms(self, image_path: str, message: str) -> Dict[str, bool]:
+    def post_to_all_platforms(self, image_path: ImageSource, message: str,
+                              timeout: Optional[float] = None) -> Dict[str, bool]:
         """
-        Post to all configured platforms.
+        Post to all configured platforms concurrently.
+        
+        Every post runs on its own thread and every platform has its own
+        timeout, so a platform that hangs neither delays the other platforms
+        nor holds up later calls.
         
         Args:
-            image_path: Path to the image
+            image_path: Path to the image, or the encoded image bytes
             message: Message to post
+            timeout: Seconds each platform may take (defaults to the platform's
+                entry in POST_TIMEOUTS, then POST_TIMEOUT)
             
         Returns:
-            Dictionary mapping platform names to success status.
+            Dictionary mapping platform names to success status; platforms that
+            did not finish in time are reported as failed.
         """
+        if not self.platforms:
+            return {}
+        
+        start = time.monotonic()
+        futures = {
+            platform_name: self._start_post(platform_name, platform, image_path, message)
+            for platform_name, platform in self.platforms.items()
+        }
+        
         results = {}
-        for platform_name, platform in self.platforms.items():
-            results[platform_name] = platform.post_image(image_path, message)
+        for platform_name, future in futures.items():
+            platform_timeout = timeout if timeout is not None else self._platform_timeout(platform_name)
+            remaining = None if platform_timeout is None else max(start + platform_timeout - time.monotonic(), 0)
+            try:
+                results[platform_name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                self.logger.error(f"Posting to {platform_name} timed out after {platform_timeout}s")
+                results[platform_name] = False
         return results
     
+    def _platform_timeout(self, platform_name: str) -> Optional[float]:
+        """Get the seconds a post to a platform may take from POST_TIMEOUTS or POST_TIMEOUT."""
+        timeouts = getattr(self.config_manager, 'POST_TIMEOUTS', None) or {}
+        if platform_name in timeouts:
+            return timeouts[platform_name]
+        return getattr(self.config_manager, 'POST_TIMEOUT', None)
+    
+    def _start_post(self, platform_name: str, platform: SocialPlatform, image_path: ImageSource,
+                    message: str) -> Future:
+        """
+        Post to one platform on a daemon thread.
+        
+        Posts that time out are abandoned rather than waited for; they never
+        occupy a thread another post needs, and as daemon threads they never
+        hold up interpreter exit.
+        """
+        future = Future()
+        
+        def run():
+            if future.set_running_or_notify_cancel():
+                future.set_result(self._post_safely(platform_name, platform, image_path, message))
+        
+        threading.Thread(target=run, name=f'social-post-{platform_name}', daemon=True).start()
+        return future
+    
+    def _post_safely(self, platform_name: str, platform: SocialPlatform, image_path: ImageSource,
+                     message: str) -> bool:
+        """Post to one platform, turning unexpected errors into a failure."""
+        try:
+            return platform.post_image(image_path, message)
+        except Exception as e:
+            self.logger.error(f"Error posting to {platform_name}: {e}")
+            return False
+    
     def get_available_platforms(self) -> list:
         """Get list of available platforms."""
         return list(self.platforms.keys())
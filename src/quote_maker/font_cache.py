@@ -0,0 +1,109 @@
+"""
+Process-wide font cache for the Quote Maker application.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Tuple
+from PIL import ImageFont
+
+
+class FontCache:
+    """LRU cache of loaded fonts keyed by font path and size."""
+
+    def __init__(self, maxsize: int = 32):
+        """
+        Initialize the FontCache.
+
+        Args:
+            maxsize: Maximum number of fonts kept in memory
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._fonts: "OrderedDict[Tuple[str, int], ImageFont.FreeTypeFont]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, font_path: str, size: int) -> ImageFont.FreeTypeFont:
+        """
+        Get a font, loading it from disk on a cache miss.
+
+        Args:
+            font_path: Path to the TrueType font file
+            size: Font size in pixels
+
+        Returns:
+            The loaded font.
+
+        Raises:
+            IOError: If the font file cannot be loaded.
+        """
+        key = (os.path.abspath(font_path), size)
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                self.hits += 1
+                return font
+            self.misses += 1
+
+        font = ImageFont.truetype(font_path, size)
+
+        with self._lock:
+            self._fonts[key] = font
+            self._fonts.move_to_end(key)
+            while len(self._fonts) > self.maxsize:
+                evicted, _ = self._fonts.popitem(last=False)
+                self.logger.debug(f"Evicted font {evicted} from cache")
+        return font
+
+    def warm(self, specs: Iterable[Tuple[str, int]]):
+        """
+        Pre-load fonts so later renders hit the cache.
+
+        Args:
+            specs: Iterable of (font path, size) pairs
+        """
+        for font_path, size in specs:
+            try:
+                self.get(font_path, size)
+            except IOError:
+                self.logger.error(f"Font file not found at {font_path}")
+
+    def clear(self):
+        """Remove all fonts and reset the counters."""
+        with self._lock:
+            self._fonts.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache hit/miss counters and current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._fonts),
+                'maxsize': self.maxsize,
+            }
+
+
+# Cache shared by every ImageGenerator in this process
+font_cache = FontCache()
+
+
+def get_font(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    """
+    Get a font from the process-wide cache.
+
+    Args:
+        font_path: Path to the TrueType font file
+        size: Font size in pixels
+
+    Returns:
+        The loaded font.
+    """
+    return font_cache.get(font_path, size)
@@ -3,28 +3,113 @@
 Image generation logic for the Quote Maker application.
 """
 
-import textwrap
+import os
 import random
+import hashlib
 import uuid
 import logging
-from typing import Optional, Tuple
-from PIL import Image, ImageDraw, ImageFont
+import threading
+import multiprocessing
+from dataclasses import dataclass, replace
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from PIL import ImageDraw, ImageFont
 from config import config
+from config.config import RenderSettings
+from src.quote_maker.canvas_pool import canvas_pool
+from src.quote_maker.encoders import ImageEncoder
+from src.quote_maker.font_cache import font_cache
+from src.quote_maker.layout import TextLayout
+from src.quote_maker.render_cache import RenderCache
+
+
+# Bump whenever drawing changes so cached renders are not reused
+RENDER_VERSION = 1
+
+# Number of batch items queued per worker before waiting for results
+BATCH_QUEUE_FACTOR = 4
+
+# Seconds a warming worker waits for the rest of the pool to start
+WARM_UP_TIMEOUT = 60.0
+
+
+@dataclass(frozen=True, slots=True)
+class _RenderState:
+    """Settings, encoder and render cache a render uses, swapped together on reload."""
+    
+    settings: RenderSettings
+    encoder: ImageEncoder
+    render_cache: Optional[RenderCache]
 
 
 class ImageGenerator:
     """Handles image generation for quotes."""
     
-    def __init__(self, config_manager=None):
+    def __init__(self, config_manager=None, settings: Optional[RenderSettings] = None,
+                 encoder: Optional[ImageEncoder] = None):
         """
         Initialize the ImageGenerator.
         
         Args:
             config_manager: Configuration manager instance
+            settings: Render settings (defaults to a snapshot of the configuration)
+            encoder: Image encoder (defaults to the configured one)
         """
         self.config_manager = config_manager or config
+        settings = settings or RenderSettings.from_config(self.config_manager)
+        self._state = _RenderState(settings, encoder or ImageEncoder.from_config(self.config_manager),
+                                   self._create_render_cache(settings))
         self.logger = logging.getLogger(__name__)
     
+    @property
+    def settings(self) -> RenderSettings:
+        """Render settings in use."""
+        return self._state.settings
+    
+    @property
+    def encoder(self) -> ImageEncoder:
+        """Image encoder in use."""
+        return self._state.encoder
+    
+    @encoder.setter
+    def encoder(self, encoder: ImageEncoder):
+        self._state = replace(self._state, encoder=encoder)
+    
+    @property
+    def render_cache(self) -> Optional[RenderCache]:
+        """Render cache in use, or None when RENDER_CACHE_DIR is not configured."""
+        return self._state.render_cache
+    
+    def reload(self, settings: Optional[RenderSettings] = None) -> RenderSettings:
+        """
+        Swap in new render settings without waiting for running renders.
+
+        The settings, encoder and render cache are swapped in one assignment
+        and a render reads them once when it starts, so renders already
+        running finish with the old snapshot and later ones use the new one.
+        The encoder is kept.
+
+        Args:
+            settings: New settings (defaults to a reloaded configuration)
+
+        Returns:
+            The settings now in use.
+
+        Raises:
+            ValueError: If the reloaded configuration is invalid.
+        """
+        if settings is None:
+            if hasattr(self.config_manager, 'reload'):
+                settings = self.config_manager.reload()
+            else:
+                settings = config.get_config_manager().reload()
+        state = self._state
+        render_cache = state.render_cache
+        if settings.render_cache_dir != state.settings.render_cache_dir:
+            render_cache = self._create_render_cache(settings)
+        self._state = replace(state, settings=settings, render_cache=render_cache)
+        return settings
+    
     def create_quote_image(self, text: str, logo: str, output_path: Optional[str] = None) -> Optional[str]:
         """
         Creates an image with the given quote and logo.
@@ -38,75 +123,283 @@ class ImageGenerator:
             The path to the generated image or None if failed.
         """
         try:
-            font = self._load_font()
-            if not font:
-                return None
-            
-            bg_color = self._get_random_background_color()
-            
-            img = Image.new(
-                self.config_manager.IMAGE_TYPE,
-                (self.config_manager.IMAGE_WIDTH, self.config_manager.IMAGE_HEIGHT),
-                bg_color
-            )
-            draw = ImageDraw.Draw(img)
+            return self._render_to_file(text, logo, output_path)
+        except Exception as e:
+            self.logger.error(f"Error generating image: {e}")
+            return None
+    
+    def create_quote_bytes(self, text: str, logo: str) -> Optional[bytes]:
+        """
+        Creates an image with the given quote and logo without touching the disk.
+
+        Args:
+            text: The quote to display on the image.
+            logo: The logo to display on the image.
+
+        Returns:
+            The encoded image or None if failed.
+        """
+        try:
+            return self._render_to_bytes(text, logo)
+        except Exception as e:
+            self.logger.error(f"Error generating image: {e}")
+            return None
+    
+    def save_image(self, image_data: bytes, output_path: Optional[str] = None) -> str:
+        """
+        Writes an encoded image to disk.
+
+        Args:
+            image_data: The encoded image.
+            output_path: Custom output path for the image (optional).
+
+        Returns:
+            The path the image was written to.
+        """
+        image_name = output_path or f"{uuid.uuid4()}{self.encoder.extension}"
+        with open(image_name, 'wb') as image_file:
+            image_file.write(image_data)
+        self.logger.info(f"Image saved: {image_name}")
+        return image_name
+    
+    def create_quote_images(self, batch: Iterable[Dict[str, str]], workers: Optional[int] = None,
+                            output_dir: Optional[str] = None, in_memory: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Renders a batch of quote images, spreading the work over a process pool.
+
+        Results are yielded as soon as each image finishes, so they do not
+        follow the input order. A failing item does not stop the batch.
+
+        Args:
+            batch: Iterable of dicts with 'text', 'logo' and an optional 'output_path'.
+            workers: Number of worker processes (defaults to BATCH_WORKERS or the CPU count).
+            output_dir: Directory for images without an explicit output path (optional).
+            in_memory: Return the encoded images as 'image' bytes instead of writing them to disk.
 
-            # Process and draw text
-            text_lines = self._wrap_text(text)
-            y_text = self._calculate_text_position(
-                len(text_lines), self.config_manager.FONT_SIZE, self.config_manager.IMAGE_HEIGHT
-            )
+        Returns:
+            Iterator of dicts with 'index', 'text', 'logo', 'path' and 'error' for every item,
+            plus the encoder 'format', 'encode_ms' and 'size' when it succeeded.
+        """
+        workers = workers or self.settings.batch_workers or os.cpu_count() or 1
+        if output_dir and not in_memory:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        if workers == 1:
+            for index, item in enumerate(batch):
+                yield _render_batch_item(self, index, item, output_dir, in_memory)
+            return
+        
+        with self.create_worker_pool(workers) as executor:
+            pending = set()
+            for index, item in enumerate(batch):
+                pending.add(executor.submit(_run_batch_item, index, item, output_dir, in_memory))
+                if len(pending) >= workers * BATCH_QUEUE_FACTOR:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+    
+    def create_worker_pool(self, workers: Optional[int] = None, warm_up: bool = False) -> ProcessPoolExecutor:
+        """
+        Creates a process pool whose workers render with this generator's settings.
 
-            for line in text_lines:
-                x_text, line_height = self._draw_text_line(draw, line, font, y_text)
-                y_text += line_height
+        Submit render_in_worker to it to render in the pool.
+
+        Args:
+            workers: Number of worker processes (defaults to BATCH_WORKERS or the CPU count).
+            warm_up: Render a throwaway image in every worker as it starts, and hold
+                each worker until all of them have started, so submitting `workers`
+                jobs starts and warms the whole pool.
+
+        Returns:
+            The process pool; the caller shuts it down.
+        """
+        state = self._state
+        workers = workers or state.settings.batch_workers or os.cpu_count() or 1
+        barrier = multiprocessing.Barrier(workers) if warm_up else None
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                   initargs=(state.settings, state.encoder, barrier))
+    
+    def _render_to_file(self, text: str, logo: str, output_path: Optional[str] = None) -> str:
+        """Render an image and save it, raising on failure."""
+        return self.save_image(self._render_to_bytes(text, logo), output_path)
+    
+    def _render_to_bytes(self, text: str, logo: str) -> bytes:
+        """Render and encode an image in memory, raising on failure."""
+        return self._render(text, logo)[0]
+    
+    def _render(self, text: str, logo: str) -> Tuple[bytes, Dict[str, Any]]:
+        """Render and encode an image, returning the bytes and encoder stats."""
+        # Read the snapshot once so a concurrent reload cannot change it half-way
+        state = self._state
+        settings, encoder, render_cache = state.settings, state.encoder, state.render_cache
+        font = self._load_font(settings)
+        if not font:
+            raise IOError(f"Font file not found at {settings.font_path}")
+        
+        if render_cache is None:
+            image_data, stats = self._draw_and_encode(text, logo, font, self._get_random_background_color(settings),
+                                                      settings, encoder)
+            return image_data, {**stats, 'cached': False}
+        
+        # A stable color per quote lets reruns over the same corpus hit the cache
+        bg_color = self._get_stable_background_color(text, logo, settings)
+        key = self._render_cache_key(text, logo, bg_color, settings, encoder)
+        image_data = render_cache.get(key)
+        if image_data is not None:
+            return image_data, {'format': encoder.image_format, 'encode_ms': 0.0,
+                                'size': len(image_data), 'cached': True}
+        
+        image_data, stats = self._draw_and_encode(text, logo, font, bg_color, settings, encoder)
+        render_cache.put(key, image_data)
+        return image_data, {**stats, 'cached': False}
+    
+    def _draw_and_encode(self, text: str, logo: str, font: ImageFont.FreeTypeFont, bg_color: Tuple[int, int, int],
+                         settings: RenderSettings, encoder: ImageEncoder) -> Tuple[bytes, Dict[str, Any]]:
+        """Draw the quote and logo on a background and encode the image."""
+        img = canvas_pool.acquire(settings.image_type, (settings.image_width, settings.image_height), bg_color)
+        try:
+            draw = ImageDraw.Draw(img)
+
+            # Lay out and draw text
+            for line, x_text, y_text in self._layout_text(text, font, settings):
+                draw.text((x_text, y_text), line, font=font, fill=(255, 255, 255))
 
             # Add logo
             self._draw_logo(draw, logo, font)
 
-            # Save the image
-            image_name = output_path or f"{uuid.uuid4()}.png"
-            img.save(image_name)
-            self.logger.info(f"Image saved: {image_name}")
-            return image_name
-            
-        except Exception as e:
-            self.logger.error(f"Error generating image: {e}")
-            return None
+            # Encode the image
+            return encoder.encode(img)
+        finally:
+            canvas_pool.release(img)
     
-    def _load_font(self) -> Optional[ImageFont.FreeTypeFont]:
+    def _load_font(self, settings: RenderSettings) -> Optional[ImageFont.FreeTypeFont]:
         """Load the font file."""
         try:
-            return ImageFont.truetype(self.config_manager.FONT_PATH, self.config_manager.FONT_SIZE)
+            return font_cache.get(settings.font_path, settings.font_size)
         except IOError:
-            self.logger.error(f"Font file not found at {self.config_manager.FONT_PATH}")
+            self.logger.error(f"Font file not found at {settings.font_path}")
             return None
     
-    def _get_random_background_color(self) -> Tuple[int, int, int]:
+    def warm_fonts(self):
+        """Pre-load the configured font into the process-wide font cache."""
+        font_cache.warm([(self.settings.font_path, self.settings.font_size)])
+    
+    def _get_random_background_color(self, settings: RenderSettings) -> Tuple[int, int, int]:
         """Get a random background color."""
-        return random.choice(self.config_manager.IMAGE_BG_COLORS)
-    
-    def _wrap_text(self, text: str) -> list:
-        """Wrap text based on font size."""
-        wrapper = textwrap.TextWrapper(width=self.config_manager.FONT_SIZE)
-        return wrapper.wrap(text=text)
-    
-    def _draw_text_line(self, draw: ImageDraw.Draw, line: str, font: ImageFont.FreeTypeFont, y_text: float) -> Tuple[float, float]:
-        """Draw a single line of text and return its position and height."""
-        bbox = font.getbbox(line)
-        line_width = bbox[2] - bbox[0]
-        line_height = bbox[3] - bbox[1]
-        x_text = (self.config_manager.IMAGE_WIDTH - line_width) / 2
-        draw.text((x_text, y_text), line, font=font, fill=(255, 255, 255))
-        return x_text, line_height
+        return random.choice(settings.bg_colors)
+    
+    def _get_stable_background_color(self, text: str, logo: str, settings: RenderSettings) -> Tuple[int, int, int]:
+        """Pick a background color derived from the quote so it is the same on every run."""
+        digest = hashlib.sha256(f"{text}\0{logo}".encode('utf-8')).digest()
+        colors = settings.bg_colors
+        return colors[int.from_bytes(digest[:4], 'big') % len(colors)]
+    
+    def _create_render_cache(self, settings: RenderSettings) -> Optional[RenderCache]:
+        """Create the render cache when RENDER_CACHE_DIR is configured."""
+        if not settings.render_cache_dir:
+            return None
+        return RenderCache(settings.render_cache_dir, settings.render_cache_max_bytes)
+    
+    def _render_cache_key(self, text: str, logo: str, bg_color: Tuple[int, int, int],
+                          settings: RenderSettings, encoder: ImageEncoder) -> str:
+        """Build the render cache key for a quote."""
+        # The font file's mtime and size make a font replaced at the same path a new key
+        try:
+            font_stat = os.stat(settings.font_path)
+            font_file = (font_stat.st_mtime_ns, font_stat.st_size)
+        except OSError:
+            font_file = None
+        return RenderCache.make_key(
+            version=RENDER_VERSION,
+            text=text,
+            logo=logo,
+            font=(os.path.abspath(settings.font_path), settings.font_size, font_file),
+            size=(settings.image_width, settings.image_height),
+            mode=settings.image_type,
+            margin=settings.text_margin,
+            color=list(bg_color),
+            encoder=encoder.settings(),
+        )
+    
+    def _layout_text(self, text: str, font: ImageFont.FreeTypeFont,
+                     settings: RenderSettings) -> List[Tuple[str, float, float]]:
+        """Wrap text on measured pixel width and return (line, x, y) for every line."""
+        layout = TextLayout(font, settings.image_width, settings.image_height, settings.text_margin)
+        return layout.layout(text)
     
     def _draw_logo(self, draw: ImageDraw.Draw, logo: str, font: ImageFont.FreeTypeFont):
         """Draw the logo on the image."""
         draw.text((10, 10), logo, font=font, fill=(255, 255, 255))
+
+
+# Generator used by the current batch worker process
+_batch_generator: Optional[ImageGenerator] = None
+
+
+def _init_batch_worker(settings: RenderSettings, encoder: ImageEncoder, warm_up_barrier=None):
+    """Create the per-process ImageGenerator used by batch workers, warming it up if asked."""
+    global _batch_generator
+    _batch_generator = ImageGenerator(settings=settings, encoder=encoder)
+    _batch_generator.warm_fonts()
+    if warm_up_barrier is None:
+        return
+    
+    result = _render_batch_item(_batch_generator, 0, {'text': "warm up", 'logo': ""}, None, in_memory=True)
+    if result['error']:
+        _batch_generator.logger.warning(f"Worker warm-up failed: {result['error']}")
+    # No worker takes a job before all have started, so every submitted job starts a new worker
+    try:
+        warm_up_barrier.wait(WARM_UP_TIMEOUT)
+    except threading.BrokenBarrierError:
+        _batch_generator.logger.warning("Gave up waiting for the other workers to start")
+
+
+def _run_batch_item(index: int, item: Dict[str, str], output_dir: Optional[str],
+                    in_memory: bool = False) -> Dict[str, Any]:
+    """Render one batch item inside a worker process."""
+    return _render_batch_item(_batch_generator, index, item, output_dir, in_memory)
+
+
+def render_in_worker(item: Dict[str, str], settings: Optional[RenderSettings] = None) -> Dict[str, Any]:
+    """
+    Render one item in memory inside a worker of create_worker_pool.
+
+    Args:
+        item: Dict with 'text' and 'logo'.
+        settings: Render settings to switch the worker to first, e.g. after a reload (optional).
+
+    Returns:
+        Dict with 'image' bytes, the encoder stats and 'error'.
+    """
+    if settings is not None and settings != _batch_generator.settings:
+        _batch_generator.reload(settings)
+        _batch_generator.warm_fonts()
+    return _render_batch_item(_batch_generator, 0, item, None, in_memory=True)
+
+
+def _render_batch_item(generator: ImageGenerator, index: int, item: Dict[str, str],
+                       output_dir: Optional[str], in_memory: bool = False) -> Dict[str, Any]:
+    """Render one batch item and capture any failure in the result."""
+    text = item.get('text', '')
+    logo = item.get('logo', '')
+    output_path = item.get('output_path')
+    if not output_path and output_dir:
+        output_path = os.path.join(output_dir, f"{uuid.uuid4()}{generator.encoder.extension}")
     
-    def _calculate_text_position(self, text_lines: int, font_size: int, image_height: int) -> float:
-        """Calculate the starting y-coordinate for vertically centering text."""
-        return (image_height - (text_lines * font_size)) / 2
+    try:
+        image_data, stats = generator._render(text, logo)
+        if in_memory:
+            return {'index': index, 'text': text, 'logo': logo, 'path': None, 'image': image_data,
+                    'error': None, **stats}
+        path = generator.save_image(image_data, output_path)
+        return {'index': index, 'text': text, 'logo': logo, 'path': path, 'error': None, **stats}
+    except Exception as e:
+        generator.logger.error(f"Error generating image for batch item {index}: {e}")
+        return {'index': index, 'text': text, 'logo': logo, 'path': None, 'error': str(e)}
 
 
 # Backward compatibility function
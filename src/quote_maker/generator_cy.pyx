@@ -1,79 +1,120 @@
-
+# cython: language_level=3, boundscheck=False, wraparound=False
 """
-Cython version of the image generation logic.
+Compiled text layout kernels for the image generator.
+
+These mirror measure_words, wrap_widths and place_lines in layout.py and
+produce identical results; layout.py uses them automatically once this
+module is built with `python setup.py build_ext --inplace`.
 """
 
-import textwrap
-import random
-import uuid
-from PIL import Image, ImageDraw, ImageFont
-from config import config
 
-def create_quote_image_cy(str text, str logo):
+def measure_words(metrics, list words, double max_width):
     """
-    Creates an image with the given quote and logo (Cython version).
+    Measure every word, splitting words wider than the available width.
 
     Args:
-        text: The quote to display on the image.
-        logo: The logo to display on the image.
+        metrics: WordMetrics of the font.
+        words: Words of the text.
+        max_width: Available line width in pixels.
 
     Returns:
-        The path to the generated image.
+        Tuple of (words, widths) after splitting.
+    """
+    cdef dict cache = metrics.widths
+    cdef list out_words = []
+    cdef list out_widths = []
+    cdef Py_ssize_t start, end, length
+    cdef double width
+    cdef str word, piece
+
+    for word in words:
+        cached = cache.get(word)
+        width = metrics.measure(word) if cached is None else cached
+        if width <= max_width:
+            out_words.append(word)
+            out_widths.append(width)
+            continue
+
+        length = len(word)
+        start = 0
+        for end in range(2, length + 1):
+            if end - start > 1 and metrics.measure(word[start:end]) > max_width:
+                piece = word[start:end - 1]
+                out_words.append(piece)
+                out_widths.append(metrics.measure(piece))
+                start = end - 1
+        piece = word[start:]
+        out_words.append(piece)
+        out_widths.append(metrics.measure(piece))
+
+    return out_words, out_widths
+
+
+def wrap_widths(list widths, double space_width, double max_width):
     """
-    try:
-        font = ImageFont.truetype(config.FONT_PATH, config.FONT_SIZE)
-    except IOError:
-        print(f"Error: Font file not found at {config.FONT_PATH}")
-        return None
-
-    bg_color = random.choice(config.IMAGE_BG_COLORS)
-
-    try:
-        img = Image.new(
-            config.IMAGE_TYPE,
-            (config.IMAGE_WIDTH, config.IMAGE_HEIGHT),
-            bg_color
-        )
-        draw = ImageDraw.Draw(img)
-
-        wrapper = textwrap.TextWrapper(width=config.FONT_SIZE)
-        text_lines = wrapper.wrap(text=text)
-
-        y_text = _calculate_text_position(
-            len(text_lines), config.FONT_SIZE, config.IMAGE_HEIGHT
-        )
-
-        for line in text_lines:
-            bbox = font.getbbox(line)
-            line_width = bbox[2] - bbox[0]
-            line_height = bbox[3] - bbox[1]
-            x_text = (config.IMAGE_WIDTH - line_width) / 2
-            draw.text((x_text, y_text), line, font=font, fill=(255, 255, 255))
-            y_text += line_height
-
-        # Add logo
-        draw.text((10, 10), logo, font=font, fill=(255, 255, 255))
-
-        # Save the image
-        image_name = f"{uuid.uuid4()}.png"
-        img.save(image_name)
-        return image_name
-    except Exception as e:
-        print(f"Error generating image: {e}")
-        return None
-
-
-def _calculate_text_position(
-    text_lines: int, font_size: int, image_height: int
-) -> float:
-    """Calculates the starting y-coordinate for vertically centering text.
+    Greedily break a sequence of measured words into lines.
 
     Args:
-        text_lines: The number of lines of text.
-        font_size: The font size.
-        image_height: The height of the image.
+        widths: Advance width of every word.
+        space_width: Advance width of a space.
+        max_width: Available line width in pixels.
 
     Returns:
-        The y-coordinate for the text.
+        List of (first word index, end word index, line width) tuples.
+    """
+    cdef Py_ssize_t index, start = 0, count = len(widths)
+    cdef double width, line_width = 0.0
+    cdef list lines = []
+
+    for index in range(count):
+        width = widths[index]
+        if index == start:
+            line_width = width
+        elif line_width + space_width + width <= max_width:
+            line_width += space_width + width
+        else:
+            lines.append((start, index, line_width))
+            start = index
+            line_width = width
+    if start < count:
+        lines.append((start, count, line_width))
+    return lines
+
+
+def place_lines(list line_widths, double line_height, double image_width, double image_height):
     """
-    return (image_height - (text_lines * font_size)) / 2
+    Center lines horizontally and the whole block vertically.
+
+    Args:
+        line_widths: Width of every line in pixels.
+        line_height: Height of a line in pixels.
+        image_width: Width of the image.
+        image_height: Height of the image.
+
+    Returns:
+        List of (x, y) positions, one per line.
+    """
+    cdef double y_text = (image_height - len(line_widths) * line_height) / 2
+    cdef double line_width
+    cdef list positions = []
+
+    for line_width in line_widths:
+        positions.append(((image_width - line_width) / 2, y_text))
+        y_text += line_height
+    return positions
+
+
+def create_quote_image_cy(str text, str logo):
+    """
+    Creates an image with the given quote and logo using the compiled layout.
+
+    Args:
+        text: The quote to display on the image.
+        logo: The logo to display on the image.
+
+    Returns:
+        The path to the generated image or None if failed.
+    """
+    from src.quote_maker.generator import ImageGenerator
+
+    return ImageGenerator().create_quote_image(text, logo)
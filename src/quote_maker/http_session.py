@@ -0,0 +1,125 @@
+"""
+Shared HTTP session layer for the Quote Maker application.
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HTTPClient:
+    """Pooled keep-alive HTTP session with bounded retries and per-host concurrency limits."""
+
+    def __init__(self, pool_size: int = 10, retries: int = 3, backoff_factor: float = 0.5,
+                 backoff_jitter: float = 0.5, max_per_host: int = 8,
+                 retry_statuses: Iterable[int] = (429, 500, 502, 503, 504)):
+        """
+        Initialize the HTTPClient.
+
+        Args:
+            pool_size: Number of keep-alive connections kept per host
+            retries: Maximum number of retries for idempotent requests
+            backoff_factor: Base of the exponential backoff between retries, in seconds
+            backoff_jitter: Maximum random seconds added to every backoff
+            max_per_host: Maximum number of concurrent requests per host
+            retry_statuses: HTTP status codes that trigger a retry
+        """
+        self.max_per_host = max_per_host
+        self.logger = logging.getLogger(__name__)
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+            status_forcelist=tuple(retry_statuses),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @classmethod
+    def from_config(cls, config_manager) -> 'HTTPClient':
+        """
+        Create a client from configuration.
+
+        Args:
+            config_manager: Configuration manager instance
+
+        Returns:
+            The configured client.
+        """
+        return cls(
+            pool_size=getattr(config_manager, 'HTTP_POOL_SIZE', 10),
+            retries=getattr(config_manager, 'HTTP_RETRIES', 3),
+            backoff_factor=getattr(config_manager, 'HTTP_BACKOFF_FACTOR', 0.5),
+            max_per_host=getattr(config_manager, 'HTTP_MAX_PER_HOST', 8),
+        )
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session.
+
+        Blocks while the host already has max_per_host requests in flight.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Arguments passed to requests.Session.request
+
+        Returns:
+            The response.
+        """
+        with self._host_limit(urlsplit(url).netloc):
+            return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request."""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request."""
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+    def _host_limit(self, host: str) -> threading.BoundedSemaphore:
+        """Get the concurrency limit of a host."""
+        with self._lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                limit = self._host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return limit
+
+
+# Client shared by every API source and platform in this process
+_client: Optional[HTTPClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client(config_manager=None) -> HTTPClient:
+    """
+    Get the process-wide HTTP client, creating it on first use.
+
+    Args:
+        config_manager: Configuration used if the client is created (optional)
+
+    Returns:
+        The shared HTTPClient.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HTTPClient.from_config(config_manager)
+        return _client
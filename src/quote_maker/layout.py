@@ -0,0 +1,227 @@
+"""
+Pixel-accurate text layout for the Quote Maker application.
+"""
+
+import os
+import threading
+from typing import Dict, List, Tuple
+from PIL import ImageFont
+
+
+class WordMetrics:
+    """Memoized advance widths of words for a single font."""
+
+    def __init__(self, font: ImageFont.FreeTypeFont, max_entries: int = 50000):
+        """
+        Initialize the WordMetrics.
+
+        Args:
+            font: Font used to measure words
+            max_entries: Number of cached widths kept before the cache is reset
+        """
+        self.font = font
+        self.max_entries = max_entries
+        self.widths: Dict[str, float] = {}
+        self.space_width = font.getlength(' ')
+        ascent, descent = font.getmetrics()
+        self.line_height = ascent + descent
+
+    def measure(self, word: str) -> float:
+        """Get the advance width of a word in pixels."""
+        width = self.widths.get(word)
+        if width is None:
+            if len(self.widths) >= self.max_entries:
+                self.widths.clear()
+            width = self.widths[word] = self.font.getlength(word)
+        return width
+
+
+# WordMetrics per (font path, font size), shared by every layout in this process
+_metrics: Dict[Tuple[str, int], WordMetrics] = {}
+_metrics_lock = threading.Lock()
+
+
+def get_word_metrics(font: ImageFont.FreeTypeFont) -> WordMetrics:
+    """
+    Get the shared WordMetrics for a font.
+
+    Args:
+        font: Loaded font
+
+    Returns:
+        The WordMetrics caching widths for this font path and size.
+    """
+    path = getattr(font, 'path', None)
+    if not isinstance(path, (str, bytes, os.PathLike)):
+        # Fonts loaded from memory have no path to share widths under
+        return WordMetrics(font)
+
+    key = (os.path.abspath(path), font.size)
+    metrics = _metrics.get(key)
+    if metrics is None:
+        with _metrics_lock:
+            metrics = _metrics.setdefault(key, WordMetrics(font))
+    return metrics
+
+
+def split_word(word: str, metrics: WordMetrics, max_width: float) -> List[str]:
+    """
+    Split a word that is wider than the available width into pieces that fit.
+
+    Args:
+        word: Word to split
+        metrics: WordMetrics of the font
+        max_width: Available width in pixels
+
+    Returns:
+        List of word pieces, each at most max_width wide (one character minimum).
+    """
+    pieces = []
+    start = 0
+    for end in range(1, len(word) + 1):
+        if end - start > 1 and metrics.measure(word[start:end]) > max_width:
+            pieces.append(word[start:end - 1])
+            start = end - 1
+    pieces.append(word[start:])
+    return pieces
+
+
+def measure_words(metrics: WordMetrics, words: List[str], max_width: float) -> Tuple[List[str], List[float]]:
+    """
+    Measure every word, splitting words wider than the available width.
+
+    Args:
+        metrics: WordMetrics of the font
+        words: Words of the text
+        max_width: Available line width in pixels
+
+    Returns:
+        Tuple of (words, widths) after splitting.
+    """
+    out_words = []
+    out_widths = []
+    for word in words:
+        width = metrics.measure(word)
+        if width > max_width:
+            for piece in split_word(word, metrics, max_width):
+                out_words.append(piece)
+                out_widths.append(metrics.measure(piece))
+        else:
+            out_words.append(word)
+            out_widths.append(width)
+    return out_words, out_widths
+
+
+def wrap_widths(widths: List[float], space_width: float, max_width: float) -> List[Tuple[int, int, float]]:
+    """
+    Greedily break a sequence of measured words into lines.
+
+    Args:
+        widths: Advance width of every word
+        space_width: Advance width of a space
+        max_width: Available line width in pixels
+
+    Returns:
+        List of (first word index, end word index, line width) tuples.
+    """
+    lines = []
+    start = 0
+    line_width = 0.0
+    for index, width in enumerate(widths):
+        if index == start:
+            line_width = width
+        elif line_width + space_width + width <= max_width:
+            line_width += space_width + width
+        else:
+            lines.append((start, index, line_width))
+            start = index
+            line_width = width
+    if start < len(widths):
+        lines.append((start, len(widths), line_width))
+    return lines
+
+
+def place_lines(line_widths: List[float], line_height: float, image_width: float,
+                image_height: float) -> List[Tuple[float, float]]:
+    """
+    Center lines horizontally and the whole block vertically.
+
+    Args:
+        line_widths: Width of every line in pixels
+        line_height: Height of a line in pixels
+        image_width: Width of the image
+        image_height: Height of the image
+
+    Returns:
+        List of (x, y) positions, one per line.
+    """
+    y_text = (image_height - len(line_widths) * line_height) / 2
+    positions = []
+    for line_width in line_widths:
+        positions.append(((image_width - line_width) / 2, y_text))
+        y_text += line_height
+    return positions
+
+
+# Pure Python kernels, kept for benchmarking against the compiled ones
+PY_KERNELS = {'measure_words': measure_words, 'wrap_widths': wrap_widths, 'place_lines': place_lines}
+
+try:
+    from src.quote_maker.generator_cy import measure_words, wrap_widths, place_lines
+    COMPILED = True
+except ImportError:
+    COMPILED = False
+
+
+class TextLayout:
+    """Wraps text on measured pixel width and places every line in one pass."""
+
+    def __init__(self, font: ImageFont.FreeTypeFont, image_width: int, image_height: int, margin: int = 0):
+        """
+        Initialize the TextLayout.
+
+        Args:
+            font: Font used to render the text
+            image_width: Width of the image in pixels
+            image_height: Height of the image in pixels
+            margin: Horizontal margin kept free on both sides
+        """
+        self.metrics = get_word_metrics(font)
+        self.image_width = image_width
+        self.image_height = image_height
+        self.max_width = max(image_width - 2 * margin, 1)
+
+    def wrap(self, text: str) -> List[Tuple[str, float]]:
+        """
+        Wrap text into lines that fit the available width.
+
+        Args:
+            text: Text to wrap
+
+        Returns:
+            List of (line, line width) tuples.
+        """
+        metrics = self.metrics
+        words, widths = measure_words(metrics, text.split(), self.max_width)
+
+        return [
+            (' '.join(words[start:end]), line_width)
+            for start, end, line_width in wrap_widths(widths, metrics.space_width, self.max_width)
+        ]
+
+    def layout(self, text: str) -> List[Tuple[str, float, float]]:
+        """
+        Wrap and position text on the image.
+
+        Args:
+            text: Text to lay out
+
+        Returns:
+            List of (line, x, y) tuples ready to be drawn.
+        """
+        lines = self.wrap(text)
+        positions = place_lines(
+            [line_width for _, line_width in lines],
+            self.metrics.line_height, self.image_width, self.image_height
+        )
+        return [(line, x, y) for (line, _), (x, y) in zip(lines, positions)]
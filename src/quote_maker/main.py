@@ -2,14 +2,19 @@
 Main entry point for the Quote Maker application.
 """
 
+import os
+import uuid
 import logging
 import argparse
+import signal
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
 
-from src.quote_maker.quote_fetcher import QuoteFetcher
-from src.quote_maker.generator import ImageGenerator
-from src.quote_maker.facebook import SocialPoster
+# Components that pull in PIL, requests or sqlite3 are imported where they
+# are first used, so --help and short runs only load what they need
+from src.quote_maker.encoders import ENCODER_PROFILES, get_encoder
 from config.config import ConfigManager
 
 
@@ -29,7 +34,7 @@ def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='Quote Maker - Generate and share quote images')
     parser.add_argument('--config', help='Path to configuration file')
-    parser.add_argument('--quote-source', choices=['manual', 'api', 'file'], 
+    parser.add_argument('--quote-source', choices=['manual', 'api', 'file', 'store'], 
                        default='manual', help='Source for quotes')
     parser.add_argument('--quote-file', help='Path to quotes file (for file source)')
     parser.add_argument('--api-url', help='API URL for quotes (for api source)')
@@ -38,12 +43,87 @@ def parse_arguments():
     parser.add_argument('--platform', choices=['facebook', 'all'], 
                        default='facebook', help='Social media platform to post to')
     parser.add_argument('--output', help='Output path for generated image')
+    parser.add_argument('--encoder-profile', choices=sorted(ENCODER_PROFILES),
+                       help='Image encoder profile (overrides ENCODER_PROFILE/OUTPUT_FORMAT)')
+    parser.add_argument('--batch', metavar='FILE',
+                       help='Render every quote in FILE (JSON, NDJSON, CSV or one quote per line); images only')
+    parser.add_argument('--workers', type=int, help='Number of worker processes for batch rendering')
+    parser.add_argument('--output-dir', help='Output directory for batch rendered images')
+    parser.add_argument('--page-name', help='Page name shown on the image (non-interactive modes)')
+    parser.add_argument('--queue', action='store_true',
+                       help='Add posts to the post queue (POST_QUEUE_PATH) instead of posting now; '
+                            'with --batch, queue every rendered image')
+    parser.add_argument('--drain-queue', action='store_true',
+                       help='Send the queued posts within the platform rate limits, then exit')
+    parser.add_argument('--pipeline', action='store_true',
+                       help='Fetch, render and post --count quotes without prompts, overlapping the stages')
+    parser.add_argument('--count', type=int, default=10, help='Number of quotes processed by --pipeline')
+    parser.add_argument('--daemon', action='store_true',
+                       help='Serve render/post jobs over HTTP with warm worker processes until SIGTERM')
+    parser.add_argument('--campaigns', action='store_true',
+                       help='Post the CAMPAIGNS from the configuration on their schedules until SIGTERM')
+    parser.add_argument('--host', help='Interface the daemon listens on (default: DAEMON_HOST)')
+    parser.add_argument('--port', type=int, help='Port the daemon listens on (default: DAEMON_PORT)')
     return parser.parse_args()
 
 
+def parse_import_arguments(argv):
+    """Parse command line arguments of the import command."""
+    parser = argparse.ArgumentParser(prog='quote-maker import',
+                                     description='Bulk import quote files into a SQLite database')
+    parser.add_argument('files', nargs='+', help='Quote files (JSON, NDJSON, CSV or one quote per line)')
+    parser.add_argument('--db', required=True, help='Path to the SQLite database')
+    parser.add_argument('--table', default='quotes', help='Table read by the database source (default: quotes)')
+    parser.add_argument('--batch-size', type=int, default=50000, help='Rows per transaction')
+    parser.add_argument('--store', action='store_true',
+                       help='Import into the deduplicated quote store instead of the quotes table')
+    return parser.parse_args(argv)
+
+
+def run_import(argv) -> bool:
+    """Run the import command."""
+    args = parse_import_arguments(argv)
+    
+    import sqlite3
+    from src.quote_maker.corpus import iter_quotes
+    from src.quote_maker.importer import import_files
+    from src.quote_maker.quote_store import QuoteStore
+    
+    def report(rows, seconds):
+        print(f"  {rows} rows ({rows / seconds if seconds else 0:.0f} rows/s)")
+    
+    try:
+        if args.store:
+            store = QuoteStore(args.db)
+            start = time.perf_counter()
+            read = {'rows': 0}
+            
+            def store_progress(rows, seconds):
+                read['rows'] = rows
+                report(rows, seconds)
+            
+            quotes = (quote for file_path in args.files for quote in iter_quotes(file_path))
+            added = store.add_many(quotes, batch_size=args.batch_size, progress=store_progress)
+            seconds = time.perf_counter() - start
+            print(f"Imported {added} new quotes into the quote store ({store.count()} total) from "
+                  f"{read['rows']} rows in {seconds:.1f}s ({read['rows'] / seconds if seconds else 0:.0f} rows/s).")
+        else:
+            stats = import_files(args.db, args.files, table_name=args.table,
+                                 batch_size=args.batch_size, progress=report)
+            print(f"Imported {stats['rows']} quotes in {stats['seconds']:.1f}s "
+                  f"({stats['rows_per_second']:.0f} rows/s).")
+        return True
+    except (IOError, ValueError, sqlite3.Error) as e:
+        print(f"Import failed: {e}")
+        return False
+
+
 class QuoteMakerApp:
     """Main application class for Quote Maker."""
     
+    # Fetches attempted before accepting a quote that was posted recently
+    MAX_DUPLICATE_RETRIES = 5
+    
     def __init__(self, config_file: str = None):
         """
         Initialize the Quote Maker application.
@@ -55,13 +135,71 @@ class QuoteMakerApp:
         setup_logging(self.config_manager)
         self.logger = logging.getLogger(__name__)
         
-        # Initialize components
-        self.quote_fetcher = QuoteFetcher()
-        self.image_generator = ImageGenerator(self.config_manager)
-        self.social_poster = SocialPoster(self.config_manager)
+        # Components are created on first use by the chosen code path
+        self._quote_fetcher = None
+        self._image_generator = None
+        self._social_poster = None
+        self._quote_store = None
+        self._post_queue = None
+        self._http_client_ready = False
         
         self.logger.info("Quote Maker application initialized")
     
+    @property
+    def quote_fetcher(self):
+        """Quote fetcher, created on first use."""
+        if self._quote_fetcher is None:
+            from src.quote_maker.quote_fetcher import QuoteFetcher
+            self._setup_http_client()
+            self._quote_fetcher = QuoteFetcher()
+        return self._quote_fetcher
+    
+    @property
+    def image_generator(self):
+        """Image generator with warmed fonts, created on first use."""
+        if self._image_generator is None:
+            from src.quote_maker.generator import ImageGenerator
+            self._image_generator = ImageGenerator(self.config_manager)
+            self._image_generator.warm_fonts()
+        return self._image_generator
+    
+    @property
+    def social_poster(self):
+        """Social poster for the configured platforms, created on first use."""
+        if self._social_poster is None:
+            from src.quote_maker.facebook import SocialPoster
+            self._setup_http_client()
+            self._social_poster = SocialPoster(self.config_manager)
+        return self._social_poster
+    
+    @property
+    def quote_store(self):
+        """Quote store, or None if QUOTE_STORE_PATH is not configured."""
+        if self._quote_store is None and self.config_manager.get('QUOTE_STORE_PATH'):
+            from src.quote_maker.quote_store import QuoteStore
+            self._quote_store = QuoteStore(self.config_manager.QUOTE_STORE_PATH)
+        return self._quote_store
+    
+    @property
+    def post_queue(self):
+        """Post queue, or None if POST_QUEUE_PATH is not configured."""
+        if self._post_queue is None and self.config_manager.get('POST_QUEUE_PATH'):
+            from src.quote_maker.post_queue import PostQueue
+            self._post_queue = PostQueue(self.config_manager.POST_QUEUE_PATH)
+        return self._post_queue
+    
+    def close(self):
+        """Release the files of the components that were created."""
+        if self._quote_fetcher is not None:
+            self._quote_fetcher.close()
+    
+    def _setup_http_client(self):
+        """Configure the shared HTTP client before the first component that uses it."""
+        if not self._http_client_ready:
+            from src.quote_maker.http_session import get_http_client
+            get_http_client(self.config_manager)
+            self._http_client_ready = True
+    
     def get_user_input(self):
         """Get quote and page name from user input."""
         print("~~~ Quote Maker ~~~")
@@ -89,21 +227,291 @@ class QuoteMakerApp:
                 'author': page_name
             }
         else:
-            quote_data = self.quote_fetcher.get_quote(source, **kwargs)
-            if not quote_data:
-                self.logger.error(f"Failed to get quote from {source}")
-                return None
+            repost_days = self.config_manager.get('QUOTE_REPOST_DAYS')
+            for _ in range(self.MAX_DUPLICATE_RETRIES):
+                quote_data = self.quote_fetcher.get_quote(source, **kwargs)
+                if not quote_data:
+                    self.logger.error(f"Failed to get quote from {source}")
+                    return None
+                if not (self.quote_store and repost_days and
+                        self.quote_store.posted_within(quote_data['text'], repost_days)):
+                    break
+                self.logger.info(f"Skipping quote posted within the last {repost_days} days")
             return quote_data
     
+    def queue_post(self, image, message: str, platform: str, quote_data=None) -> int:
+        """
+        Add a post to the post queue for one or all platforms.
+        
+        Args:
+            image: Path to the image, or the encoded image bytes
+            message: Message to post
+            platform: Platform name, or 'all' for every configured platform
+            quote_data: Quote recorded in the quote store once posted (optional)
+            
+        Returns:
+            Number of posts queued.
+        """
+        platforms = self.social_poster.get_available_platforms() if platform == 'all' else [platform]
+        meta = {'text': quote_data['text'], 'author': quote_data.get('author')} if quote_data else None
+        for platform_name in platforms:
+            self.post_queue.enqueue(platform_name, image, message, meta)
+        return len(platforms)
+    
+    def run_queue(self):
+        """Send every queued post, following rate limits and retry delays."""
+        from src.quote_maker.post_queue import PostScheduler
+        
+        def posted(post):
+            print(f"Posted queued post {post['id']} to {post['platform']}")
+            if self.quote_store and post['meta'].get('text'):
+                self.quote_store.mark_posted(post['meta']['text'], post['meta'].get('author'))
+        
+        scheduler = PostScheduler.from_config(self.post_queue, self.social_poster, self.config_manager,
+                                              on_posted=posted)
+        try:
+            drained = scheduler.drain()
+        except KeyboardInterrupt:
+            print("\nOperation cancelled by user. Unsent posts stay queued.")
+            return False
+        except Exception as e:
+            self.logger.error(f"Error draining the post queue: {e}")
+            print(f"Could not drain the post queue: {e}")
+            return False
+        finally:
+            scheduler.close()
+        
+        stats = scheduler.stats()
+        print(f"Queue drained: {stats['posted']} posted, {stats['retried']} retried, "
+              f"{stats['throttled']} throttled, {stats['failed']} failed.")
+        return drained and not stats['failed']
+    
+    def run_pipeline(self, args):
+        """Fetch, render and publish quotes non-interactively as overlapping stages."""
+        if args.quote_source == 'manual':
+            print("--pipeline needs a non-interactive quote source (api, file or store).")
+            return False
+        
+        from src.quote_maker.pipeline import QuotePipeline
+        
+        quote_kwargs = self._quote_source_kwargs(args)
+        if quote_kwargs is None:
+            return False
+        source = self.quote_fetcher.create_source(args.quote_source, **quote_kwargs)
+        output_dir = args.output_dir or '.'
+        if args.no_post:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        def publish(result):
+            if args.no_post:
+                output_path = os.path.join(output_dir, f"{uuid.uuid4()}{self.image_generator.encoder.extension}")
+                result['path'] = self.image_generator.save_image(result['image'], output_path)
+                return True
+            if args.queue:
+                return self.queue_post(result['image'], result['logo'], args.platform, {'text': result['text']}) > 0
+            if args.platform == 'all':
+                success = any(self.social_poster.post_to_all_platforms(result['image'], result['logo']).values())
+            else:
+                success = self.social_poster.post_to_platform(args.platform, result['image'], result['logo'])
+            if success and self.quote_store:
+                self.quote_store.mark_posted(result['text'])
+            return success
+        
+        repost_days = self.config_manager.get('QUOTE_REPOST_DAYS')
+        quote_filter = None
+        if self.quote_store and repost_days:
+            quote_filter = lambda quote: not self.quote_store.posted_within(quote['text'], repost_days)
+        
+        pipeline = QuotePipeline(source, self.image_generator, publish, page_name=args.page_name,
+                                 render_workers=args.workers, quote_filter=quote_filter)
+        try:
+            for result in pipeline.run(args.count):
+                if result['published'] and args.no_post:
+                    print(f"Generated image: {result['path']}")
+                elif result['published']:
+                    target = "the post queue" if args.queue else args.platform
+                    print(f"Published item {result['index']} to {target} ({result['publish_ms']:.0f} ms)")
+                else:
+                    print(f"Failed item {result['index']}: {result['error']}")
+        except KeyboardInterrupt:
+            print("\nOperation cancelled by user.")
+            return False
+        
+        stats = pipeline.stats()
+        print(f"Pipeline finished: {stats['published']} published, "
+              f"{stats['render_failed'] + stats['publish_failed']} failed, {stats['skipped']} skipped "
+              f"in {stats['seconds']:.1f}s ({stats['per_second']:.2f}/s).")
+        return stats['published'] > 0 and not (stats['render_failed'] or stats['publish_failed'])
+    
+    def run_daemon(self, args):
+        """Serve render and post jobs until SIGTERM, then drain."""
+        from src.quote_maker.daemon import QuoteDaemon
+        
+        try:
+            daemon = QuoteDaemon(
+                self.image_generator, self.social_poster,
+                host=args.host or self.config_manager.get('DAEMON_HOST', '127.0.0.1'),
+                port=args.port if args.port is not None else self.config_manager.get('DAEMON_PORT', 8080),
+                workers=args.workers,
+                drain_timeout=self.config_manager.get('DAEMON_DRAIN_TIMEOUT', 30),
+                post_queue=self.post_queue,
+                quote_store=self.quote_store,
+            )
+        except OSError as e:
+            print(f"Could not start the daemon: {e}")
+            return False
+        
+        print(f"Quote Maker daemon listening on {daemon.url} (SIGTERM or Ctrl+C drains and stops)")
+        daemon.serve_until_signalled()
+        return True
+    
+    def run_campaigns(self):
+        """Post the configured campaigns on their schedules until SIGTERM."""
+        from src.quote_maker.campaigns import CampaignScheduler, load_campaigns
+        
+        try:
+            campaigns = load_campaigns(self.config_manager.get('CAMPAIGNS'))
+        except ValueError as e:
+            print(f"Invalid CAMPAIGNS configuration: {e}")
+            return False
+        if not campaigns:
+            print("No CAMPAIGNS configured.")
+            return False
+        
+        repost_days = self.config_manager.get('QUOTE_REPOST_DAYS')
+        for campaign in campaigns:
+            if campaign.source == 'store':
+                if not self.quote_store and 'db_path' not in campaign.source_options:
+                    print(f"Campaign '{campaign.name}' uses the store source but QUOTE_STORE_PATH is not configured.")
+                    return False
+                campaign.source_options.setdefault('db_path', self.config_manager.get('QUOTE_STORE_PATH'))
+                campaign.source_options.setdefault('exclude_posted_days', repost_days)
+            if campaign.queue and not self.post_queue:
+                print(f"Campaign '{campaign.name}' queues its posts but POST_QUEUE_PATH is not configured.")
+                return False
+        
+        scheduler = CampaignScheduler(
+            campaigns, self.image_generator, self.social_poster,
+            state_path=self.config_manager.get('CAMPAIGN_STATE_PATH', 'campaign_state.json'),
+            fetcher=self.quote_fetcher,
+            prerender_seconds=self.config_manager.get('CAMPAIGN_PRERENDER_SECONDS', 600),
+            grace_seconds=self.config_manager.get('CAMPAIGN_GRACE_SECONDS', 300),
+            post_queue=self.post_queue,
+            quote_store=self.quote_store,
+            repost_days=repost_days,
+        )
+        
+        def report(outcome):
+            slot = f"{datetime.fromtimestamp(outcome['slot']):%Y-%m-%d %H:%M}"
+            if 'first_slot' in outcome:
+                slot = f"{datetime.fromtimestamp(outcome['first_slot']):%Y-%m-%d %H:%M} to {slot}"
+            print(f"[{outcome['campaign']}] {outcome['status']} slot {slot} {outcome['results']}")
+        
+        def request_stop(signum, frame):
+            self.logger.info(f"Received signal {signum}, stopping campaigns")
+            scheduler.stop()
+        
+        previous = {signum: signal.signal(signum, request_stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            for entry in scheduler.upcoming():
+                print(f"Campaign '{entry['campaign']}' next posts at "
+                      f"{datetime.fromtimestamp(entry['dispatch_at']):%Y-%m-%d %H:%M:%S}")
+            scheduler.run_forever(on_outcome=report)
+        finally:
+            scheduler.close()
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        print("Campaigns stopped.")
+        return True
+    
+    def _quote_source_kwargs(self, args):
+        """Build the quote source arguments from the command line, or None if the source is not usable."""
+        quote_kwargs = {}
+        if args.quote_file:
+            quote_kwargs['file_path'] = args.quote_file
+        if args.api_url:
+            quote_kwargs['api_url'] = args.api_url
+        if args.quote_source == 'store':
+            if not self.quote_store:
+                print("QUOTE_STORE_PATH is not configured.")
+                return None
+            quote_kwargs['db_path'] = self.config_manager.QUOTE_STORE_PATH
+            quote_kwargs['exclude_posted_days'] = self.config_manager.get('QUOTE_REPOST_DAYS')
+        return quote_kwargs
+    
+    def run_batch(self, args):
+        """Render every quote of a batch file over a process pool."""
+        from src.quote_maker.quote_fetcher import StreamingQuoteSource
+        
+        def items():
+            for quote in StreamingQuoteSource(args.batch):
+                page_name = args.page_name or quote['author']
+                yield {'text': quote['text'], 'logo': f"Published by, -{page_name}-"}
+        
+        succeeded = failed = 0
+        try:
+            results = self.image_generator.create_quote_images(
+                items(), workers=args.workers, output_dir=args.output_dir
+            )
+            for result in results:
+                if result['error']:
+                    failed += 1
+                    print(f"Failed item {result['index']}: {result['error']}")
+                else:
+                    succeeded += 1
+                    detail = "cached" if result['cached'] else f"encoded in {result['encode_ms']:.1f} ms"
+                    print(f"Generated image: {result['path']} ({result['size']} bytes, {detail})")
+                    if args.queue:
+                        self.queue_post(os.path.abspath(result['path']), result['logo'], args.platform,
+                                        {'text': result['text']})
+        except KeyboardInterrupt:
+            print("\nOperation cancelled by user.")
+            return False
+        except (IOError, ValueError) as e:
+            self.logger.error(f"Error reading batch file: {e}")
+            print(f"Could not read batch file: {e}")
+            return False
+        
+        print(f"Batch finished: {succeeded} generated, {failed} failed.")
+        if args.queue:
+            print("Rendered images were added to the post queue; send them with --drain-queue.")
+        return failed == 0
+    
     def run(self, args):
         """Run the main application logic."""
+        if (args.queue or args.drain_queue) and not self.post_queue:
+            print("POST_QUEUE_PATH is not configured.")
+            return False
+        
+        if args.drain_queue:
+            return self.run_queue()
+        
+        # Every path below renders, so build the generator once and report bad settings here
+        try:
+            generator = self.image_generator
+            if args.encoder_profile:
+                generator.encoder = get_encoder(profile=args.encoder_profile)
+        except ValueError as e:
+            print(f"Invalid settings: {e}")
+            return False
+        
+        if args.batch:
+            return self.run_batch(args)
+        
+        if args.pipeline:
+            return self.run_pipeline(args)
+        
+        if args.daemon:
+            return self.run_daemon(args)
+        
+        if args.campaigns:
+            return self.run_campaigns()
+        
         try:
             # Get quote from specified source
-            quote_kwargs = {}
-            if args.quote_file:
-                quote_kwargs['file_path'] = args.quote_file
-            if args.api_url:
-                quote_kwargs['api_url'] = args.api_url
+            quote_kwargs = self._quote_source_kwargs(args)
+            if quote_kwargs is None:
+                return False
             
             quote_data = self.get_quote_from_source(args.quote_source, **quote_kwargs)
             if not quote_data:
@@ -119,36 +527,44 @@ class QuoteMakerApp:
                 if page_name:
                     logo_text = f"Published by, -{page_name}-"
             
-            # Generate image
+            # Generate image in memory; writing it to disk is optional
             self.logger.info("Generating quote image...")
-            image_path = self.image_generator.create_quote_image(
-                quote_data['text'], 
-                logo_text,
-                args.output
-            )
+            image_data = self.image_generator.create_quote_bytes(quote_data['text'], logo_text)
             
-            if not image_path:
+            if not image_data:
                 print("Image generation failed.")
                 return False
             
-            print(f"Generated image: {image_path}")
+            if args.no_post or args.output:
+                image_path = self.image_generator.save_image(image_data, args.output)
+                print(f"Generated image: {image_path}")
             
             # Post to social media if requested
             if not args.no_post:
                 if args.quote_source == 'manual':
                     post_confirm = input("Is it ok to post to social media? (yes/no): ").lower()
                     if not post_confirm.startswith('y'):
+                        if not args.output:
+                            image_path = self.image_generator.save_image(image_data)
+                            print(f"Generated image: {image_path}")
                         print("Image saved locally. Not posting to social media.")
                         return True
                 
+                if args.queue:
+                    queued = self.queue_post(image_data, logo_text, args.platform, quote_data)
+                    print(f"Queued {queued} post(s); send them with --drain-queue.")
+                    return True
+                
                 self.logger.info(f"Posting to {args.platform}...")
                 if args.platform == 'facebook':
-                    success = self.social_poster.post_to_platform('facebook', image_path, logo_text)
+                    success = self.social_poster.post_to_platform('facebook', image_data, logo_text)
                 elif args.platform == 'all':
-                    results = self.social_poster.post_to_all_platforms(image_path, logo_text)
+                    results = self.social_poster.post_to_all_platforms(image_data, logo_text)
                     success = any(results.values())
                 
                 if success:
+                    if self.quote_store:
+                        self.quote_store.mark_posted(quote_data['text'], quote_data['author'])
                     print("Posted successfully to social media!")
                 else:
                     print("Failed to post to social media.")
@@ -166,10 +582,16 @@ class QuoteMakerApp:
 
 def main():
     """Main function to run the quote maker."""
+    if sys.argv[1:2] == ['import']:
+        sys.exit(0 if run_import(sys.argv[2:]) else 1)
+    
     args = parse_arguments()
     
     app = QuoteMakerApp(args.config)
-    success = app.run(args)
+    try:
+        success = app.run(args)
+    finally:
+        app.close()
     
     sys.exit(0 if success else 1)
 
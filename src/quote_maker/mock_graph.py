@@ -0,0 +1,189 @@
+"""
+Local stand-in for the Facebook Graph API photos endpoint.
+
+Used by the tests and the posting benchmark; point FACEBOOK_GRAPH_URL at it.
+
+Usage:
+    python -m src.quote_maker.mock_graph [--port 8765] [--latency 0.1] [--error-rate 0.05] [--rate-limit 20]
+"""
+
+import json
+import time
+import random
+import argparse
+import itertools
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+class _GraphHandler(BaseHTTPRequestHandler):
+    """Answers POST /{page_id}/photos like the Graph API."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        mock = self.server.mock
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+        parts = urlsplit(self.path).path.strip('/').split('/')
+        if len(parts) >= 2 and parts[0].startswith('v') and parts[0][1:2].isdigit():
+            parts = parts[1:]
+        if len(parts) != 2 or parts[1] != 'photos':
+            self._send_error(404, 803, "Unknown path")
+            return
+        if not parse_qs(urlsplit(self.path).query).get('access_token'):
+            self._send_error(400, 190, "An access token is required")
+            return
+
+        outcome = mock.handle_post()
+        if outcome == 'throttled':
+            self._send_error(429, 4, "(#4) Application request limit reached",
+                             {'Retry-After': f"{mock.retry_after:g}"})
+        elif outcome == 'error':
+            self._send_error(500, 2, "An unexpected error has occurred. Please retry your request later.")
+        else:
+            self._send_json(200, {'id': outcome, 'post_id': f"{parts[0]}_{outcome}"})
+
+    def _send_error(self, status: int, code: int, message: str, headers: Optional[Dict[str, str]] = None):
+        """Send a Graph API error body."""
+        self._send_json(status, {'error': {'message': message, 'type': 'OAuthException', 'code': code}}, headers)
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        """Send a JSON response."""
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockGraphServer:
+    """Threaded HTTP server mimicking /{page_id}/photos with latency, errors and throttling."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, rate_limit: Optional[float] = None, retry_after: float = 1.0):
+        """
+        Initialize the MockGraphServer.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            latency: Seconds every accepted post takes
+            jitter: Maximum random seconds added to the latency
+            error_rate: Fraction of accepted posts answered with a 500 error
+            rate_limit: Posts per second accepted before answering 429 (None for no limit)
+            retry_after: Seconds sent in the Retry-After header of 429 responses
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self._server = ThreadingHTTPServer((host, port), _GraphHandler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._tokens = float(rate_limit or 0)
+        self._updated = time.monotonic()
+        self._counters = {'requests': 0, 'posted': 0, 'errors': 0, 'throttled': 0}
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as FACEBOOK_GRAPH_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockGraphServer':
+        """Serve in a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name='mock-graph', daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve in the calling thread."""
+        self._server.serve_forever()
+
+    def close(self):
+        """Stop serving and release the port."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the requests/posted/errors/throttled counters."""
+        with self._lock:
+            return dict(self._counters)
+
+    def handle_post(self) -> str:
+        """
+        Decide the outcome of one post, sleeping for the simulated latency.
+
+        Returns:
+            'throttled', 'error' or the id of the new photo.
+        """
+        with self._lock:
+            self._counters['requests'] += 1
+            if self.rate_limit:
+                now = time.monotonic()
+                self._tokens = min(self.rate_limit, self._tokens + (now - self._updated) * self.rate_limit)
+                self._updated = now
+                if self._tokens < 1:
+                    self._counters['throttled'] += 1
+                    return 'throttled'
+                self._tokens -= 1
+
+        time.sleep(self.latency + random.uniform(0, self.jitter))
+
+        with self._lock:
+            if random.random() < self.error_rate:
+                self._counters['errors'] += 1
+                return 'error'
+            self._counters['posted'] += 1
+            return str(next(self._ids))
+
+    def __enter__(self) -> 'MockGraphServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    """Run the mock server from the command line."""
+    parser = argparse.ArgumentParser(description='Local mock of the Graph API photos endpoint')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    parser.add_argument('--latency', type=float, default=0.1, help='Seconds per post')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Maximum random extra seconds per post')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of posts failing with 500')
+    parser.add_argument('--rate-limit', type=float, help='Posts per second before answering 429')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds of 429 responses')
+    args = parser.parse_args()
+
+    server = MockGraphServer(args.host, args.port, args.latency, args.jitter,
+                             args.error_rate, args.rate_limit, args.retry_after)
+    print(f"Mock Graph API listening on {server.url} (set FACEBOOK_GRAPH_URL to this URL)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Streaming fetch -> render -> publish pipeline for the Quote Maker application.
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from src.quote_maker.quote_fetcher import QuoteSource
+from src.quote_maker.prefetch import PrefetchingQuoteSource
+from src.quote_maker.generator import ImageGenerator
+
+
+class QuotePipeline:
+    """
+    Runs fetching, rendering and publishing as overlapping stages.
+
+    Quotes are fetched by prefetch threads into a bounded buffer, rendered
+    and encoded on the batch process pool, and handed to publish threads.
+    Each hand-off is bounded, so a slow stage holds back the ones before it
+    instead of letting work pile up in memory.
+    """
+
+    # Consecutive quotes rejected by the filter before the pipeline gives up
+    MAX_CONSECUTIVE_SKIPS = 100
+
+    def __init__(self, source: QuoteSource, generator: ImageGenerator,
+                 publish: Callable[[Dict[str, Any]], bool], page_name: Optional[str] = None,
+                 fetch_workers: int = 2, render_workers: Optional[int] = None, publish_workers: int = 4,
+                 queue_size: int = 16, fetch_timeout: Optional[float] = 10.0,
+                 quote_filter: Optional[Callable[[Dict[str, str]], bool]] = None):
+        """
+        Initialize the QuotePipeline.
+
+        Args:
+            source: Quote source (must be thread-safe when fetch_workers > 1)
+            generator: Image generator whose process pool renders the images
+            publish: Called on a publish thread with every rendered result (its 'image'
+                holds the encoded bytes); returns True if the image was published
+            page_name: Page name shown on the images (defaults to the quote author)
+            fetch_workers: Number of fetch threads
+            render_workers: Number of render processes (defaults to BATCH_WORKERS or the CPU count)
+            publish_workers: Number of publish threads
+            queue_size: Capacity of the fetch buffer and of the publish backlog
+            fetch_timeout: Seconds to wait for a quote before ending the run
+            quote_filter: Predicate dropping fetched quotes, e.g. recently posted ones (optional)
+        """
+        self.source = source
+        self.generator = generator
+        self.publish = publish
+        self.page_name = page_name
+        self.fetch_workers = fetch_workers
+        self.render_workers = render_workers
+        self.publish_workers = publish_workers
+        self.queue_size = queue_size
+        self.fetch_timeout = fetch_timeout
+        self.quote_filter = quote_filter
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._started = 0.0
+        self._finished: Optional[float] = None
+
+    def run(self, count: int) -> Iterator[Dict[str, Any]]:
+        """
+        Push count quotes through the pipeline.
+
+        Results are yielded as soon as each quote is published (or fails), so
+        they do not follow the fetch order.
+
+        Args:
+            count: Number of quotes to fetch, render and publish
+
+        Returns:
+            Iterator of the render result dicts (without the image bytes), with
+            'published' and 'publish_ms' added.
+        """
+        self._counters = {'fetched': 0, 'skipped': 0, 'rendered': 0, 'render_failed': 0,
+                          'published': 0, 'publish_failed': 0, 'publish_ms': 0.0}
+        self._started = time.perf_counter()
+        self._finished = None
+        # Fetch only the quotes needed, plus one for every quote the filter drops,
+        # so stream and store sources are not drained past the end of the run
+        prefetch = PrefetchingQuoteSource(self.source, high_water=max(min(self.queue_size, count), 1),
+                                          workers=self.fetch_workers, timeout=self.fetch_timeout,
+                                          max_fetches=count)
+        backlog = threading.BoundedSemaphore(self.queue_size)
+
+        try:
+            with prefetch, ThreadPoolExecutor(max_workers=self.publish_workers,
+                                              thread_name_prefix='pipeline-publish') as publishers:
+                pending = set()
+                results = self.generator.create_quote_images(
+                    self._items(prefetch, count), workers=self.render_workers, in_memory=True
+                )
+                for result in results:
+                    if result['error']:
+                        self._count('render_failed')
+                        yield {**result, 'published': False, 'publish_ms': 0.0}
+                        continue
+                    self._count('rendered')
+
+                    # Blocks the render stage while the publish backlog is full
+                    backlog.acquire()
+                    future = publishers.submit(self._publish, result)
+                    future.add_done_callback(lambda _: backlog.release())
+                    pending.add(future)
+
+                    finished = [future for future in pending if future.done()]
+                    for future in finished:
+                        pending.discard(future)
+                        yield future.result()
+
+                for future in list(pending):
+                    yield future.result()
+        finally:
+            self._finished = time.perf_counter()
+
+    def stats(self) -> Dict[str, float]:
+        """Get the stage counters, the elapsed seconds and the published items per second."""
+        with self._lock:
+            stats = dict(self._counters)
+        end = self._finished if self._finished is not None else time.perf_counter()
+        stats['seconds'] = end - self._started if self._started else 0.0
+        stats['per_second'] = stats.get('published', 0) / stats['seconds'] if stats['seconds'] else 0.0
+        return stats
+
+    def _items(self, prefetch: PrefetchingQuoteSource, count: int) -> Iterator[Dict[str, str]]:
+        """Turn fetched quotes into render items."""
+        produced = skipped = 0
+        while produced < count:
+            quote = prefetch.get_quote()
+            if not quote:
+                if prefetch.exhausted():
+                    self.logger.warning(f"Fetch budget of {prefetch.max_fetches} quotes spent, ending pipeline")
+                else:
+                    self.logger.warning(f"No quote arrived within {self.fetch_timeout}s, ending pipeline")
+                return
+            self._count('fetched')
+
+            if self.quote_filter and not self.quote_filter(quote):
+                self._count('skipped')
+                skipped += 1
+                if skipped >= self.MAX_CONSECUTIVE_SKIPS:
+                    self.logger.warning(f"{skipped} quotes in a row were filtered out, ending pipeline")
+                    return
+                prefetch.extend()
+                continue
+
+            skipped = 0
+            produced += 1
+            if produced == count:
+                prefetch.stop()
+            page_name = self.page_name or quote.get('author') or 'Unknown'
+            yield {'text': quote['text'], 'logo': f"Published by, -{page_name}-"}
+
+    def _publish(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Publish one rendered image on a publish thread."""
+        start = time.perf_counter()
+        try:
+            published = bool(self.publish(result))
+            error = None if published else "Publishing failed"
+        except Exception as e:
+            self.logger.error(f"Error publishing item {result['index']}: {e}")
+            published, error = False, str(e)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            self._counters['published' if published else 'publish_failed'] += 1
+            self._counters['publish_ms'] += elapsed_ms
+        outcome = {key: value for key, value in result.items() if key != 'image'}
+        return {**outcome, 'error': error, 'published': published, 'publish_ms': elapsed_ms}
+
+    def _count(self, name: str):
+        """Increment a counter."""
+        with self._lock:
+            self._counters[name] += 1
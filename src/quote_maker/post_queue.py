@@ -0,0 +1,508 @@
+"""
+Durable outbound post queue and rate-limited scheduler for the Quote Maker application.
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import socket
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.quote_maker.facebook import ImageSource, SocialPlatform, SocialPoster
+from src.quote_maker.sqlite_pool import get_pool
+
+
+PENDING = 'pending'
+SENDING = 'sending'
+DONE = 'done'
+FAILED = 'failed'
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS post_queue (
+        id INTEGER PRIMARY KEY,
+        platform TEXT NOT NULL,
+        message TEXT NOT NULL,
+        image BLOB,
+        image_path TEXT,
+        meta TEXT,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at REAL NOT NULL,
+        created_at REAL NOT NULL,
+        posted_at REAL,
+        last_error TEXT,
+        claimed_by TEXT,
+        claimed_at REAL
+    )""",
+    "CREATE INDEX IF NOT EXISTS post_queue_due ON post_queue (status, platform, next_attempt_at)",
+]
+
+# Seconds a claim is held before another scheduler may take the post over
+DEFAULT_CLAIM_LEASE = 900.0
+
+
+class PostQueue:
+    """SQLite queue of posts waiting to be sent, surviving restarts."""
+
+    def __init__(self, db_path: str, owner: Optional[str] = None):
+        """
+        Initialize the PostQueue, creating its table if needed.
+
+        Args:
+            db_path: Path to the SQLite database
+            owner: Name recorded on the posts this queue claims (defaults to host, pid and a random suffix)
+        """
+        self.db_path = db_path
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.pool = get_pool(db_path, read_only=False)
+        with self.pool.connection() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+
+    def enqueue(self, platform: str, image: ImageSource, message: str,
+                meta: Optional[Dict[str, Any]] = None, delay: float = 0.0) -> int:
+        """
+        Add a post to the queue.
+
+        Args:
+            platform: Name of the platform to post to
+            image: Path to the image, or the encoded image bytes (stored in the queue)
+            message: Message to post
+            meta: JSON-serializable data handed back once the post is sent (optional)
+            delay: Seconds before the post becomes due
+
+        Returns:
+            Id of the queued post.
+        """
+        now = time.time()
+        image_data, image_path = (None, image) if isinstance(image, str) else (bytes(image), None)
+        with self.pool.connection() as conn:
+            cursor = conn.execute(
+                "INSERT INTO post_queue (platform, message, image, image_path, meta, next_attempt_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (platform, message, image_data, image_path, json.dumps(meta) if meta else None, now + delay, now)
+            )
+            conn.commit()
+            return cursor.lastrowid
+
+    def claim(self, platform: str, limit: int, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Take up to limit due posts of a platform and mark them as sending by this queue's owner.
+
+        Args:
+            platform: Name of the platform
+            limit: Maximum number of posts
+            now: Unix time used to decide which posts are due (defaults to now)
+
+        Returns:
+            Post dictionaries, oldest first.
+        """
+        now = time.time() if now is None else now
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT id, platform, message, image, image_path, meta, attempts FROM post_queue "
+                "WHERE status = ? AND platform = ? AND next_attempt_at <= ? ORDER BY next_attempt_at, id LIMIT ?",
+                (PENDING, platform, now, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE post_queue SET status = ?, claimed_by = ?, claimed_at = ? WHERE id = ?",
+                [(SENDING, self.owner, time.time(), row[0]) for row in rows]
+            )
+            conn.commit()
+
+        return [{
+            'id': row[0],
+            'platform': row[1],
+            'message': row[2],
+            'image': row[3] if row[3] is not None else row[4],
+            'meta': json.loads(row[5]) if row[5] else {},
+            'attempts': row[6],
+        } for row in rows]
+
+    def complete(self, post_id: int):
+        """Mark a post as sent."""
+        self._update(post_id, "status = ?, posted_at = ?, image = NULL", (DONE, time.time()))
+
+    def retry(self, post_id: int, delay: float, error: Optional[str] = None, count_attempt: bool = True):
+        """
+        Put a post back in the queue.
+
+        Args:
+            post_id: Id of the post
+            delay: Seconds before the post is due again
+            error: Reason of the failure (optional)
+            count_attempt: Whether the failed attempt counts towards the attempt limit
+        """
+        self._update(
+            post_id, "status = ?, next_attempt_at = ?, attempts = attempts + ?, last_error = COALESCE(?, last_error)",
+            (PENDING, time.time() + delay, int(count_attempt), error)
+        )
+
+    def fail(self, post_id: int, error: str):
+        """Give up on a post."""
+        self._update(post_id, "status = ?, attempts = attempts + 1, last_error = ?", (FAILED, error))
+
+    def recover(self, lease: float = DEFAULT_CLAIM_LEASE, now: Optional[float] = None) -> int:
+        """
+        Return posts left as sending by a crashed scheduler to the queue.
+
+        Only claims older than the lease are taken over, so posts another
+        running scheduler is still sending are left alone.
+
+        Args:
+            lease: Seconds a claim is held before it counts as abandoned
+            now: Unix time the claims are compared against (defaults to now)
+
+        Returns:
+            Number of posts recovered.
+        """
+        expired = (time.time() if now is None else now) - lease
+        with self.pool.connection() as conn:
+            cursor = conn.execute(
+                "UPDATE post_queue SET status = ?, claimed_by = NULL, claimed_at = NULL "
+                "WHERE status = ? AND (claimed_at IS NULL OR claimed_at <= ?)",
+                (PENDING, SENDING, expired)
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    def release(self) -> int:
+        """
+        Return the posts this queue's owner claimed but did not finish to the queue.
+
+        A scheduler calls this when it stops, so an interrupted run's posts are
+        sent by the next run instead of waiting out the claim lease.
+
+        Returns:
+            Number of posts released.
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.execute(
+                "UPDATE post_queue SET status = ?, claimed_by = NULL, claimed_at = NULL "
+                "WHERE status = ? AND claimed_by = ?",
+                (PENDING, SENDING, self.owner)
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    def due_platforms(self, now: Optional[float] = None) -> List[str]:
+        """Names of the platforms with posts due."""
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT platform FROM post_queue WHERE status = ? AND next_attempt_at <= ?",
+                (PENDING, time.time() if now is None else now)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def next_due(self) -> Optional[float]:
+        """Unix time the next pending post becomes due, or None if nothing is pending."""
+        with self.pool.connection() as conn:
+            return conn.execute(
+                "SELECT MIN(next_attempt_at) FROM post_queue WHERE status = ?", (PENDING,)
+            ).fetchone()[0]
+
+    def outstanding(self) -> int:
+        """Number of posts pending or being sent."""
+        with self.pool.connection() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM post_queue WHERE status IN (?, ?)", (PENDING, SENDING)
+            ).fetchone()[0]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of posts per status."""
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM post_queue GROUP BY status").fetchall()
+        return {PENDING: 0, SENDING: 0, DONE: 0, FAILED: 0, **dict(rows)}
+
+    def _update(self, post_id: int, assignments: str, values: tuple):
+        """Update one post."""
+        with self.pool.connection() as conn:
+            conn.execute(f"UPDATE post_queue SET {assignments} WHERE id = ?", (*values, post_id))
+            conn.commit()
+
+
+class RateLimiter:
+    """Token bucket limiting the posts sent to one platform."""
+
+    def __init__(self, per_minute: Optional[float], burst: int = 1):
+        """
+        Initialize the RateLimiter.
+
+        Args:
+            per_minute: Sustained posts per minute (None for no limit)
+            burst: Maximum number of posts sent back to back
+        """
+        self.rate = per_minute / 60.0 if per_minute else None
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+
+    def available(self) -> int:
+        """Number of posts that may be sent now."""
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return 0
+        if self.rate is None:
+            return self.capacity
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return int(self.tokens)
+
+    def consume(self, count: int):
+        """Spend tokens for posts that were sent."""
+        if self.rate is not None:
+            self.tokens = max(self.tokens - count, 0.0)
+
+    def block(self, seconds: float):
+        """Stop sending for a number of seconds, e.g. after a Retry-After."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+class PostScheduler:
+    """Sends queued posts in batches, following rate limits, Retry-After and exponential backoff."""
+
+    def __init__(self, queue: PostQueue, poster: SocialPoster, rate_limits: Optional[Dict[str, float]] = None,
+                 batch_size: int = 10, max_attempts: int = 8, backoff_base: float = 30.0,
+                 backoff_max: float = 3600.0, poll_interval: float = 1.0,
+                 claim_lease: float = DEFAULT_CLAIM_LEASE,
+                 on_posted: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Initialize the PostScheduler.
+
+        Args:
+            queue: Queue to send from
+            poster: Poster holding the configured platforms
+            rate_limits: Posts per minute per platform name (platforms not listed are unlimited)
+            batch_size: Maximum number of posts claimed per platform at once
+            max_attempts: Attempts before a post is marked as failed
+            backoff_base: Seconds before the first retry; doubles on every further attempt
+            backoff_max: Upper bound of the backoff, in seconds
+            poll_interval: Seconds to sleep when nothing is due
+            claim_lease: Seconds after which posts claimed but never finished are sent again
+            on_posted: Callback receiving every post once it was sent (optional)
+        """
+        self.queue = queue
+        self.poster = poster
+        self.rate_limits = rate_limits or {}
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self.claim_lease = claim_lease
+        self.on_posted = on_posted
+        self.logger = logging.getLogger(__name__)
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._counters = {'posted': 0, 'retried': 0, 'throttled': 0, 'failed': 0}
+        self._next_recovery = 0.0
+
+    @classmethod
+    def from_config(cls, queue: PostQueue, poster: SocialPoster, config_manager, **kwargs) -> 'PostScheduler':
+        """
+        Create a scheduler from configuration.
+
+        Args:
+            queue: Queue to send from
+            poster: Poster holding the configured platforms
+            config_manager: Configuration manager instance
+            **kwargs: Further arguments passed to the constructor
+
+        Returns:
+            The configured scheduler.
+        """
+        return cls(
+            queue, poster,
+            rate_limits=config_manager.get('POST_RATE_LIMITS'),
+            batch_size=config_manager.get('POST_BATCH_SIZE', 10),
+            max_attempts=config_manager.get('POST_MAX_ATTEMPTS', 8),
+            backoff_base=config_manager.get('POST_BACKOFF_BASE', 30.0),
+            backoff_max=config_manager.get('POST_BACKOFF_MAX', 3600.0),
+            claim_lease=config_manager.get('POST_CLAIM_LEASE', DEFAULT_CLAIM_LEASE),
+            **kwargs
+        )
+
+    def run_once(self) -> int:
+        """
+        Send one batch of due posts for every platform, platforms in parallel.
+
+        Returns:
+            Number of posts attempted.
+        """
+        # Check for abandoned claims once per lease, starting with the first batch
+        if time.monotonic() >= self._next_recovery:
+            self._next_recovery = time.monotonic() + self.claim_lease
+            recovered = self.queue.recover(self.claim_lease)
+            if recovered:
+                self.logger.info(f"Recovered {recovered} interrupted posts")
+
+        platform_names = self.queue.due_platforms()
+        if not platform_names:
+            return 0
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='post-scheduler')
+        return sum(self._executor.map(self._dispatch, platform_names))
+
+    def start(self) -> 'PostScheduler':
+        """Start sending in a background thread."""
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='post-scheduler', daemon=True)
+                self._thread.start()
+        return self
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Send until no post is outstanding, waiting out backoffs and rate limits.
+
+        Args:
+            timeout: Maximum number of seconds to run (None waits until done)
+
+        Returns:
+            True if the queue was drained, False on timeout or close.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.queue.outstanding():
+            if self._stop.is_set() or (deadline is not None and time.monotonic() >= deadline):
+                return False
+            if not self.run_once():
+                self._stop.wait(self._idle_delay(deadline))
+        return True
+
+    def close(self):
+        """Stop the background thread and the dispatch pool, and hand unsent claimed posts back."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        released = self.queue.release()
+        if released:
+            self.logger.info(f"Returned {released} unsent posts to the queue")
+
+    def stats(self) -> Dict[str, int]:
+        """Get the queue counts and the posted/retried/throttled/failed counters."""
+        with self._lock:
+            counters = dict(self._counters)
+        return {**self.queue.counts(), **counters}
+
+    def __enter__(self) -> 'PostScheduler':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _run(self):
+        """Background loop."""
+        while not self._stop.is_set():
+            try:
+                sent = self.run_once()
+            except Exception as e:
+                self.logger.error(f"Error dispatching posts: {e}")
+                sent = 0
+            if not sent:
+                self._stop.wait(self._idle_delay(None))
+
+    def _idle_delay(self, deadline: Optional[float]) -> float:
+        """Seconds to sleep when nothing could be sent."""
+        delay = self.poll_interval
+        next_due = self.queue.next_due()
+        if next_due is not None:
+            delay = min(delay, max(next_due - time.time(), 0.01))
+        if deadline is not None:
+            delay = min(delay, max(deadline - time.monotonic(), 0.0))
+        return delay
+
+    def _limiter(self, platform_name: str) -> RateLimiter:
+        """Get the rate limiter of a platform."""
+        with self._lock:
+            limiter = self._limiters.get(platform_name)
+            if limiter is None:
+                limiter = RateLimiter(self.rate_limits.get(platform_name), burst=self.batch_size)
+                self._limiters[platform_name] = limiter
+            return limiter
+
+    def _dispatch(self, platform_name: str) -> int:
+        """Send one batch of a platform's due posts, back to back."""
+        limiter = self._limiter(platform_name)
+        allowed = min(self.batch_size, limiter.available())
+        if not allowed:
+            return 0
+
+        posts = self.queue.claim(platform_name, allowed)
+        limiter.consume(len(posts))
+        platform = self.poster.platforms.get(platform_name)
+
+        for number, post in enumerate(posts):
+            if self._stop.is_set():
+                # Stopping: close() hands the rest of the batch back
+                break
+            if platform is None:
+                self._failed(post, f"Platform '{platform_name}' not configured")
+                continue
+
+            error, retry_after = self._send(platform, post)
+            if error is None:
+                self.queue.complete(post['id'])
+                self._count('posted')
+                if self.on_posted:
+                    self.on_posted(post)
+            elif retry_after is not None:
+                # Throttled: wait as asked and hand the rest of the batch back untouched
+                limiter.block(retry_after)
+                self.queue.retry(post['id'], retry_after, error)
+                for remaining in posts[number + 1:]:
+                    self.queue.retry(remaining['id'], retry_after, count_attempt=False)
+                self._count('throttled')
+                break
+            else:
+                self._failed(post, error)
+        return len(posts)
+
+    def _send(self, platform: SocialPlatform, post: Dict[str, Any]) -> Tuple[Optional[str], Optional[float]]:
+        """Post once, returning the reason of the failure (None on success) and the Retry-After if throttled."""
+        try:
+            result = platform.post(post['image'], post['message'])
+        except Exception as e:
+            self.logger.error(f"Error posting to {post['platform']}: {e}")
+            return str(e), None
+        if result.success:
+            return None, None
+        if result.retry_after is not None:
+            return "Platform throttled the post", result.retry_after
+        return "Platform reported failure", None
+
+    def _failed(self, post: Dict[str, Any], error: str):
+        """Retry a failed post with exponential backoff, or give up after max_attempts."""
+        attempts = post['attempts'] + 1
+        if attempts >= self.max_attempts:
+            self.logger.error(f"Giving up on post {post['id']} after {attempts} attempts: {error}")
+            self.queue.fail(post['id'], error)
+            self._count('failed')
+            return
+
+        delay = min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max)
+        delay *= random.uniform(0.5, 1.0)
+        self.logger.warning(f"Post {post['id']} failed ({error}), retrying in {delay:.1f}s")
+        self.queue.retry(post['id'], delay, error)
+        self._count('retried')
+
+    def _count(self, name: str):
+        """Increment a counter."""
+        with self._lock:
+            self._counters[name] += 1
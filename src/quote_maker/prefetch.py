@@ -0,0 +1,165 @@
+"""
+Prefetching quote buffer for the Quote Maker application.
+"""
+
+import queue
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from src.quote_maker.quote_fetcher import QuoteSource
+
+
+class PrefetchingQuoteSource(QuoteSource):
+    """Keeps a bounded queue of quotes topped up by background workers."""
+
+    def __init__(self, source: QuoteSource, high_water: int = 32, workers: int = 1,
+                 timeout: Optional[float] = 10.0, retry_delay: float = 1.0, max_fetches: Optional[int] = None):
+        """
+        Initialize the PrefetchingQuoteSource.
+
+        Args:
+            source: Source the workers fetch from
+            high_water: Number of quotes buffered ahead of the callers
+            workers: Number of background fetch threads (use 1 for sources that are not thread-safe)
+            timeout: Seconds get_quote waits when the buffer is empty (None waits forever)
+            retry_delay: Seconds a worker pauses after the source returns nothing or fails
+            max_fetches: Quotes taken from the source before the workers pause (None for no limit);
+                extend() raises it
+        """
+        self.source = source
+        self.high_water = high_water
+        self.workers = workers
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+        self.max_fetches = max_fetches
+        self.logger = logging.getLogger(__name__)
+        self._buffer: "queue.Queue[Dict[str, str]]" = queue.Queue(maxsize=high_water)
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._budget = threading.Condition(self._lock)
+        self._counters = {'fetched': 0, 'served': 0, 'starvations': 0, 'misses': 0, 'errors': 0}
+        self._reserved = 0
+
+    def start(self) -> 'PrefetchingQuoteSource':
+        """Start the background workers (done automatically on first use)."""
+        with self._lock:
+            if not self._threads:
+                for number in range(self.workers):
+                    thread = threading.Thread(target=self._fill, name=f"quote-prefetch-{number}", daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+        return self
+
+    def get_quote(self, timeout: Optional[float] = None) -> Optional[Dict[str, str]]:
+        """
+        Take a quote from the buffer.
+
+        Args:
+            timeout: Seconds to wait if the buffer is empty (defaults to the source timeout)
+
+        Returns:
+            Quote dictionary or None if none arrived in time.
+        """
+        self.start()
+        try:
+            quote = self._buffer.get_nowait()
+        except queue.Empty:
+            if self.exhausted():
+                return None
+            self._count('starvations')
+            try:
+                quote = self._buffer.get(timeout=self.timeout if timeout is None else timeout)
+            except queue.Empty:
+                return None
+        self._count('served')
+        return quote
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get queue depth and fetch/serve/starvation counters."""
+        with self._lock:
+            return {'depth': self._buffer.qsize(), 'high_water': self.high_water, **self._counters}
+
+    def extend(self, fetches: int = 1):
+        """
+        Raise max_fetches, e.g. to replace quotes the caller dropped.
+
+        Args:
+            fetches: Number of additional quotes the workers may take from the source
+        """
+        with self._budget:
+            if self.max_fetches is not None:
+                self.max_fetches += fetches
+            self._budget.notify_all()
+
+    def exhausted(self) -> bool:
+        """Check whether the max_fetches budget is spent and every fetched quote was served."""
+        with self._lock:
+            return self.max_fetches is not None and self._counters['served'] >= self.max_fetches
+
+    def stop(self):
+        """Ask the workers to stop fetching, without waiting for them."""
+        self._stop.set()
+        with self._budget:
+            self._budget.notify_all()
+
+    def close(self):
+        """Stop the workers and wait for them to finish their current fetch."""
+        self.stop()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self) -> 'PrefetchingQuoteSource':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _fill(self):
+        """Worker loop keeping the buffer at its high-water mark."""
+        while not self._stop.is_set() and self._reserve():
+            try:
+                quote = self.source.get_quote()
+            except Exception as e:
+                self.logger.error(f"Error prefetching quote: {e}")
+                self._count('errors')
+                self._release()
+                self._stop.wait(self.retry_delay)
+                continue
+
+            if not quote:
+                self._count('misses')
+                self._release()
+                self._stop.wait(self.retry_delay)
+                continue
+
+            self._count('fetched')
+            while not self._stop.is_set():
+                try:
+                    self._buffer.put(quote, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+
+    def _reserve(self) -> bool:
+        """Claim one fetch of the max_fetches budget, waiting while it is spent; False once stopped."""
+        with self._budget:
+            while self.max_fetches is not None and self._reserved >= self.max_fetches:
+                if self._stop.is_set():
+                    return False
+                self._budget.wait()
+            self._reserved += 1
+            return True
+
+    def _release(self):
+        """Give back a claimed fetch that produced no quote."""
+        with self._budget:
+            self._reserved -= 1
+            self._budget.notify()
+
+    def _count(self, name: str):
+        """Increment a counter."""
+        with self._lock:
+            self._counters[name] += 1
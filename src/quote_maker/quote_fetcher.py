@@ -2,14 +2,21 @@
 Quote fetching logic for the Quote Maker application.
 """
 
-import json
-import csv
-import sqlite3
-import requests
-from typing import Dict, List, Optional
+import time
+import random
+import threading
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, FIRST_COMPLETED, wait
 import logging
 
+from src.quote_maker.corpus import QuoteCorpus, iter_quotes
+
+if TYPE_CHECKING:
+    import sqlite3
+    from src.quote_maker.http_session import HTTPClient
+    from src.quote_maker.quote_store import QuoteStore
+
 
 class QuoteSource(ABC):
     """Abstract base class for quote sources."""
@@ -23,15 +30,21 @@ class QuoteSource(ABC):
 class APIQuoteSource(QuoteSource):
     """Quote source from external API."""
     
-    def __init__(self, api_url: str, headers: Optional[Dict[str, str]] = None):
+    def __init__(self, api_url: str, headers: Optional[Dict[str, str]] = None,
+                 client: Optional['HTTPClient'] = None):
         self.api_url = api_url
         self.headers = headers or {}
+        self.client = client
         self.logger = logging.getLogger(__name__)
     
     def get_quote(self) -> Optional[Dict[str, str]]:
         """Fetch quote from API."""
+        import requests
+        from src.quote_maker.http_session import get_http_client
+        
         try:
-            response = requests.get(self.api_url, headers=self.headers, timeout=10)
+            client = self.client or get_http_client()
+            response = client.get(self.api_url, headers=self.headers, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -63,6 +76,8 @@ class FileQuoteSource(QuoteSource):
     def __init__(self, file_path: str):
         self.file_path = file_path
         self.logger = logging.getLogger(__name__)
+        self._corpus: Optional[QuoteCorpus] = None
+        self._lock = threading.Lock()
     
     def get_quote(self) -> Optional[Dict[str, str]]:
         """Get quote from file based on file extension."""
@@ -78,33 +93,26 @@ class FileQuoteSource(QuoteSource):
             return None
     
     def _get_from_json(self) -> Optional[Dict[str, str]]:
-        """Load quote from JSON file."""
-        with open(self.file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if isinstance(data, list) and len(data) > 0:
-                import random
-                quote = random.choice(data)
-                return {
-                    'text': quote.get('text', quote.get('quote', '')),
-                    'author': quote.get('author', 'Unknown')
-                }
-        return None
+        """Pick a random quote from a JSON array file through its record index."""
+        return self._get_corpus().random_quote()
     
     def _get_from_csv(self) -> Optional[Dict[str, str]]:
-        """Load quote from CSV file."""
-        import random
-        quotes = []
-        with open(self.file_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            quotes = list(reader)
-        
-        if quotes:
-            quote = random.choice(quotes)
-            return {
-                'text': quote.get('text', quote.get('quote', '')),
-                'author': quote.get('author', 'Unknown')
-            }
-        return None
+        """Pick a random quote from a CSV file through its record index."""
+        return self._get_corpus().random_quote()
+    
+    def _get_corpus(self) -> QuoteCorpus:
+        """Open the indexed corpus lazily."""
+        with self._lock:
+            if self._corpus is None:
+                self._corpus = QuoteCorpus(self.file_path)
+            return self._corpus
+    
+    def close(self):
+        """Release the corpus memory maps."""
+        with self._lock:
+            if self._corpus is not None:
+                self._corpus.close()
+                self._corpus = None
     
     def _get_from_text(self) -> Optional[Dict[str, str]]:
         """Load quote from plain text file."""
@@ -118,35 +126,97 @@ class FileQuoteSource(QuoteSource):
         return None
 
 
+class StreamingQuoteSource(QuoteSource):
+    """Quote source that streams every quote of a file in order."""
+    
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.logger = logging.getLogger(__name__)
+        self._quotes: Optional[Iterator[Dict[str, str]]] = None
+    
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        """Iterate over all quotes of the file from the start."""
+        return iter_quotes(self.file_path)
+    
+    def get_quote(self) -> Optional[Dict[str, str]]:
+        """Get the next quote of the file, or None once it is exhausted."""
+        try:
+            if self._quotes is None:
+                self._quotes = iter_quotes(self.file_path)
+            return next(self._quotes, None)
+        except Exception as e:
+            self.logger.error(f"Error reading file {self.file_path}: {e}")
+            return None
+
+
 class DatabaseQuoteSource(QuoteSource):
     """Quote source from SQLite database."""
     
-    def __init__(self, db_path: str, table_name: str = 'quotes'):
+    # Seconds before the cached rowid range is refreshed to see new rows
+    ROWID_RANGE_TTL = 60.0
+    
+    def __init__(self, db_path: str, table_name: str = 'quotes', pool_size: int = 4):
         self.db_path = db_path
         self.table_name = table_name
+        self.pool_size = pool_size
         self.logger = logging.getLogger(__name__)
+        self._rowid_range: Optional[Tuple[int, int]] = None
+        self._rowid_range_at = 0.0
     
     def get_quote(self) -> Optional[Dict[str, str]]:
         """Get random quote from database."""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute(f"SELECT text, author FROM {self.table_name} ORDER BY RANDOM() LIMIT 1")
-            result = cursor.fetchone()
-            
-            conn.close()
+        quotes = self.get_quotes(1)
+        return quotes[0] if quotes else None
+    
+    def get_quotes(self, count: int) -> List[Dict[str, str]]:
+        """
+        Get several random quotes using one pooled connection.
+        
+        Each pick seeks to a random rowid through the primary key instead of
+        sorting the whole table, so its cost does not grow with the table.
+        
+        Args:
+            count: Number of quotes to pick
             
-            if result:
-                return {
-                    'text': result[0],
-                    'author': result[1] or 'Unknown'
-                }
-            return None
+        Returns:
+            List of quote dictionaries (empty if the table is empty or on error).
+        """
+        import sqlite3
+        from src.quote_maker.sqlite_pool import get_pool
+        
+        try:
+            with get_pool(self.db_path, size=self.pool_size).connection() as conn:
+                rowid_range = self._get_rowid_range(conn)
+                if rowid_range is None:
+                    return []
+                
+                query = f"SELECT text, author FROM {self.table_name} WHERE rowid >= ? ORDER BY rowid LIMIT 1"
+                quotes = []
+                for _ in range(count):
+                    result = conn.execute(query, (random.randint(*rowid_range),)).fetchone()
+                    if result is None:
+                        # Rows at the end were deleted; wrap around to the first row
+                        result = conn.execute(query, (rowid_range[0],)).fetchone()
+                        self._rowid_range = None
+                    if result:
+                        quotes.append({
+                            'text': result[0],
+                            'author': result[1] or 'Unknown'
+                        })
+                return quotes
             
         except sqlite3.Error as e:
             self.logger.error(f"Database error: {e}")
-            return None
+            return []
+    
+    def _get_rowid_range(self, conn: 'sqlite3.Connection') -> Optional[Tuple[int, int]]:
+        """Get the (min, max) rowid of the table, cached for ROWID_RANGE_TTL seconds."""
+        now = time.monotonic()
+        if self._rowid_range is None or now - self._rowid_range_at > self.ROWID_RANGE_TTL:
+            low, high = conn.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {self.table_name}").fetchone()
+            self._rowid_range = None if low is None else (low, high)
+            self._rowid_range_at = now
+        return self._rowid_range
 
 
 class ManualQuoteSource(QuoteSource):
@@ -166,30 +236,98 @@ class ManualQuoteSource(QuoteSource):
         return None
 
 
+class SourceStats:
+    """Moving average latency and failure rate of a quote source."""
+    
+    # Weight of the newest sample in the moving averages
+    ALPHA = 0.3
+    
+    # Seconds added to the expected cost for a source that always fails
+    FAILURE_PENALTY = 10.0
+    
+    def __init__(self):
+        self.latency = 0.0
+        self.failure_rate = 0.0
+        self.calls = 0
+    
+    def record(self, elapsed: float, success: bool):
+        """Add one fetch to the averages."""
+        if self.calls == 0:
+            self.latency = elapsed
+            self.failure_rate = 0.0 if success else 1.0
+        else:
+            self.latency += self.ALPHA * (elapsed - self.latency)
+            self.failure_rate += self.ALPHA * ((0.0 if success else 1.0) - self.failure_rate)
+        self.calls += 1
+    
+    def expected_cost(self) -> float:
+        """Expected seconds until this source yields a quote."""
+        return self.latency + self.failure_rate * self.FAILURE_PENALTY
+
+
 class QuoteFetcher:
     """Main quote fetcher class that coordinates different sources."""
     
-    def __init__(self):
+    # Hedge delay used before any latency has been recorded
+    DEFAULT_HEDGE_DELAY = 0.5
+    
+    def __init__(self, mode: str = 'sequential', hedge_delay: Optional[float] = None):
+        """
+        Initialize the QuoteFetcher.
+        
+        Args:
+            mode: Default mode of get_quote_from_sources ('sequential', 'race' or 'hedged')
+            hedge_delay: Default hedge delay in seconds (optional)
+        """
         self.sources: List[QuoteSource] = []
+        self.mode = mode
+        self.hedge_delay = hedge_delay
+        self.source_stats: Dict[QuoteSource, SourceStats] = {}
         self.logger = logging.getLogger(__name__)
+        self._stats_lock = threading.Lock()
+        self._file_sources: Dict[str, FileQuoteSource] = {}
+        self._stores: Dict[str, 'QuoteStore'] = {}
     
     def add_source(self, source: QuoteSource):
         """Add a quote source."""
         self.sources.append(source)
     
+    def create_source(self, source_type: str, **kwargs) -> Optional[QuoteSource]:
+        """Create a quote source of the given type, or None if the type is unknown."""
+        if source_type == 'api':
+            return APIQuoteSource(kwargs.get('api_url'), kwargs.get('headers'))
+        elif source_type == 'file':
+            # One source per path, so its memory-mapped index is opened once
+            file_path = kwargs.get('file_path')
+            with self._stats_lock:
+                source = self._file_sources.get(file_path)
+                if source is None:
+                    source = self._file_sources[file_path] = FileQuoteSource(file_path)
+            return source
+        elif source_type == 'stream':
+            return StreamingQuoteSource(kwargs.get('file_path'))
+        elif source_type == 'database':
+            return DatabaseQuoteSource(kwargs.get('db_path'), kwargs.get('table_name', 'quotes'))
+        elif source_type == 'manual':
+            return ManualQuoteSource(kwargs.get('text'), kwargs.get('author', 'Unknown'))
+        elif source_type == 'store':
+            from src.quote_maker.quote_store import QuoteStore, StoreQuoteSource
+            # One store per path, so its schema is set up once
+            db_path = kwargs.get('db_path')
+            with self._stats_lock:
+                store = self._stores.get(db_path)
+                if store is None:
+                    store = self._stores[db_path] = QuoteStore(db_path)
+            return StoreQuoteSource(store, kwargs.get('exclude_posted_days'))
+        
+        self.logger.error(f"Unknown source type: {source_type}")
+        return None
+    
     def get_quote(self, source_type: str = 'manual', **kwargs) -> Optional[Dict[str, str]]:
         """Get quote from specified source type."""
         try:
-            if source_type == 'api':
-                source = APIQuoteSource(kwargs.get('api_url'), kwargs.get('headers'))
-            elif source_type == 'file':
-                source = FileQuoteSource(kwargs.get('file_path'))
-            elif source_type == 'database':
-                source = DatabaseQuoteSource(kwargs.get('db_path'), kwargs.get('table_name', 'quotes'))
-            elif source_type == 'manual':
-                source = ManualQuoteSource(kwargs.get('text'), kwargs.get('author', 'Unknown'))
-            else:
-                self.logger.error(f"Unknown source type: {source_type}")
+            source = self.create_source(source_type, **kwargs)
+            if source is None:
                 return None
             
             return source.get_quote()
@@ -198,10 +336,138 @@ class QuoteFetcher:
             self.logger.error(f"Error fetching quote: {e}")
             return None
     
-    def get_quote_from_sources(self) -> Optional[Dict[str, str]]:
-        """Get quote from any available source."""
-        for source in self.sources:
+    def prefetch(self, source_type: str, high_water: int = 32, workers: int = 1, **kwargs):
+        """
+        Create a prefetching buffer around a source of the given type.
+        
+        Args:
+            source_type: Type of the wrapped source
+            high_water: Number of quotes buffered ahead of the callers
+            workers: Number of background fetch threads
+            **kwargs: Arguments of the wrapped source
+            
+        Returns:
+            A started PrefetchingQuoteSource, or None if the type is unknown.
+        """
+        from src.quote_maker.prefetch import PrefetchingQuoteSource
+        
+        source = self.create_source(source_type, **kwargs)
+        if source is None:
+            return None
+        return PrefetchingQuoteSource(source, high_water=high_water, workers=workers).start()
+    
+    def get_quote_from_sources(self, mode: Optional[str] = None, hedge_delay: Optional[float] = None,
+                               timeout: Optional[float] = None) -> Optional[Dict[str, str]]:
+        """
+        Get quote from any available source.
+        
+        Sources are tried fastest first according to their recorded latency
+        and failure rate.
+        
+        Args:
+            mode: 'sequential' tries one source after another, 'race' queries all
+                sources at once and 'hedged' starts the next source whenever the
+                current ones take longer than hedge_delay (defaults to self.mode)
+            hedge_delay: Seconds before a backup source is started in hedged mode
+                (defaults to twice the fastest source's average latency)
+            timeout: Overall seconds to wait in race and hedged modes (optional)
+            
+        Returns:
+            The first valid quote, or None if no source returned one.
+        """
+        mode = mode or self.mode
+        sources = self._ordered_sources()
+        if mode == 'sequential':
+            for source in sources:
+                quote = self._timed_fetch(source)
+                if quote:
+                    return quote
+            return None
+        elif mode == 'race':
+            return self._fetch_concurrently(sources, 0.0, timeout)
+        elif mode == 'hedged':
+            if hedge_delay is None:
+                hedge_delay = self.hedge_delay
+            if hedge_delay is None:
+                stats = self.source_stats.get(sources[0]) if sources else None
+                hedge_delay = 2 * stats.latency if stats and stats.latency else self.DEFAULT_HEDGE_DELAY
+            return self._fetch_concurrently(sources, hedge_delay, timeout)
+        
+        self.logger.error(f"Unknown fetch mode: {mode}")
+        return None
+    
+    def _fetch_concurrently(self, sources: List[QuoteSource], hedge_delay: float,
+                            timeout: Optional[float]) -> Optional[Dict[str, str]]:
+        """Start sources one hedge_delay apart (or on failure) and return the first valid quote."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        remaining = list(sources)
+        pending = set()
+        
+        while remaining or pending:
+            if remaining:
+                pending.add(self._start_fetch(remaining.pop(0)))
+                if hedge_delay <= 0:
+                    continue
+            
+            wait_for = hedge_delay if remaining else None
+            if deadline is not None:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                wait_for = left if wait_for is None else min(wait_for, left)
+            
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                quote = future.result()
+                if quote:
+                    return quote
+            # Hedge timer expired or a source failed: the loop starts the next one
+        
+        if pending:
+            self.logger.warning("Timed out waiting for quote sources")
+        return None
+    
+    def _timed_fetch(self, source: QuoteSource) -> Optional[Dict[str, str]]:
+        """Fetch from a source and record its latency and outcome."""
+        start = time.perf_counter()
+        try:
             quote = source.get_quote()
-            if quote:
-                return quote
-        return None
\ No newline at end of file
+        except Exception as e:
+            self.logger.error(f"Error fetching quote: {e}")
+            quote = None
+        
+        with self._stats_lock:
+            stats = self.source_stats.setdefault(source, SourceStats())
+            stats.record(time.perf_counter() - start, bool(quote))
+        return quote
+    
+    def _ordered_sources(self) -> List[QuoteSource]:
+        """Sort sources by expected cost; sources without stats keep their order at the front."""
+        with self._stats_lock:
+            costs = {source: self.source_stats[source].expected_cost() if source in self.source_stats else 0.0
+                     for source in self.sources}
+        return sorted(self.sources, key=lambda source: costs[source])
+    
+    def _start_fetch(self, source: QuoteSource) -> Future:
+        """
+        Fetch from a source on a daemon thread.
+        
+        Sources that lose a race are abandoned rather than waited for; their
+        outcome still updates the stats, and as daemon threads they never hold
+        up interpreter exit.
+        """
+        future = Future()
+        
+        def run():
+            if future.set_running_or_notify_cancel():
+                future.set_result(self._timed_fetch(source))
+        
+        threading.Thread(target=run, name='quote-fetch', daemon=True).start()
+        return future
+    
+    def close(self):
+        """Release the memory maps of the cached file sources."""
+        with self._stats_lock:
+            file_sources, self._file_sources = list(self._file_sources.values()), {}
+        for source in file_sources:
+            source.close()
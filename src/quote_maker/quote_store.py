@@ -0,0 +1,239 @@
+"""
+Deduplicated local quote store for the Quote Maker application.
+"""
+
+import re
+import time
+import random
+import sqlite3
+import hashlib
+import logging
+import unicodedata
+from itertools import islice
+from typing import Callable, Dict, Iterable, Optional
+
+from src.quote_maker.quote_fetcher import QuoteSource
+from src.quote_maker.sqlite_pool import get_pool
+
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+_WHITESPACE = re.compile(r'\s+')
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS quote_store (
+        id INTEGER PRIMARY KEY,
+        text TEXT NOT NULL,
+        author TEXT,
+        text_hash TEXT NOT NULL UNIQUE,
+        added_at REAL NOT NULL,
+        last_posted_at REAL
+    )""",
+    "CREATE INDEX IF NOT EXISTS quote_store_last_posted ON quote_store (last_posted_at)",
+]
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize quote text so near-identical quotes compare equal.
+
+    Case, punctuation, Unicode compatibility forms and whitespace are ignored.
+
+    Args:
+        text: Quote text
+
+    Returns:
+        The normalized text.
+    """
+    text = unicodedata.normalize('NFKC', text).casefold()
+    return _WHITESPACE.sub(' ', _PUNCTUATION.sub('', text)).strip()
+
+
+def text_hash(text: str) -> str:
+    """
+    Hash of the normalized quote text.
+
+    Args:
+        text: Quote text
+
+    Returns:
+        Hex digest used as the duplicate key.
+    """
+    return hashlib.sha1(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+class QuoteStore:
+    """SQLite quote store with a normalized-text hash index and posting history."""
+
+    # Random ids tried by random_quote before it counts the eligible quotes
+    RANDOM_PROBES = 8
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the QuoteStore, creating its table if needed.
+
+        Args:
+            db_path: Path to the SQLite database
+        """
+        self.db_path = db_path
+        self.pool = get_pool(db_path, read_only=False)
+        self.logger = logging.getLogger(__name__)
+        with self.pool.connection() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+
+    def add(self, text: str, author: str = 'Unknown') -> bool:
+        """
+        Add a quote unless an equivalent one is already stored.
+
+        Args:
+            text: Quote text
+            author: Quote author
+
+        Returns:
+            True if the quote was added, False if it is a duplicate.
+        """
+        return self.add_many([{'text': text, 'author': author}]) == 1
+
+    def add_many(self, quotes: Iterable[Dict[str, str]], batch_size: Optional[int] = None,
+                 progress: Optional[Callable[[int, float], None]] = None) -> int:
+        """
+        Add quotes, skipping duplicates and records without text.
+
+        Args:
+            quotes: Quote dictionaries with 'text' and 'author' keys
+            batch_size: Number of rows per transaction (None adds everything in one transaction)
+            progress: Callback receiving (rows so far, elapsed seconds) after every batch (optional)
+
+        Returns:
+            Number of quotes added.
+        """
+        start = time.perf_counter()
+        now = time.time()
+        rows = ((quote['text'], quote.get('author') or 'Unknown', text_hash(quote['text']), now)
+                for quote in quotes if (quote.get('text') or '').strip())
+        insert = "INSERT OR IGNORE INTO quote_store (text, author, text_hash, added_at) VALUES (?, ?, ?, ?)"
+        seen = 0
+        with self.pool.connection() as conn:
+            before = conn.total_changes
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                conn.executemany(insert, batch)
+                conn.commit()
+                seen += len(batch)
+                if progress:
+                    progress(seen, time.perf_counter() - start)
+            return conn.total_changes - before
+
+    def contains(self, text: str) -> bool:
+        """Check whether an equivalent quote is stored."""
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT 1 FROM quote_store WHERE text_hash = ?", (text_hash(text),)).fetchone()
+        return row is not None
+
+    def posted_within(self, text: str, days: float) -> bool:
+        """Check whether an equivalent quote was posted in the last number of days."""
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM quote_store WHERE text_hash = ? AND last_posted_at >= ?",
+                (text_hash(text), time.time() - days * 86400)
+            ).fetchone()
+        return row is not None
+
+    def mark_posted(self, text: str, author: str = 'Unknown', posted_at: Optional[float] = None):
+        """
+        Record that a quote was posted, adding it to the store if needed.
+
+        Args:
+            text: Quote text
+            author: Quote author
+            posted_at: Unix time of the post (defaults to now)
+        """
+        posted_at = posted_at or time.time()
+        with self.pool.connection() as conn:
+            conn.execute(
+                "INSERT INTO quote_store (text, author, text_hash, added_at, last_posted_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (text_hash) DO UPDATE SET last_posted_at = excluded.last_posted_at",
+                (text, author or 'Unknown', text_hash(text), posted_at, posted_at)
+            )
+            conn.commit()
+
+    def count(self) -> int:
+        """Number of stored quotes."""
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM quote_store").fetchone()[0]
+
+    def random_quote(self, exclude_posted_days: Optional[float] = None) -> Optional[Dict[str, str]]:
+        """
+        Draw a quote uniformly at random, optionally skipping quotes posted recently.
+
+        Random ids are probed first, one rowid lookup each, which rarely misses
+        while most quotes are eligible. When every probe misses, a random offset
+        into the eligible quotes is taken on the last_posted_at index.
+
+        Args:
+            exclude_posted_days: Skip quotes posted within this many days (optional)
+
+        Returns:
+            Quote dictionary or None if no quote is eligible.
+        """
+        cutoff = time.time() - exclude_posted_days * 86400 if exclude_posted_days else None
+
+        try:
+            with self.pool.connection() as conn:
+                low, high = conn.execute("SELECT MIN(id), MAX(id) FROM quote_store").fetchone()
+                if low is None:
+                    return None
+                for _ in range(self.RANDOM_PROBES):
+                    row = conn.execute(
+                        "SELECT text, author, last_posted_at FROM quote_store WHERE id = ?",
+                        (random.randint(low, high),)
+                    ).fetchone()
+                    if row is not None and (cutoff is None or row[2] is None or row[2] < cutoff):
+                        break
+                else:
+                    row = self._random_eligible(conn, cutoff)
+        except sqlite3.Error as e:
+            self.logger.error(f"Quote store error: {e}")
+            return None
+
+        if row is None:
+            return None
+        return {'text': row[0], 'author': row[1] or 'Unknown'}
+
+    def _random_eligible(self, conn: sqlite3.Connection, cutoff: Optional[float]) -> Optional[tuple]:
+        """Pick a random offset into the eligible quotes and return its (text, author) row."""
+        # The last_posted_at index also holds the ids, so counting and skipping
+        # the never-posted and the posted-before-cutoff ranges reads only the index
+        if cutoff is None:
+            ranges = [("1", ())]
+        else:
+            ranges = [("last_posted_at IS NULL", ()), ("last_posted_at < ?", (cutoff,))]
+        counts = [conn.execute(f"SELECT COUNT(*) FROM quote_store WHERE {condition}", params).fetchone()[0]
+                  for condition, params in ranges]
+        if not sum(counts):
+            return None
+
+        offset = random.randrange(sum(counts))
+        for (condition, params), count in zip(ranges, counts):
+            if offset < count:
+                row = conn.execute(
+                    f"SELECT id FROM quote_store WHERE {condition} LIMIT 1 OFFSET ?", (*params, offset)
+                ).fetchone()
+                return conn.execute("SELECT text, author FROM quote_store WHERE id = ?", row).fetchone()
+            offset -= count
+        return None
+
+
+class StoreQuoteSource(QuoteSource):
+    """Quote source drawing from a QuoteStore."""
+
+    def __init__(self, store: QuoteStore, exclude_posted_days: Optional[float] = None):
+        self.store = store
+        self.exclude_posted_days = exclude_posted_days
+
+    def get_quote(self) -> Optional[Dict[str, str]]:
+        """Draw a random quote not posted within exclude_posted_days."""
+        return self.store.random_quote(self.exclude_posted_days)
@@ -0,0 +1,134 @@
+"""
+Content-addressed render cache for the Quote Maker application.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+
+class RenderCache:
+    """Stores encoded images on disk by content hash with a size cap and LRU eviction."""
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the RenderCache.
+
+        Args:
+            directory: Directory holding the cached images
+            max_bytes: Maximum total size of the cached images
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._total_bytes = sum(entry.stat().st_size for entry in self._entries())
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """
+        Build a cache key from everything that determines the rendered output.
+
+        Args:
+            **parts: JSON-serializable render inputs (text, logo, font, size, color, encoder settings...)
+
+        Returns:
+            Hex digest identifying the output.
+        """
+        payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a cached image.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            The encoded image, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        """
+        Store an encoded image, evicting the least recently used entries if needed.
+
+        Args:
+            key: Cache key from make_key()
+            data: The encoded image
+        """
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            # Overwriting an entry replaces its bytes rather than adding to them
+            replaced_bytes = os.path.getsize(path)
+        except OSError:
+            replaced_bytes = 0
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            self.logger.error(f"Error writing render cache entry: {e}")
+            return
+
+        with self._lock:
+            self._total_bytes += len(data) - replaced_bytes
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache hit/miss counters and the cached size."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'bytes': self._total_bytes, 'max_bytes': self.max_bytes}
+
+    def _path(self, key: str) -> str:
+        """Get the file path of a cache entry."""
+        return os.path.join(self.directory, key)
+
+    def _entries(self):
+        """List the cache entries, ignoring in-flight temporary files."""
+        return [entry for entry in os.scandir(self.directory) if entry.is_file() and not entry.name.endswith('.tmp')]
+
+    def _evict(self):
+        """Remove the least recently used entries until the cache fits its cap."""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        # Rescan so entries written by other processes are accounted for
+        self._total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self._total_bytes -= size
+            except OSError:
+                pass
@@ -0,0 +1,125 @@
+"""
+Pooled SQLite connections for the Quote Maker application.
+"""
+
+import os
+import queue
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+from urllib.parse import quote
+
+
+class SQLitePool:
+    """Thread-safe pool of persistent SQLite connections to one database."""
+
+    def __init__(self, db_path: str, size: int = 4, read_only: bool = True, timeout: float = 30.0):
+        """
+        Initialize the SQLitePool.
+
+        Args:
+            db_path: Path to the SQLite database
+            size: Maximum number of open connections
+            read_only: Open connections through a read-only URI
+            timeout: Seconds to wait for a free connection or a database lock
+        """
+        self.db_path = db_path
+        self.size = size
+        self.read_only = read_only
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection for the duration of a with-block.
+
+        Yields:
+            An open sqlite3 connection used by this thread only.
+        """
+        conn = self._acquire()
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        """Close all idle connections."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, opening a new one while under the pool size."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+        if can_open:
+            try:
+                return self._connect()
+            except sqlite3.Error:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(f"No free connection to {self.db_path} after {self.timeout}s")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection."""
+        if self.read_only:
+            uri = f"file:{quote(os.path.abspath(self.db_path))}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=self.timeout, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        self.logger.debug(f"Opened SQLite connection to {self.db_path}")
+        return conn
+
+
+# Pools shared by every source in this process, keyed by (absolute path, read_only)
+_pools: Dict[Tuple[str, bool], SQLitePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str, read_only: bool = True, size: int = 4) -> SQLitePool:
+    """
+    Get the process-wide pool for a database.
+
+    Args:
+        db_path: Path to the SQLite database
+        read_only: Whether the pool opens read-only connections
+        size: Maximum number of connections if the pool is created
+
+    Returns:
+        The shared SQLitePool.
+    """
+    key = (os.path.abspath(db_path), read_only)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = SQLitePool(db_path, size=size, read_only=read_only)
+        return pool
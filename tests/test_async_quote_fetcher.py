@@ -0,0 +1,117 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from src.quote_maker.async_quote_fetcher import (
+    AsyncDatabaseQuoteSource, AsyncQuoteFetcher, AsyncQuoteSource, ThreadedAsyncQuoteSource
+)
+from src.quote_maker.importer import import_quotes
+from src.quote_maker.quote_fetcher import QuoteSource
+
+class SlowSource(QuoteSource):
+
+    def __init__(self, text, delay):
+        self.text = text
+        self.delay = delay
+
+    def get_quote(self):
+        time.sleep(self.delay)
+        return {'text': self.text, 'author': 'Unknown'} if self.text else None
+
+class FailingSource(AsyncQuoteSource):
+
+    async def get_quote(self):
+        raise RuntimeError("source is down")
+
+class TestAsyncQuoteFetcher(unittest.TestCase):
+
+    def test_fetch_many_runs_concurrently(self):
+        """Test that many blocking fetches overlap instead of running in turn."""
+        fetcher = AsyncQuoteFetcher()
+        start = time.perf_counter()
+        quotes = asyncio.run(fetcher.fetch_many(ThreadedAsyncQuoteSource(SlowSource("Quote", 0.1)), 20))
+        self.assertEqual(len(quotes), 20)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_in_flight_beyond_shared_pool(self):
+        """Test that max_in_flight fetches all run at once, on any number of event loops."""
+        fetcher = AsyncQuoteFetcher(max_in_flight=150)
+        source = ThreadedAsyncQuoteSource(SlowSource("Quote", 0.3))
+        try:
+            for _ in range(2):
+                start = time.perf_counter()
+                quotes = asyncio.run(fetcher.fetch_many(source, 150))
+                self.assertEqual(len(quotes), 150)
+                self.assertLess(time.perf_counter() - start, 0.55)
+        finally:
+            fetcher.close()
+
+    def test_timeout_and_errors(self):
+        """Test that slow and failing sources yield None without stopping the others."""
+        fetcher = AsyncQuoteFetcher(timeout=0.2)
+        fetcher.add_source(ThreadedAsyncQuoteSource(SlowSource("Slow", 1.0)))
+        fetcher.add_source(FailingSource())
+        fetcher.add_source(ThreadedAsyncQuoteSource(SlowSource("Fast", 0.0)))
+        results = asyncio.run(fetcher.get_quotes_from_sources())
+        self.assertEqual(results[:2], [None, None])
+        self.assertEqual(results[2]['text'], "Fast")
+
+    def test_timed_out_fetches_keep_their_slots(self):
+        """Test that fetches abandoned on timeout count against max_in_flight until their threads finish."""
+        fetcher = AsyncQuoteFetcher(max_in_flight=2, timeout=0.05)
+        slow = ThreadedAsyncQuoteSource(SlowSource("Slow", 0.4))
+
+        async def scenario():
+            self.assertEqual(await asyncio.gather(fetcher.fetch(slow), fetcher.fetch(slow)), [None, None])
+            start = time.perf_counter()
+            quote = await fetcher.fetch(ThreadedAsyncQuoteSource(SlowSource("Fast", 0.0)))
+            return quote, time.perf_counter() - start
+
+        try:
+            quote, waited = asyncio.run(scenario())
+        finally:
+            fetcher.close()
+        self.assertEqual(quote['text'], "Fast")
+        self.assertGreater(waited, 0.25)
+
+    def test_database_batches_use_fetcher_pool(self):
+        """Test that batched database fetches run on the fetcher's thread pool."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, 'quotes.db')
+            import_quotes(db_path, ({'text': f"Quote {number}", 'author': "A"} for number in range(20)))
+            source = AsyncDatabaseQuoteSource(db_path)
+            threads = []
+            get_quotes = source.source.get_quotes
+
+            def recording_get_quotes(count):
+                threads.append(threading.current_thread().name)
+                return get_quotes(count)
+
+            source.source.get_quotes = recording_get_quotes
+            fetcher = AsyncQuoteFetcher()
+            try:
+                quotes = asyncio.run(fetcher.fetch_quotes(source, 5))
+            finally:
+                fetcher.close()
+        self.assertEqual(len(quotes), 5)
+        self.assertTrue(threads[0].startswith('async-quote-io'))
+
+    def test_first_valid_quote_wins(self):
+        """Test that the first valid quote is returned without waiting for slow sources."""
+        fetcher = AsyncQuoteFetcher()
+        fetcher.add_source(ThreadedAsyncQuoteSource(SlowSource("Slow", 0.5)))
+        fetcher.add_source(ThreadedAsyncQuoteSource(SlowSource("", 0.0)))
+        fetcher.add_source(ThreadedAsyncQuoteSource(SlowSource("Fast", 0.05)))
+        start = time.perf_counter()
+        self.assertEqual(asyncio.run(fetcher.get_quote_from_sources())['text'], "Fast")
+        self.assertLess(time.perf_counter() - start, 0.4)
+
+    def test_manual_source(self):
+        """Test that a quote is fetched by source type."""
+        quote = asyncio.run(AsyncQuoteFetcher().get_quote('manual', text="Hello", author="Me"))
+        self.assertEqual(quote, {'text': "Hello", 'author': "Me"})
+
+if __name__ == "__main__":
+    unittest.main()
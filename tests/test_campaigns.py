@@ -0,0 +1,146 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from config.config import ConfigManager
+from src.quote_maker.campaigns import Campaign, CampaignScheduler, CronSchedule, load_campaigns
+from src.quote_maker.facebook import SocialPlatform, SocialPoster
+from src.quote_maker.generator import ImageGenerator
+
+class RecordingPlatform(SocialPlatform):
+
+    def __init__(self):
+        self.posts = []
+
+    def post_image(self, image_path, message):
+        self.posts.append((image_path, message))
+        return True
+
+class TestCronSchedule(unittest.TestCase):
+
+    def test_weekdays(self):
+        """Test that a weekday schedule skips the weekend."""
+        schedule = CronSchedule("30 9 * * 1-5")
+        self.assertEqual(schedule.next_after(datetime(2024, 5, 3, 10, 0)), datetime(2024, 5, 6, 9, 30))
+        self.assertEqual(schedule.next_after(datetime(2024, 5, 6, 9, 0)), datetime(2024, 5, 6, 9, 30))
+
+    def test_steps_lists_and_aliases(self):
+        """Test steps, lists and the @ aliases."""
+        self.assertEqual(CronSchedule("*/15 * * * *").next_after(datetime(2024, 1, 1, 8, 16)),
+                         datetime(2024, 1, 1, 8, 30))
+        self.assertEqual(CronSchedule("0 8,20 * * *").next_after(datetime(2024, 1, 1, 8, 0)),
+                         datetime(2024, 1, 1, 20, 0))
+        self.assertEqual(CronSchedule("@daily").next_after(datetime(2024, 12, 31, 23, 59)), datetime(2025, 1, 1))
+
+    def test_last_until(self):
+        """Test that searching back finds the previous match, including the moment itself."""
+        schedule = CronSchedule("30 9 * * 1-5")
+        self.assertEqual(schedule.last_until(datetime(2024, 5, 6, 9, 0)), datetime(2024, 5, 3, 9, 30))
+        self.assertEqual(schedule.last_until(datetime(2024, 5, 6, 9, 30, 20)), datetime(2024, 5, 6, 9, 30))
+        self.assertEqual(CronSchedule("0 0 1 3 *").last_until(datetime(2024, 2, 1)), datetime(2023, 3, 1))
+
+    def test_day_of_month_or_weekday(self):
+        """Test that a restricted day of month and weekday match either, like cron."""
+        schedule = CronSchedule("0 0 13 * 5")
+        self.assertEqual(schedule.next_after(datetime(2024, 9, 1)), datetime(2024, 9, 6))
+        self.assertEqual(schedule.next_after(datetime(2024, 9, 10)), datetime(2024, 9, 13))
+
+    def test_invalid_expressions(self):
+        """Test that invalid expressions are rejected."""
+        for expression in ("* * * *", "60 * * * *", "a * * * *", "5-1 * * * *"):
+            with self.assertRaises(ValueError):
+                CronSchedule(expression)
+
+class TestCampaignScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.temp_dir.name, 'state.json')
+        config_manager = ConfigManager()
+        config_manager.set('FACEBOOK_ACCESS_TOKEN', None)
+        self.poster = SocialPoster(config_manager)
+        self.platform = RecordingPlatform()
+        self.poster.add_platform('test', self.platform)
+        self.generator = ImageGenerator()
+        self.now = datetime(2024, 5, 6, 9, 0, 5).timestamp()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def scheduler(self, **settings):
+        definition = {'name': 'every-minute', 'schedule': '* * * * *', 'source': 'manual',
+                      'source_options': {'text': "Scheduled quote", 'author': "Author"},
+                      'page_name': "My Page", 'platforms': ['test']}
+        definition.update(settings)
+        return CampaignScheduler(load_campaigns([definition]), self.generator, self.poster, self.state_path,
+                                 grace_seconds=30, clock=lambda: self.now)
+
+    def save_last_slot(self, minutes_ago):
+        with open(self.state_path, 'w') as f:
+            json.dump({'every-minute': {'last_slot': self.now - 5 - minutes_ago * 60}}, f)
+
+    def test_posts_on_schedule(self):
+        """Test that a new campaign starts with the next slot and posts it on time."""
+        scheduler = self.scheduler()
+        self.assertEqual(scheduler.run_once(), [])
+        self.now += 60
+        outcomes = scheduler.run_once()
+        scheduler.close()
+        self.assertEqual([outcome['status'] for outcome in outcomes], ['posted'])
+        self.assertEqual(self.platform.posts[0][1], "Published by, -My Page-")
+        self.assertTrue(self.platform.posts[0][0].startswith(b'\x89PNG'))
+
+    def test_state_survives_restart(self):
+        """Test that a handled slot is not posted again by a new process."""
+        self.save_last_slot(1)
+        scheduler = self.scheduler()
+        self.assertEqual(len(scheduler.run_once()), 1)
+        scheduler.close()
+        scheduler = self.scheduler()
+        self.assertEqual(scheduler.run_once(), [])
+        scheduler.close()
+
+    def test_catch_up_policies(self):
+        """Test that missed slots are posted according to catch_up and skipped ones reported once."""
+        for catch_up, statuses in (('latest', ['skipped', 'posted']), ('all', ['posted'] * 10),
+                                   ('none', ['skipped', 'posted'])):
+            self.platform.posts = []
+            self.save_last_slot(10)
+            scheduler = self.scheduler(catch_up=catch_up)
+            outcomes = scheduler.run_once()
+            scheduler.close()
+            self.assertEqual([outcome['status'] for outcome in outcomes], statuses, catch_up)
+            self.assertEqual(len(self.platform.posts), statuses.count('posted'), catch_up)
+
+    def test_long_downtime_posts_latest_once(self):
+        """Test that a week of missed slots posts only the true latest slot, in one pass."""
+        self.save_last_slot(7 * 24 * 60)
+        self.now += 60
+        scheduler = self.scheduler(catch_up='latest')
+        outcomes = scheduler.run_once()
+        self.assertEqual([outcome['status'] for outcome in outcomes], ['skipped', 'posted'])
+        self.assertEqual(outcomes[1]['slot'], self.now - 5)
+        self.assertEqual(outcomes[0]['first_slot'], self.now - 5 - 7 * 24 * 60 * 60)
+        self.assertEqual(scheduler.run_once(), [])
+        scheduler.close()
+        self.assertEqual(len(self.platform.posts), 1)
+
+    def test_jitter_is_stable_and_bounded(self):
+        """Test that a slot's jitter is the same on every call and within range."""
+        campaign = Campaign('jittered', '@hourly', 'manual', jitter=120)
+        delays = {campaign.jitter_for(self.now) for _ in range(3)}
+        self.assertEqual(len(delays), 1)
+        self.assertTrue(0 <= delays.pop() <= 120)
+
+    def test_invalid_campaigns(self):
+        """Test that invalid definitions are rejected."""
+        with self.assertRaises(ValueError):
+            load_campaigns([{'name': 'a', 'schedule': '@daily'}])
+        with self.assertRaises(ValueError):
+            load_campaigns([{'name': 'a', 'schedule': '@daily', 'source': 'api', 'cadence': 'often'}])
+        with self.assertRaises(ValueError):
+            load_campaigns([{'name': 'a', 'schedule': '@daily', 'source': 'api', 'catch_up': 'some'}])
+
+if __name__ == "__main__":
+    unittest.main()
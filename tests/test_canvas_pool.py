@@ -0,0 +1,43 @@
+import threading
+import unittest
+from src.quote_maker.canvas_pool import CanvasPool
+
+class TestCanvasPool(unittest.TestCase):
+
+    def test_canvas_has_background(self):
+        """Test that an acquired canvas is filled with the requested color."""
+        pool = CanvasPool()
+        canvas = pool.acquire('RGB', (20, 10), (51, 0, 51))
+        self.assertEqual(canvas.size, (20, 10))
+        self.assertEqual(canvas.getpixel((5, 5)), (51, 0, 51))
+
+    def test_released_canvas_is_reused_and_reset(self):
+        """Test that a released buffer is reused and restored from the template."""
+        pool = CanvasPool()
+        canvas = pool.acquire('RGB', (20, 10), (255, 0, 0))
+        canvas.putpixel((5, 5), (1, 2, 3))
+        pool.release(canvas)
+        reused = pool.acquire('RGB', (20, 10), [0, 0, 255])
+        self.assertIs(reused, canvas)
+        self.assertEqual(reused.getpixel((5, 5)), (0, 0, 255))
+        self.assertEqual(pool.stats()['reused'], 1)
+        self.assertEqual(pool.stats()['templates'], 2)
+
+    def test_counters_under_threads(self):
+        """Test that every acquire is counted once when threads share the pool."""
+        pool = CanvasPool()
+
+        def work():
+            for _ in range(500):
+                pool.release(pool.acquire('RGB', (4, 4), (0, 0, 0)))
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = pool.stats()
+        self.assertEqual(stats['created'] + stats['reused'], 4000)
+
+if __name__ == "__main__":
+    unittest.main()
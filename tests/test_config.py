@@ -0,0 +1,73 @@
+import dataclasses
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from config.config import ConfigManager
+
+class TestRenderSettings(unittest.TestCase):
+
+    def test_snapshot_is_frozen_and_picklable(self):
+        """Test that a snapshot cannot change and survives pickling to a worker."""
+        config_manager = ConfigManager()
+        settings = config_manager.snapshot()
+        self.assertEqual((settings.image_width, settings.font_size), (1200, 50))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            settings.image_width = 10
+        self.assertFalse(hasattr(settings, '__dict__'))
+        self.assertEqual(pickle.loads(pickle.dumps(settings)), settings)
+
+    def test_snapshot_ignores_later_changes(self):
+        """Test that changing the configuration does not affect an existing snapshot."""
+        config_manager = ConfigManager()
+        settings = config_manager.snapshot()
+        config_manager.IMAGE_WIDTH = 800
+        self.assertEqual(settings.image_width, 1200)
+        self.assertEqual(config_manager.snapshot().image_width, 800)
+
+    def test_invalid_settings(self):
+        """Test that invalid render settings are rejected when the snapshot is taken."""
+        for key, value in (('IMAGE_WIDTH', 0), ('FONT_SIZE', '50'), ('IMAGE_TYPE', 'CMYK'), ('TEXT_MARGIN', 600),
+                           ('IMAGE_BG_COLORS', []), ('IMAGE_BG_COLORS', [(300, 0, 0)]), ('IMAGE_BG_COLORS', 5)):
+            config_manager = ConfigManager()
+            config_manager.set(key, value)
+            with self.assertRaises(ValueError, msg=key):
+                config_manager.snapshot()
+
+class TestConfigReload(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.temp_dir.name, 'config.json')
+        self.write({'IMAGE_WIDTH': 1000})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, values):
+        with open(self.config_file, 'w') as f:
+            json.dump(values, f)
+
+    def test_reload_swaps_configuration(self):
+        """Test that reload picks up the changed file and returns its snapshot."""
+        config_manager = ConfigManager(self.config_file)
+        self.write({'IMAGE_WIDTH': 900, 'IMAGE_BG_COLORS': [[1, 2, 3]]})
+        settings = config_manager.reload()
+        self.assertEqual((settings.image_width, settings.bg_colors), (900, ((1, 2, 3),)))
+        self.assertEqual(config_manager.IMAGE_WIDTH, 900)
+
+    def test_invalid_reload_keeps_configuration(self):
+        """Test that a broken or invalid file leaves the current configuration in place."""
+        config_manager = ConfigManager(self.config_file)
+        with open(self.config_file, 'w') as f:
+            f.write("{not json")
+        with self.assertRaises(ValueError):
+            config_manager.reload()
+        self.write({'IMAGE_WIDTH': -1})
+        with self.assertRaises(ValueError):
+            config_manager.reload()
+        self.assertEqual(config_manager.IMAGE_WIDTH, 1000)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from src.quote_maker.corpus import QuoteCorpus, iter_quotes
+from src.quote_maker.quote_fetcher import FileQuoteSource, QuoteFetcher, StreamingQuoteSource
+
+class TestQuoteCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_json_records(self):
+        """Test that every object of a JSON array is indexed, including braces inside strings."""
+        quotes = [
+            {'text': 'Curly {braces} and "quotes" ]', 'author': 'A'},
+            {'quote': 'Nested', 'author': 'B', 'tags': [{'x': 1}]},
+            {'text': 'Ünïcode — dash'},
+        ]
+        corpus = QuoteCorpus(self.write('quotes.json', json.dumps(quotes, ensure_ascii=False)))
+        self.assertEqual(len(corpus), 3)
+        self.assertEqual(corpus.get(0), {'text': 'Curly {braces} and "quotes" ]', 'author': 'A'})
+        self.assertEqual(corpus.get(1), {'text': 'Nested', 'author': 'B'})
+        self.assertEqual(corpus.get(2), {'text': 'Ünïcode — dash', 'author': 'Unknown'})
+        self.assertTrue(os.path.exists(corpus.index_path))
+        corpus.close()
+
+    def test_csv_records(self):
+        """Test that CSV records with quoted newlines are indexed."""
+        path = self.write('quotes.csv', 'text,author\n"Line one\nline two",A\nSimple,B\n\n')
+        corpus = QuoteCorpus(path)
+        self.assertEqual(len(corpus), 2)
+        self.assertEqual(corpus.get(0), {'text': 'Line one\nline two', 'author': 'A'})
+        self.assertEqual(corpus.random_quote(random.Random(1))['author'] in ('A', 'B'), True)
+        corpus.close()
+
+    def test_index_is_reused_and_invalidated(self):
+        """Test that the persistent index is reused and rebuilt when the file changes."""
+        path = self.write('quotes.json', json.dumps([{'text': 'one'}]))
+        QuoteCorpus(path).get(0)
+        self.assertEqual(len(QuoteCorpus(path)), 1)
+
+        time.sleep(0.01)
+        self.write('quotes.json', json.dumps([{'text': 'one'}, {'text': 'two'}]))
+        self.assertEqual(QuoteCorpus(path).get(1)['text'], 'two')
+
+    def test_signature_comes_from_the_opened_file(self):
+        """Test that a file replaced between the change check and the open is stamped with its own signature."""
+        path = self.write('quotes.json', json.dumps([{'text': 'one'}]))
+        corpus = QuoteCorpus(path)
+        self.assertEqual(len(corpus), 1)
+        self.write('quotes.json', json.dumps([{'text': 'one'}, {'text': 'two'}]))
+        replacement = self.write('next.json', json.dumps([{'text': 'a'}, {'text': 'b'}, {'text': 'c'}]))
+        real_stat = os.stat
+        pending = [replacement]
+
+        def stat_then_replace(stat_path, *args, **kwargs):
+            result = real_stat(stat_path, *args, **kwargs)
+            if pending:
+                os.replace(pending.pop(), path)
+            return result
+
+        with mock.patch('src.quote_maker.corpus.os.stat', side_effect=stat_then_replace):
+            self.assertEqual(len(corpus), 3)
+        stat = os.stat(path)
+        self.assertEqual(corpus._signature, (stat.st_mtime_ns, stat.st_size))
+        corpus.close()
+
+    def test_reads_during_file_swaps(self):
+        """Test that concurrent reads keep working while the file is replaced."""
+        path = self.write('quotes.json', json.dumps([{'text': 'one'}]))
+        corpus = QuoteCorpus(path)
+        errors = []
+        stop = threading.Event()
+
+        def read():
+            while not stop.is_set():
+                try:
+                    self.assertIsNotNone(corpus.random_quote())
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for size in range(1, 30):
+            temp_path = self.write('next.json', json.dumps([{'text': str(number)} for number in range(size % 5 + 1)]))
+            os.utime(temp_path, ns=(size * 10 ** 9, size * 10 ** 9))
+            os.replace(temp_path, path)
+            time.sleep(0.002)
+        stop.set()
+        for reader in readers:
+            reader.join()
+        corpus.close()
+        self.assertEqual(errors, [])
+
+    def test_fetcher_reuses_file_source(self):
+        """Test that QuoteFetcher opens one FileQuoteSource per path."""
+        path = self.write('quotes.json', json.dumps([{'text': 'only', 'author': 'A'}]))
+        fetcher = QuoteFetcher()
+        self.assertEqual(fetcher.get_quote('file', file_path=path)['text'], 'only')
+        self.assertIs(fetcher.create_source('file', file_path=path), fetcher.create_source('file', file_path=path))
+
+    def test_file_quote_source(self):
+        """Test that FileQuoteSource picks quotes through the index."""
+        path = self.write('quotes.json', json.dumps([{'text': 'only', 'author': 'A'}]))
+        self.assertEqual(FileQuoteSource(path).get_quote(), {'text': 'only', 'author': 'A'})
+        self.assertIsNone(FileQuoteSource(self.write('empty.json', '[]')).get_quote())
+
+    def test_iter_quotes_formats(self):
+        """Test that NDJSON, CSV, JSON and text files stream the same quotes."""
+        expected = [{'text': 'one', 'author': 'A'}, {'text': 'two', 'author': 'Unknown'}]
+        paths = [
+            self.write('q.ndjson', '{"text": "one", "author": "A"}\n\n{"quote": "two"}\n'),
+            self.write('q.csv', 'text,author\none,A\ntwo,\n'),
+            self.write('q.json', '[{"text": "one", "author": "A"}, {"quote": "two"}]'),
+        ]
+        for path in paths:
+            self.assertEqual(list(iter_quotes(path)), expected, path)
+        text_path = self.write('q.txt', 'one\n\ntwo\n')
+        self.assertEqual([quote['text'] for quote in iter_quotes(text_path)], ['one', 'two'])
+
+    def test_streaming_quote_source(self):
+        """Test that StreamingQuoteSource returns quotes in order until exhausted."""
+        source = StreamingQuoteSource(self.write('q.txt', 'one\ntwo\n'))
+        self.assertEqual(source.get_quote()['text'], 'one')
+        self.assertEqual(source.get_quote()['text'], 'two')
+        self.assertIsNone(source.get_quote())
+        self.assertEqual(len(list(source)), 2)
+
+if __name__ == "__main__":
+    unittest.main()
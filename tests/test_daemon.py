@@ -0,0 +1,139 @@
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import requests
+from PIL import Image
+from config.config import ConfigManager
+from src.quote_maker.daemon import QuoteDaemon
+from src.quote_maker.facebook import SocialPlatform, SocialPoster
+from src.quote_maker.generator import ImageGenerator
+
+class SlowPlatform(SocialPlatform):
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.posts = []
+
+    def post_image(self, image_path, message):
+        time.sleep(self.delay)
+        self.posts.append((image_path, message))
+        return True
+
+class FailingPlatform(SocialPlatform):
+
+    def post_image(self, image_path, message):
+        raise RuntimeError("platform exploded")
+
+class TestQuoteDaemon(unittest.TestCase):
+
+    def setUp(self):
+        config_manager = ConfigManager()
+        config_manager.set('FACEBOOK_ACCESS_TOKEN', None)
+        self.poster = SocialPoster(config_manager)
+        self.platform = SlowPlatform()
+        self.poster.add_platform('test', self.platform)
+        self.daemon = QuoteDaemon(ImageGenerator(), self.poster, port=0, workers=1, drain_timeout=5).start()
+        self.session = requests.Session()
+        self.session.trust_env = False
+
+    def tearDown(self):
+        self.session.close()
+        self.daemon.close()
+
+    def test_render(self):
+        """Test that /render returns the encoded image with job timing headers."""
+        response = self.session.post(f"{self.daemon.url}/render", json={'text': "Daemon quote", 'page_name': "Page"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Type'], 'image/png')
+        self.assertTrue(response.content.startswith(b'\x89PNG'))
+        self.assertEqual(response.headers['X-Job-Id'], '1')
+        self.assertGreater(float(response.headers['X-Job-Ms']), 0)
+
+    def test_post_and_stats(self):
+        """Test that /post publishes and /stats reports per-endpoint latency."""
+        response = self.session.post(f"{self.daemon.url}/post", json={'text': "Daemon quote", 'platform': 'test'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], {'test': True})
+        self.assertEqual(self.platform.posts[0][1], "Published by, -Unknown-")
+        self.session.post(f"{self.daemon.url}/render", json={'text': ""})
+
+        stats = self.session.get(f"{self.daemon.url}/stats").json()
+        self.assertEqual(stats['endpoints']['post']['jobs'], 1)
+        render = stats['endpoints']['render']
+        self.assertEqual((render['jobs'], render['failed']), (1, 1))
+        self.assertGreater(stats['endpoints']['post']['p50_ms'], 0)
+        self.assertEqual(stats['workers'], 1)
+
+    def test_bad_requests(self):
+        """Test that invalid jobs are rejected with client errors."""
+        url = self.daemon.url
+        self.assertEqual(self.session.post(f"{url}/render", data=b"not json").status_code, 400)
+        self.assertEqual(self.session.post(f"{url}/post", json={'text': "x", 'platform': 'nope'}).status_code, 400)
+        self.assertEqual(self.session.post(f"{url}/unknown", json={}).status_code, 404)
+
+    def test_unexpected_error_returns_500(self):
+        """Test that an unexpected job error is answered with a 500 carrying the job id."""
+        self.poster.add_platform('broken', FailingPlatform())
+        response = self.session.post(f"{self.daemon.url}/post", json={'text': "Daemon quote", 'platform': 'broken'})
+        self.assertEqual(response.status_code, 500)
+        self.assertIn("platform exploded", response.json()['error'])
+        self.assertIn('X-Job-Id', response.headers)
+        self.assertEqual(self.daemon.stats()['endpoints']['post']['failed'], 1)
+
+    def test_drain_finishes_running_jobs(self):
+        """Test that closing waits for running jobs and refuses new ones."""
+        self.platform.delay = 0.5
+        responses = []
+        job = threading.Thread(target=lambda: responses.append(
+            self.session.post(f"{self.daemon.url}/post", json={'text': "Slow post", 'platform': 'test'})))
+        job.start()
+        time.sleep(0.2)
+        self.assertTrue(self.daemon.drain(timeout=5))
+        job.join()
+        self.assertEqual(responses[0].status_code, 200)
+        self.assertEqual(self.session.get(f"{self.daemon.url}/healthz").status_code, 503)
+        self.assertEqual(self.session.post(f"{self.daemon.url}/render", json={'text': "Late"}).status_code, 503)
+
+class TestQuoteDaemonReload(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.temp_dir.name, 'config.json')
+        self.write({'IMAGE_WIDTH': 800, 'IMAGE_HEIGHT': 400})
+        generator = ImageGenerator(ConfigManager(self.config_file))
+        self.daemon = QuoteDaemon(generator, port=0, workers=1, drain_timeout=5).start()
+        self.session = requests.Session()
+        self.session.trust_env = False
+
+    def tearDown(self):
+        self.session.close()
+        self.daemon.close()
+        self.temp_dir.cleanup()
+
+    def write(self, values):
+        with open(self.config_file, 'w') as f:
+            json.dump(values, f)
+
+    def render_size(self):
+        response = self.session.post(f"{self.daemon.url}/render", json={'text': "Reloaded quote"})
+        return Image.open(io.BytesIO(response.content)).size
+
+    def test_reload_reaches_warm_workers(self):
+        """Test that the workers render with the reloaded settings without a restart."""
+        self.assertEqual(self.render_size(), (800, 400))
+        self.write({'IMAGE_WIDTH': 640, 'IMAGE_HEIGHT': 320})
+        self.assertTrue(self.daemon.reload())
+        self.assertEqual(self.render_size(), (640, 320))
+
+    def test_invalid_reload_keeps_settings(self):
+        """Test that an invalid configuration is refused and rendering continues."""
+        self.write({'IMAGE_WIDTH': 0})
+        self.assertFalse(self.daemon.reload())
+        self.assertEqual(self.render_size(), (800, 400))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+from PIL import Image
+from config.config import ConfigManager
+from src.quote_maker.encoders import ImageEncoder, ENCODER_PROFILES
+
+class TestEncoders(unittest.TestCase):
+
+    def setUp(self):
+        self.img = Image.new('RGBA', (120, 60), (51, 0, 51))
+
+    def test_profiles_encode(self):
+        """Test that every profile encodes and reports its stats."""
+        signatures = {'PNG': b'\x89PNG', 'JPEG': b'\xff\xd8', 'WEBP': b'RIFF'}
+        for profile in ENCODER_PROFILES:
+            encoder = ImageEncoder.from_profile(profile)
+            data, stats = encoder.encode(self.img)
+            self.assertTrue(data.startswith(signatures[encoder.image_format]), profile)
+            self.assertEqual(stats['size'], len(data))
+            self.assertGreaterEqual(stats['encode_ms'], 0)
+
+    def test_from_config(self):
+        """Test that the output format and quality come from configuration."""
+        config_manager = ConfigManager()
+        config_manager.update({'OUTPUT_FORMAT': 'jpeg', 'JPEG_QUALITY': 70})
+        encoder = ImageEncoder.from_config(config_manager)
+        self.assertEqual(encoder.extension, '.jpg')
+        self.assertEqual(encoder.options['quality'], 70)
+
+    def test_unknown_format(self):
+        """Test that an unsupported format is rejected."""
+        with self.assertRaises(ValueError):
+            ImageEncoder('BMP')
+
+if __name__ == "__main__":
+    unittest.main()
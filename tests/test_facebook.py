@@ -0,0 +1,127 @@
+import time
+import unittest
+from config.config import ConfigManager
+from src.quote_maker.facebook import FacebookPoster, PostResult, SocialPlatform, SocialPoster
+from src.quote_maker.http_session import HTTPClient
+from src.quote_maker.mock_graph import MockGraphServer
+
+class FakePlatform(SocialPlatform):
+
+    def __init__(self, delay=0.0, result=True, error=None):
+        self.delay = delay
+        self.result = result
+        self.error = error
+        self.posts = []
+
+    def post_image(self, image_path, message):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.posts.append((image_path, message))
+        return self.result
+
+class TestSocialPoster(unittest.TestCase):
+
+    def setUp(self):
+        config_manager = ConfigManager()
+        config_manager.set('FACEBOOK_ACCESS_TOKEN', None)
+        self.poster = SocialPoster(config_manager)
+
+    def test_post_to_all_platforms_concurrently(self):
+        """Test that platforms are posted to at the same time."""
+        for name in ('one', 'two', 'three'):
+            self.poster.add_platform(name, FakePlatform(delay=0.2))
+        start = time.perf_counter()
+        results = self.poster.post_to_all_platforms(b"image", "message")
+        self.assertEqual(results, {'one': True, 'two': True, 'three': True})
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_slow_platform_times_out(self):
+        """Test that a slow platform is reported as failed without blocking the others."""
+        fast = FakePlatform()
+        self.poster.add_platform('slow', FakePlatform(delay=1.0))
+        self.poster.add_platform('fast', fast)
+        start = time.perf_counter()
+        results = self.poster.post_to_all_platforms(b"image", "message", timeout=0.1)
+        self.assertEqual(results, {'slow': False, 'fast': True})
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(fast.posts, [(b"image", "message")])
+
+    def test_more_platforms_than_default_threads(self):
+        """Test that every platform posts on its own thread."""
+        for number in range(12):
+            self.poster.add_platform(f"platform-{number}", FakePlatform(delay=0.2))
+        start = time.perf_counter()
+        results = self.poster.post_to_all_platforms(b"image", "message", timeout=0.35)
+        self.assertTrue(all(results.values()))
+        self.assertLess(time.perf_counter() - start, 0.35)
+
+    def test_hung_platform_does_not_block_later_calls(self):
+        """Test that a platform hanging across two calls never delays the other platform."""
+        fast = FakePlatform(delay=0.05)
+        self.poster.add_platform('hung', FakePlatform(delay=2.0))
+        self.poster.add_platform('fast', fast)
+        for _ in range(2):
+            start = time.perf_counter()
+            results = self.poster.post_to_all_platforms(b"image", "message", timeout=0.2)
+            self.assertEqual(results, {'hung': False, 'fast': True})
+            self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(len(fast.posts), 2)
+
+    def test_timeout_per_platform(self):
+        """Test that POST_TIMEOUTS gives a platform its own timeout."""
+        config_manager = ConfigManager()
+        config_manager.update({'FACEBOOK_ACCESS_TOKEN': None, 'POST_TIMEOUT': 0.1, 'POST_TIMEOUTS': {'patient': 0.5}})
+        poster = SocialPoster(config_manager)
+        poster.add_platform('patient', FakePlatform(delay=0.25))
+        poster.add_platform('strict', FakePlatform(delay=0.4))
+        self.assertEqual(poster.post_to_all_platforms(b"image", "message"), {'patient': True, 'strict': False})
+
+    def test_platform_error(self):
+        """Test that an exception in one platform is reported as a failure."""
+        self.poster.add_platform('broken', FakePlatform(error=RuntimeError("boom")))
+        self.poster.add_platform('working', FakePlatform(result=True))
+        self.assertEqual(self.poster.post_to_all_platforms(b"image", "message"), {'broken': False, 'working': True})
+
+    def test_no_platforms(self):
+        """Test that posting without platforms returns no results."""
+        self.assertEqual(self.poster.post_to_all_platforms(b"image", "message"), {})
+
+class TestFacebookPoster(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockGraphServer(retry_after=7).start()
+        self.client = HTTPClient(retries=0)
+        self.client.session.trust_env = False
+        self.poster = FacebookPoster('1234', 'token', self.server.url, self.client)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+
+    def test_post_image(self):
+        """Test that a post reaches the photos endpoint."""
+        self.assertEqual(self.poster.post(b"\x89PNG image", "message"), PostResult(True))
+        self.assertEqual(self.server.stats()['posted'], 1)
+
+    def test_server_error(self):
+        """Test that a failed post is reported without a retry delay."""
+        self.server.error_rate = 1.0
+        self.assertEqual(self.poster.post(b"image", "message"), PostResult(False))
+
+    def test_throttled_post_returns_retry_after(self):
+        """Test that a 429 response reports the Retry-After delay of that post."""
+        self.server.rate_limit = 0.001
+        self.assertEqual(self.poster.post(b"image", "message"), PostResult(False, 7))
+        self.assertEqual(self.server.stats()['throttled'], 1)
+
+    def test_social_poster_uses_graph_url(self):
+        """Test that FACEBOOK_GRAPH_URL redirects the configured Facebook platform."""
+        config_manager = ConfigManager()
+        config_manager.set('FACEBOOK_ACCESS_TOKEN', 'token')
+        config_manager.set('FACEBOOK_GRAPH_URL', self.server.url)
+        poster = SocialPoster(config_manager)
+        self.assertEqual(poster.platforms['facebook'].graph_url, self.server.url)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+from config import config
+from src.quote_maker.font_cache import FontCache
+
+class TestFontCache(unittest.TestCase):
+
+    def test_hit_after_miss(self):
+        """Test that a second lookup is served from the cache."""
+        cache = FontCache()
+        first = cache.get(config.FONT_PATH, config.FONT_SIZE)
+        second = cache.get(config.FONT_PATH, config.FONT_SIZE)
+        self.assertIs(first, second)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used font is evicted."""
+        cache = FontCache(maxsize=2)
+        cache.warm([(config.FONT_PATH, 10), (config.FONT_PATH, 20)])
+        cache.get(config.FONT_PATH, 10)
+        cache.get(config.FONT_PATH, 30)
+        self.assertEqual(cache.stats()['size'], 2)
+        cache.get(config.FONT_PATH, 20)
+        self.assertEqual(cache.stats()['misses'], 4)
+
+    def test_missing_font(self):
+        """Test that a missing font raises IOError and is not cached."""
+        cache = FontCache()
+        with self.assertRaises(IOError):
+            cache.get("missing.ttf", 10)
+        self.assertEqual(cache.stats()['size'], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,9 @@
+import dataclasses
+import io
 import os
+import tempfile
 import unittest
+from PIL import Image
 from src.quote_maker import generator
 from src.quote_maker import generator_cy
 
@@ -53,6 +57,79 @@ class TestGenerator(unittest.TestCase):
         self.assertTrue(os.path.exists(image_path))
         os.remove(image_path)
 
+    def test_create_quote_bytes(self):
+        """Test that an image is encoded in memory without writing a file."""
+        files_before = set(os.listdir('.'))
+        image_data = generator.ImageGenerator().create_quote_bytes("This is a test quote.", "Test Logo")
+        self.assertTrue(image_data.startswith(b'\x89PNG'))
+        self.assertEqual(set(os.listdir('.')), files_before)
+
+    def test_create_quote_images_batch(self):
+        """Test that a batch is rendered over a process pool."""
+        batch = [{'text': f"Quote number {i}", 'logo': "Test Logo"} for i in range(6)]
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = list(generator.ImageGenerator().create_quote_images(batch, workers=2, output_dir=output_dir))
+            self.assertEqual(sorted(result['index'] for result in results), list(range(6)))
+            for result in results:
+                self.assertIsNone(result['error'])
+                self.assertTrue(os.path.exists(result['path']))
+
+    def test_create_quote_images_failure_is_per_item(self):
+        """Test that a failing batch item does not stop the others."""
+        batch = [
+            {'text': "Good quote", 'logo': "Test Logo"},
+            {'text': "Bad quote", 'logo': "Test Logo", 'output_path': "/nonexistent/dir/image.png"},
+        ]
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = {result['index']: result for result in
+                       generator.ImageGenerator().create_quote_images(batch, workers=1, output_dir=output_dir)}
+            self.assertIsNone(results[0]['error'])
+            self.assertIsNotNone(results[1]['error'])
+            self.assertIsNone(results[1]['path'])
+
+    def test_reload_does_not_change_running_render(self):
+        """Test that a render started before a reload finishes with the old settings."""
+        image_generator = generator.ImageGenerator()
+        narrow = dataclasses.replace(image_generator.settings, image_width=600)
+        layout_text = image_generator._layout_text
+
+        def reload_during_layout(text, font, settings):
+            image_generator.reload(narrow)
+            return layout_text(text, font, settings)
+
+        image_generator._layout_text = reload_during_layout
+        first = image_generator.create_quote_bytes("This is a test quote.", "Test Logo")
+        second = image_generator.create_quote_bytes("This is a test quote.", "Test Logo")
+        self.assertEqual(Image.open(io.BytesIO(first)).width, 1200)
+        self.assertEqual(Image.open(io.BytesIO(second)).width, 600)
+
+    def test_reload_swaps_cache_with_settings(self):
+        """Test that a render running during a reload stores its image in the cache of its own settings."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            old_dir, new_dir = os.path.join(temp_dir, 'old'), os.path.join(temp_dir, 'new')
+            image_generator = generator.ImageGenerator()
+            image_generator.reload(dataclasses.replace(image_generator.settings, render_cache_dir=old_dir))
+            narrow = dataclasses.replace(image_generator.settings, image_width=600, render_cache_dir=new_dir)
+            layout_text = image_generator._layout_text
+
+            def reload_during_layout(text, font, settings):
+                image_generator.reload(narrow)
+                return layout_text(text, font, settings)
+
+            image_generator._layout_text = reload_during_layout
+            image_generator.create_quote_bytes("This is a test quote.", "Test Logo")
+            self.assertEqual(len(os.listdir(old_dir)), 1)
+            self.assertEqual(image_generator.render_cache.directory, new_dir)
+            self.assertEqual(image_generator.settings, narrow)
+
+    def test_workers_render_with_snapshot(self):
+        """Test that batch workers render with the generator's settings snapshot."""
+        image_generator = generator.ImageGenerator()
+        image_generator.reload(dataclasses.replace(image_generator.settings, image_width=500, image_height=250))
+        batch = [{'text': f"Quote number {i}", 'logo': "Test Logo"} for i in range(2)]
+        for result in image_generator.create_quote_images(batch, workers=2, in_memory=True):
+            self.assertEqual(Image.open(io.BytesIO(result['image'])).size, (500, 250))
+
     def test_create_quote_image_cy(self):
         """Test the Cython version of the image generator."""
         quote = "This is a test quote."
@@ -0,0 +1,93 @@
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.quote_maker.http_session import HTTPClient
+from src.quote_maker.quote_fetcher import APIQuoteSource
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.clients.add(self.client_address)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            fail = server.failures > 0
+            if fail:
+                server.failures -= 1
+        time.sleep(server.delay)
+
+        if fail:
+            body, status = b'{}', 503
+        else:
+            body, status = json.dumps({'content': 'x', 'text': 'Stub quote', 'author': 'Stub'}).encode(), 200
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with server.lock:
+            server.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+class TestHTTPClient(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.clients = set()
+        self.server.active = 0
+        self.server.max_active = 0
+        self.server.failures = 0
+        self.server.delay = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/random"
+        self.client = HTTPClient(backoff_factor=0, backoff_jitter=0)
+        self.client.session.trust_env = False
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_keep_alive(self):
+        """Test that sequential requests reuse one connection."""
+        for _ in range(5):
+            self.assertEqual(self.client.get(self.url, timeout=5).status_code, 200)
+        self.assertEqual(self.server.requests, 5)
+        self.assertEqual(len(self.server.clients), 1)
+
+    def test_retries_transient_errors(self):
+        """Test that 503 responses are retried until one succeeds."""
+        self.server.failures = 2
+        self.assertEqual(self.client.get(self.url, timeout=5).status_code, 200)
+        self.assertEqual(self.server.requests, 3)
+
+    def test_per_host_limit(self):
+        """Test that concurrent requests to one host are capped."""
+        client = HTTPClient(max_per_host=2)
+        client.session.trust_env = False
+        self.server.delay = 0.05
+        threads = [threading.Thread(target=client.get, args=(self.url,), kwargs={'timeout': 5}) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        client.close()
+        self.assertEqual(self.server.requests, 6)
+        self.assertLessEqual(self.server.max_active, 2)
+
+    def test_api_quote_source(self):
+        """Test that APIQuoteSource fetches through the pooled client."""
+        quote = APIQuoteSource(self.url, client=self.client).get_quote()
+        self.assertEqual(quote, {'text': 'Stub quote', 'author': 'Stub'})
+
+if __name__ == "__main__":
+    unittest.main()
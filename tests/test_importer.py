@@ -0,0 +1,44 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from src.quote_maker.importer import import_files, import_quotes
+from src.quote_maker.quote_fetcher import DatabaseQuoteSource
+
+class TestImporter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'quotes.db')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_import_files(self):
+        """Test that NDJSON and CSV files load in batches and are readable by the database source."""
+        ndjson_path = os.path.join(self.temp_dir.name, 'quotes.ndjson')
+        csv_path = os.path.join(self.temp_dir.name, 'quotes.csv')
+        with open(ndjson_path, 'w', encoding='utf-8') as f:
+            f.writelines(f'{{"text": "Quote {i}", "author": "A"}}\n' for i in range(25))
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write("text,author\nFrom CSV,B\n")
+
+        batches = []
+        stats = import_files(self.db_path, [ndjson_path, csv_path], batch_size=10,
+                             progress=lambda rows, seconds: batches.append(rows))
+        self.assertEqual(stats['rows'], 26)
+        self.assertEqual(batches, [10, 20, 26])
+
+        conn = sqlite3.connect(self.db_path)
+        indexes = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+        conn.close()
+        self.assertNotIn('quotes_author', indexes)
+        self.assertIsNotNone(DatabaseQuoteSource(self.db_path).get_quote())
+
+    def test_invalid_table_name(self):
+        """Test that table names are validated before being used in SQL."""
+        with self.assertRaises(ValueError):
+            import_quotes(self.db_path, [], table_name="quotes; DROP TABLE x")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import io
+import unittest
+from unittest import mock
+from PIL import ImageFont
+from config import config
+from src.quote_maker import layout
+from src.quote_maker.font_cache import get_font
+from src.quote_maker.layout import TextLayout, wrap_widths
+
+class TestLayout(unittest.TestCase):
+
+    def setUp(self):
+        self.font = get_font(config.FONT_PATH, config.FONT_SIZE)
+        self.layout = TextLayout(self.font, 1200, 600, 40)
+
+    def test_lines_fit_width(self):
+        """Test that every wrapped line fits the available pixel width."""
+        text = "This is a very long quote that should definitely wrap to multiple lines in the generated image."
+        lines = self.layout.wrap(text)
+        self.assertGreater(len(lines), 1)
+        for line, line_width in lines:
+            self.assertLessEqual(self.font.getlength(line), 1120 + 1)
+            self.assertAlmostEqual(line_width, self.font.getlength(line), delta=2)
+
+    def test_long_word_is_split(self):
+        """Test that a word wider than the image is broken into pieces."""
+        lines = self.layout.wrap("W" * 200)
+        self.assertGreater(len(lines), 1)
+        self.assertEqual(''.join(line for line, _ in lines), "W" * 200)
+
+    def test_block_is_vertically_centered(self):
+        """Test that the text block is centered vertically."""
+        placed = self.layout.layout("one two three")
+        line_height = self.layout.metrics.line_height
+        self.assertAlmostEqual(placed[0][2], (600 - len(placed) * line_height) / 2)
+
+    def test_empty_text(self):
+        """Test that empty text produces no lines."""
+        self.assertEqual(self.layout.layout(""), [])
+
+    def test_metrics_shared_by_path_and_size(self):
+        """Test that fonts share metrics only when their path and size match."""
+        same = ImageFont.truetype(config.FONT_PATH, config.FONT_SIZE)
+        self.assertIs(layout.get_word_metrics(same), layout.get_word_metrics(self.font))
+        with open(config.FONT_PATH, 'rb') as f:
+            data = f.read()
+        in_memory = ImageFont.truetype(io.BytesIO(data), config.FONT_SIZE * 2)
+        metrics = layout.get_word_metrics(in_memory)
+        self.assertIs(metrics.font, in_memory)
+        self.assertIsNot(layout.get_word_metrics(ImageFont.truetype(io.BytesIO(data), config.FONT_SIZE)), metrics)
+
+    def test_wrap_widths(self):
+        """Test greedy line breaking on precomputed widths."""
+        self.assertEqual(wrap_widths([40, 40, 40], 10, 100), [(0, 2, 90), (2, 3, 40)])
+
+    @unittest.skipUnless(layout.COMPILED, "generator_cy is not built")
+    def test_compiled_layout_matches_python(self):
+        """Test that the compiled kernels produce the same layout as the pure Python ones."""
+        text = "This is a very long quote that should definitely wrap " * 20 + "W" * 120
+        compiled = self.layout.layout(text)
+        with mock.patch.multiple(layout, **layout.PY_KERNELS):
+            python = TextLayout(self.font, 1200, 600, 40).layout(text)
+        self.assertEqual(compiled, python)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import threading
+import time
+import unittest
+from src.quote_maker.generator import ImageGenerator
+from src.quote_maker.pipeline import QuotePipeline
+from src.quote_maker.quote_fetcher import QuoteSource
+
+class CountingSource(QuoteSource):
+
+    def __init__(self, limit=None, delay=0.0):
+        self.limit = limit
+        self.delay = delay
+        self.served = 0
+        self.lock = threading.Lock()
+
+    def get_quote(self):
+        time.sleep(self.delay)
+        with self.lock:
+            if self.limit is not None and self.served >= self.limit:
+                return None
+            self.served += 1
+            return {'text': f"Quote number {self.served}", 'author': "Tester"}
+
+class TestQuotePipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = ImageGenerator()
+        self.published = []
+        self.lock = threading.Lock()
+
+    def publish(self, result, delay=0.0):
+        time.sleep(delay)
+        with self.lock:
+            self.published.append(result)
+        return True
+
+    def test_stages_overlap(self):
+        """Test that slow fetches and posts overlap instead of adding up."""
+        pipeline = QuotePipeline(CountingSource(delay=0.05), self.generator, lambda result: self.publish(result, 0.1),
+                                 fetch_workers=4, render_workers=2, publish_workers=4)
+        arrivals = []
+        results = []
+        for result in pipeline.run(8):
+            arrivals.append(time.perf_counter())
+            results.append(result)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result['published'] for result in results))
+        self.assertTrue(all(result['image'].startswith(b'\x89PNG') for result in self.published))
+        self.assertTrue(all('image' not in result for result in results))
+        # Timed from the first result, so starting the process pool does not count;
+        # one after another, the other 7 fetches and posts would take 7 * 0.15s
+        self.assertLess(arrivals[-1] - arrivals[0], 7 * 0.15)
+        stats = pipeline.stats()
+        self.assertEqual((stats['rendered'], stats['published']), (8, 8))
+
+    def test_page_name_and_filter(self):
+        """Test that filtered quotes are skipped and the page name is used as logo."""
+        pipeline = QuotePipeline(CountingSource(), self.generator, self.publish, page_name="My Page",
+                                 fetch_workers=1, render_workers=1,
+                                 quote_filter=lambda quote: quote['text'] != "Quote number 2")
+        results = list(pipeline.run(3))
+        self.assertEqual(sorted(result['text'] for result in results),
+                         ["Quote number 1", "Quote number 3", "Quote number 4"])
+        self.assertTrue(all(result['logo'] == "Published by, -My Page-" for result in results))
+        self.assertEqual(pipeline.stats()['skipped'], 1)
+
+    def test_spread_out_duplicates_do_not_end_run(self):
+        """Test that only consecutive skips count against the filter's limit."""
+        source = CountingSource()
+        pipeline = QuotePipeline(source, self.generator, self.publish, fetch_workers=2, render_workers=1,
+                                 quote_filter=lambda quote: int(quote['text'].split()[-1]) % 2 == 0)
+        pipeline.MAX_CONSECUTIVE_SKIPS = 3
+        self.assertEqual(len(list(pipeline.run(5))), 5)
+        self.assertEqual(pipeline.stats()['skipped'], source.served - 5)
+        self.assertLessEqual(source.served, 11)
+
+    def test_source_exhaustion_ends_run(self):
+        """Test that the run ends when the source stops returning quotes."""
+        pipeline = QuotePipeline(CountingSource(limit=2), self.generator, self.publish,
+                                 fetch_workers=1, render_workers=1, fetch_timeout=0.2)
+        self.assertEqual(len(list(pipeline.run(5))), 2)
+
+    def test_fetches_stop_at_count(self):
+        """Test that the run takes no more quotes from the source than it needs."""
+        source = CountingSource()
+        pipeline = QuotePipeline(source, self.generator, self.publish, fetch_workers=4, render_workers=1)
+        self.assertEqual(len(list(pipeline.run(3))), 3)
+        self.assertEqual(source.served, 3)
+
+    def test_publish_failure(self):
+        """Test that a failing publish is reported per item."""
+        def publish(result):
+            raise RuntimeError("upload failed")
+        pipeline = QuotePipeline(CountingSource(), self.generator, publish, fetch_workers=1, render_workers=1)
+        results = list(pipeline.run(2))
+        self.assertEqual([result['error'] for result in results], ["upload failed", "upload failed"])
+        self.assertEqual(pipeline.stats()['publish_failed'], 2)
+
+if __name__ == "__main__":
+    unittest.main()
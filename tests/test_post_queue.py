@@ -0,0 +1,152 @@
+import os
+import tempfile
+import time
+import unittest
+from config.config import ConfigManager
+from src.quote_maker.facebook import PostResult, SocialPlatform, SocialPoster, parse_retry_after
+from src.quote_maker.post_queue import PostQueue, PostScheduler, RateLimiter
+
+class ScriptedPlatform(SocialPlatform):
+
+    def __init__(self, outcomes=None):
+        # Each outcome is True, False or a Retry-After in seconds; posts succeed once they run out
+        self.outcomes = list(outcomes or [])
+        self.posts = []
+
+    def post_image(self, image_path, message):
+        return self.post(image_path, message).success
+
+    def post(self, image_path, message):
+        self.posts.append((image_path, message))
+        outcome = self.outcomes.pop(0) if self.outcomes else True
+        if outcome is True or outcome is False:
+            return PostResult(outcome)
+        return PostResult(False, outcome)
+
+class TestPostQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'posts.db')
+        self.queue = PostQueue(self.db_path)
+        config_manager = ConfigManager()
+        config_manager.set('FACEBOOK_ACCESS_TOKEN', None)
+        self.poster = SocialPoster(config_manager)
+
+    def tearDown(self):
+        self.queue.pool.close()
+        self.temp_dir.cleanup()
+
+    def scheduler(self, **kwargs):
+        options = {'backoff_base': 0.01, 'backoff_max': 0.05, 'poll_interval': 0.01}
+        options.update(kwargs)
+        return PostScheduler(self.queue, self.poster, **options)
+
+    def test_queue_survives_reopening(self):
+        """Test that queued posts and their images are persisted."""
+        self.queue.enqueue('test', b"image-bytes", "first", meta={'text': "A quote"})
+        self.queue.enqueue('test', "/tmp/image.png", "second")
+        posts = PostQueue(self.db_path).claim('test', 10)
+        self.assertEqual([post['message'] for post in posts], ["first", "second"])
+        self.assertEqual(posts[0]['image'], b"image-bytes")
+        self.assertEqual(posts[0]['meta'], {'text': "A quote"})
+        self.assertEqual(posts[1]['image'], "/tmp/image.png")
+        self.assertEqual(self.queue.claim('test', 10), [])
+
+    def test_interrupted_posts_are_recovered(self):
+        """Test that posts claimed by a crashed scheduler are sent again once the lease expired."""
+        self.queue.enqueue('test', b"image", "message")
+        self.queue.claim('test', 10)
+        platform = ScriptedPlatform()
+        self.poster.add_platform('test', platform)
+        self.assertTrue(self.scheduler(claim_lease=0).drain(timeout=5))
+        self.assertEqual(len(platform.posts), 1)
+
+    def test_fresh_claims_are_not_taken_over(self):
+        """Test that a second scheduler leaves posts another one is still sending alone."""
+        self.queue.enqueue('test', b"image", "message")
+        self.queue.claim('test', 10)
+        other = PostQueue(self.db_path)
+        self.assertNotEqual(other.owner, self.queue.owner)
+        self.assertEqual(other.recover(lease=60), 0)
+        self.assertEqual(other.recover(lease=60, now=time.time() + 61), 1)
+
+    def test_close_returns_own_claims(self):
+        """Test that closing a scheduler hands back the posts its queue claimed, and only those."""
+        self.queue.enqueue('test', b"image", "mine")
+        self.queue.claim('test', 10)
+        other = PostQueue(self.db_path)
+        other.enqueue('test', b"image", "theirs")
+        other.claim('test', 10)
+        self.scheduler().close()
+        self.assertEqual([post['message'] for post in self.queue.claim('test', 10)], ["mine"])
+        self.assertEqual(self.queue.counts()['sending'], 2)
+
+    def test_drain_posts_and_reports(self):
+        """Test that draining sends every post and calls on_posted."""
+        platform = ScriptedPlatform()
+        self.poster.add_platform('test', platform)
+        for number in range(5):
+            self.queue.enqueue('test', b"image", f"message {number}")
+        posted = []
+        scheduler = self.scheduler(on_posted=posted.append)
+        self.assertTrue(scheduler.drain(timeout=5))
+        self.assertEqual([post['message'] for post in posted], [f"message {number}" for number in range(5)])
+        self.assertEqual(scheduler.stats()['done'], 5)
+
+    def test_failures_back_off_then_give_up(self):
+        """Test that failed posts are retried and marked failed after max_attempts."""
+        platform = ScriptedPlatform([False, False, False])
+        self.poster.add_platform('test', platform)
+        self.queue.enqueue('test', b"image", "doomed")
+        scheduler = self.scheduler(max_attempts=3)
+        self.assertTrue(scheduler.drain(timeout=5))
+        self.assertEqual(len(platform.posts), 3)
+        self.queue.enqueue('test', b"image", "sent")
+        self.assertTrue(scheduler.drain(timeout=5))
+        stats = scheduler.stats()
+        self.assertEqual((stats['done'], stats['failed'], stats['retried']), (1, 1, 2))
+
+    def test_retry_after_blocks_platform(self):
+        """Test that a throttled post holds back the rest of the batch."""
+        platform = ScriptedPlatform([0.3])
+        self.poster.add_platform('test', platform)
+        for number in range(3):
+            self.queue.enqueue('test', b"image", f"message {number}")
+        scheduler = self.scheduler()
+        self.assertEqual(scheduler.run_once(), 3)
+        self.assertEqual(len(platform.posts), 1)
+        self.assertEqual(scheduler.run_once(), 0)
+        start = time.monotonic()
+        self.assertTrue(scheduler.drain(timeout=5))
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        self.assertEqual(len(platform.posts), 4)
+        self.assertEqual(scheduler.stats()['throttled'], 1)
+
+    def test_rate_limit_bounds_batches(self):
+        """Test that the token bucket caps the posts sent at once."""
+        self.poster.add_platform('test', ScriptedPlatform())
+        for number in range(5):
+            self.queue.enqueue('test', b"image", f"message {number}")
+        scheduler = self.scheduler(rate_limits={'test': 60}, batch_size=2)
+        self.assertEqual(scheduler.run_once(), 2)
+        self.assertEqual(scheduler.run_once(), 0)
+
+    def test_rate_limiter_refills(self):
+        """Test that tokens come back at the configured rate."""
+        limiter = RateLimiter(per_minute=6000, burst=2)
+        self.assertEqual(limiter.available(), 2)
+        limiter.consume(2)
+        self.assertEqual(limiter.available(), 0)
+        time.sleep(0.02)
+        self.assertGreaterEqual(limiter.available(), 1)
+
+    def test_parse_retry_after(self):
+        """Test that Retry-After accepts seconds and HTTP dates."""
+        self.assertEqual(parse_retry_after("120"), 120.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import itertools
+import threading
+import time
+import unittest
+from src.quote_maker.prefetch import PrefetchingQuoteSource
+from src.quote_maker.quote_fetcher import QuoteSource
+
+class CountingSource(QuoteSource):
+
+    def __init__(self, delay=0.0, limit=None):
+        self.delay = delay
+        self.limit = limit
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def get_quote(self):
+        time.sleep(self.delay)
+        with self.lock:
+            number = next(self.counter)
+        if self.limit is not None and number >= self.limit:
+            return None
+        return {'text': f"Quote {number}", 'author': 'Unknown'}
+
+class TestPrefetchingQuoteSource(unittest.TestCase):
+
+    def test_buffer_fills_to_high_water(self):
+        """Test that workers top the buffer up to the high-water mark."""
+        with PrefetchingQuoteSource(CountingSource(), high_water=5) as source:
+            deadline = time.time() + 2
+            while source.metrics()['depth'] < 5 and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(source.metrics()['depth'], 5)
+            self.assertEqual(source.get_quote()['text'], "Quote 0")
+            self.assertEqual(source.metrics()['served'], 1)
+
+    def test_starvation_is_counted(self):
+        """Test that waiting on an empty buffer is recorded as starvation."""
+        with PrefetchingQuoteSource(CountingSource(delay=0.05), high_water=2) as source:
+            self.assertIsNotNone(source.get_quote(timeout=2))
+            self.assertEqual(source.metrics()['starvations'], 1)
+
+    def test_exhausted_source_times_out(self):
+        """Test that an exhausted source yields None after the timeout."""
+        with PrefetchingQuoteSource(CountingSource(limit=1), high_water=2, retry_delay=0.01) as source:
+            self.assertEqual(source.get_quote(timeout=2)['text'], "Quote 0")
+            self.assertIsNone(source.get_quote(timeout=0.1))
+            self.assertGreater(source.metrics()['misses'], 0)
+
+    def test_max_fetches_stops_workers(self):
+        """Test that the workers stop once max_fetches quotes were taken from the source."""
+        source = CountingSource()
+        with PrefetchingQuoteSource(source, high_water=10, workers=3, max_fetches=4) as prefetch:
+            self.assertEqual(sorted(prefetch.get_quote(timeout=2)['text'] for _ in range(4)),
+                             ["Quote 0", "Quote 1", "Quote 2", "Quote 3"])
+            start = time.perf_counter()
+            self.assertIsNone(prefetch.get_quote(timeout=2))
+            self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(next(source.counter), 4)
+
+    def test_extend_resumes_workers(self):
+        """Test that extend() lets paused workers fetch again."""
+        source = CountingSource()
+        with PrefetchingQuoteSource(source, high_water=10, workers=2, max_fetches=1) as prefetch:
+            self.assertEqual(prefetch.get_quote(timeout=2)['text'], "Quote 0")
+            self.assertTrue(prefetch.exhausted())
+            prefetch.extend(2)
+            self.assertEqual(sorted(prefetch.get_quote(timeout=2)['text'] for _ in range(2)), ["Quote 1", "Quote 2"])
+            self.assertIsNone(prefetch.get_quote(timeout=2))
+        self.assertEqual(next(source.counter), 3)
+
+if __name__ == "__main__":
+    unittest.main()
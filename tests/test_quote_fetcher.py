@@ -0,0 +1,141 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from src.quote_maker.quote_fetcher import DatabaseQuoteSource, ManualQuoteSource, QuoteFetcher, QuoteSource
+from src.quote_maker.sqlite_pool import SQLitePool
+
+class TestDatabaseQuoteSource(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'quotes.db')
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE quotes (id INTEGER PRIMARY KEY, text TEXT, author TEXT)")
+        conn.executemany("INSERT INTO quotes (text, author) VALUES (?, ?)",
+                         [(f"Quote {i}", None if i % 2 else f"Author {i}") for i in range(50)])
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_get_quote(self):
+        """Test that a random quote is read from the table."""
+        quote = DatabaseQuoteSource(self.db_path).get_quote()
+        self.assertTrue(quote['text'].startswith("Quote "))
+        self.assertTrue(quote['author'] == 'Unknown' or quote['author'].startswith("Author "))
+
+    def test_get_quotes_batch(self):
+        """Test that several quotes are returned from one call."""
+        self.assertEqual(len(DatabaseQuoteSource(self.db_path).get_quotes(10)), 10)
+
+    def test_empty_table(self):
+        """Test that an empty table returns no quote."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DELETE FROM quotes")
+        conn.commit()
+        conn.close()
+        self.assertIsNone(DatabaseQuoteSource(self.db_path).get_quote())
+
+    def test_missing_table(self):
+        """Test that a database error is logged and returns no quote."""
+        self.assertIsNone(DatabaseQuoteSource(self.db_path, 'missing').get_quote())
+
+    def test_pool_is_read_only(self):
+        """Test that pooled read-only connections reject writes."""
+        pool = SQLitePool(self.db_path, size=1)
+        with self.assertRaises(sqlite3.OperationalError):
+            with pool.connection() as conn:
+                conn.execute("DELETE FROM quotes")
+        with pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM quotes").fetchone()[0], 50)
+        pool.close()
+
+class DelayedSource(QuoteSource):
+
+    def __init__(self, text, delay):
+        self.text = text
+        self.delay = delay
+        self.calls = 0
+
+    def get_quote(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return {'text': self.text, 'author': 'Unknown'} if self.text else None
+
+class TestQuoteFetcher(unittest.TestCase):
+
+    def test_manual_source(self):
+        """Test that a manual quote is returned as given."""
+        quote = QuoteFetcher().get_quote('manual', text="Hello", author="Me")
+        self.assertEqual(quote, {'text': "Hello", 'author': "Me"})
+
+    def test_sources_fallback(self):
+        """Test that the first source returning a quote wins."""
+        fetcher = QuoteFetcher()
+        fetcher.add_source(ManualQuoteSource("   "))
+        fetcher.add_source(ManualQuoteSource("Second"))
+        self.assertEqual(fetcher.get_quote_from_sources()['text'], "Second")
+
+    def test_race_mode(self):
+        """Test that race mode returns the fastest valid quote."""
+        fetcher = QuoteFetcher(mode='race')
+        fetcher.add_source(DelayedSource("Slow", 0.5))
+        fetcher.add_source(DelayedSource("Fast", 0.01))
+        start = time.perf_counter()
+        self.assertEqual(fetcher.get_quote_from_sources()['text'], "Fast")
+        self.assertLess(time.perf_counter() - start, 0.4)
+
+    def test_hedged_mode(self):
+        """Test that a backup source starts once the first one exceeds the hedge delay."""
+        fetcher = QuoteFetcher()
+        slow, backup, unused = DelayedSource("Slow", 0.5), DelayedSource("Backup", 0.01), DelayedSource("Unused", 0)
+        for source in (slow, backup, unused):
+            fetcher.add_source(source)
+        start = time.perf_counter()
+        self.assertEqual(fetcher.get_quote_from_sources('hedged', hedge_delay=0.05)['text'], "Backup")
+        self.assertLess(time.perf_counter() - start, 0.4)
+        self.assertEqual(unused.calls, 0)
+
+    def test_losing_source_does_not_delay_exit(self):
+        """Test that the process exits without waiting for sources that lost the race."""
+        code = ("import time\n"
+                "from src.quote_maker.quote_fetcher import ManualQuoteSource, QuoteFetcher, QuoteSource\n"
+                "class Slow(QuoteSource):\n"
+                "    def get_quote(self):\n"
+                "        time.sleep(5)\n"
+                "fetcher = QuoteFetcher(mode='race')\n"
+                "fetcher.add_source(Slow())\n"
+                "fetcher.add_source(ManualQuoteSource('Fast'))\n"
+                "print(fetcher.get_quote_from_sources()['text'])\n"
+                "fetcher.close()\n")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "Fast")
+        self.assertLess(time.perf_counter() - start, 3)
+
+    def test_timeout(self):
+        """Test that concurrent modes give up after the timeout."""
+        fetcher = QuoteFetcher()
+        fetcher.add_source(DelayedSource("Slow", 0.5))
+        self.assertIsNone(fetcher.get_quote_from_sources('race', timeout=0.05))
+
+    def test_stats_reorder_sources(self):
+        """Test that failing sources are moved behind working ones."""
+        fetcher = QuoteFetcher()
+        failing, working = DelayedSource("", 0), DelayedSource("Works", 0)
+        fetcher.add_source(failing)
+        fetcher.add_source(working)
+        fetcher.get_quote_from_sources()
+        fetcher.get_quote_from_sources()
+        self.assertEqual(failing.calls, 1)
+        self.assertEqual(working.calls, 2)
+        self.assertGreater(fetcher.source_stats[failing].failure_rate, 0)
+
+if __name__ == "__main__":
+    unittest.main()
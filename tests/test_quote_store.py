@@ -0,0 +1,86 @@
+import os
+import tempfile
+import time
+import unittest
+from src.quote_maker.quote_fetcher import QuoteFetcher
+from src.quote_maker.quote_store import QuoteStore, StoreQuoteSource, normalize_text
+
+class TestQuoteStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'store.db')
+        self.store = QuoteStore(self.db_path)
+
+    def tearDown(self):
+        self.store.pool.close()
+        self.temp_dir.cleanup()
+
+    def test_normalize_text(self):
+        """Test that case, punctuation and spacing are ignored."""
+        self.assertEqual(normalize_text("  Be  yourself; everyone ELSE is taken! "), "be yourself everyone else is taken")
+
+    def test_duplicates_are_rejected(self):
+        """Test that near-identical quotes are stored once."""
+        self.assertTrue(self.store.add("Stay hungry, stay foolish.", "Jobs"))
+        self.assertFalse(self.store.add("stay hungry stay foolish", "Someone"))
+        self.assertEqual(self.store.add_many([{'text': "New one"}, {'text': "Stay Hungry. Stay Foolish"}]), 1)
+        self.assertEqual(self.store.count(), 2)
+        self.assertTrue(self.store.contains("STAY HUNGRY, STAY FOOLISH"))
+
+    def test_add_many_in_batches(self):
+        """Test that add_many commits and reports progress per batch."""
+        batches = []
+        quotes = [{'text': f"Quote {number}"} for number in range(5)] + [{'text': "Quote 0"}]
+        self.assertEqual(self.store.add_many(quotes, batch_size=2, progress=lambda rows, _: batches.append(rows)), 5)
+        self.assertEqual(batches, [2, 4, 6])
+
+    def test_records_without_text_are_skipped(self):
+        """Test that records with missing, null or blank text are not added."""
+        self.assertEqual(self.store.add_many([{'text': None}, {'author': "A"}, {'text': "  "}, {'text': "Kept"}]), 1)
+        self.assertEqual(self.store.count(), 1)
+
+    def test_recently_posted_quotes_are_excluded(self):
+        """Test that quotes posted within the window are not drawn."""
+        self.store.add("Posted yesterday")
+        self.store.add("Never posted")
+        self.store.mark_posted("Posted yesterday", posted_at=time.time() - 86400)
+        self.store.mark_posted("Posted long ago", posted_at=time.time() - 90 * 86400)
+        source = StoreQuoteSource(self.store, exclude_posted_days=30)
+        texts = {source.get_quote()['text'] for _ in range(30)}
+        self.assertEqual(texts, {"Never posted", "Posted long ago"})
+        self.assertTrue(self.store.posted_within("posted yesterday", 7))
+        self.assertFalse(self.store.posted_within("Posted long ago", 7))
+
+    def test_draws_are_fair_among_eligible_quotes(self):
+        """Test that a run of recently posted quotes does not favor the eligible quote after it."""
+        self.store.add("First")
+        self.store.add_many({'text': f"Posted {number}"} for number in range(100))
+        self.store.add("Second")
+        self.store.add("Third")
+        now = time.time()
+        for number in range(100):
+            self.store.mark_posted(f"Posted {number}", posted_at=now)
+        for probes in (QuoteStore.RANDOM_PROBES, 0):
+            self.store.RANDOM_PROBES = probes
+            draws = [self.store.random_quote(exclude_posted_days=1)['text'] for _ in range(600)]
+            for text in ("First", "Second", "Third"):
+                self.assertGreater(draws.count(text), 100, (probes, text))
+
+    def test_nothing_eligible(self):
+        """Test that no quote is drawn when every quote was posted recently."""
+        self.store.mark_posted("Only quote")
+        self.assertIsNone(self.store.random_quote(exclude_posted_days=1))
+        self.assertEqual(self.store.random_quote()['text'], "Only quote")
+
+    def test_store_source_type(self):
+        """Test that QuoteFetcher creates a store source by type."""
+        self.store.add("From the store", "Me")
+        fetcher = QuoteFetcher()
+        quote = fetcher.get_quote('store', db_path=self.db_path)
+        self.assertEqual(quote, {'text': "From the store", 'author': "Me"})
+        self.assertIs(fetcher.create_source('store', db_path=self.db_path).store,
+                      fetcher.create_source('store', db_path=self.db_path).store)
+
+if __name__ == "__main__":
+    unittest.main()
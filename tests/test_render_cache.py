@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+from config.config import ConfigManager
+from src.quote_maker.generator import ImageGenerator
+from src.quote_maker.render_cache import RenderCache
+
+class TestRenderCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, 'cache')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_put_and_get(self):
+        """Test that a stored entry is returned on the next lookup."""
+        cache = RenderCache(self.cache_dir)
+        key = RenderCache.make_key(text="quote", color=[0, 0, 0])
+        self.assertIsNone(cache.get(key))
+        cache.put(key, b"image")
+        self.assertEqual(cache.get(key), b"image")
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_key_depends_on_inputs(self):
+        """Test that different inputs produce different keys."""
+        self.assertNotEqual(RenderCache.make_key(text="a", size=50), RenderCache.make_key(text="a", size=51))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted past the size cap."""
+        cache = RenderCache(self.cache_dir, max_bytes=10)
+        cache.put('old', b"12345")
+        os.utime(os.path.join(self.cache_dir, 'old'), (1, 1))
+        cache.put('new', b"12345")
+        cache.put('newest', b"12345")
+        self.assertIsNone(cache.get('old'))
+        self.assertEqual(cache.get('newest'), b"12345")
+        self.assertLessEqual(cache.stats()['bytes'], 10)
+
+    def test_overwrite_counts_bytes_once(self):
+        """Test that storing a key twice counts only the latest entry's bytes."""
+        cache = RenderCache(self.cache_dir)
+        cache.put('key', b"12345")
+        cache.put('key', b"123")
+        self.assertEqual(cache.stats()['bytes'], 3)
+
+    def test_generator_key_tracks_font_file(self):
+        """Test that replacing the font file at the same path changes the cache key."""
+        font_path = os.path.join(self.temp_dir.name, 'Quote.ttf')
+        shutil.copy('src/quote_maker/fonts/Quote.ttf', font_path)
+        config_manager = ConfigManager()
+        config_manager.update({'RENDER_CACHE_DIR': self.cache_dir, 'FONT_PATH': font_path})
+        generator = ImageGenerator(config_manager)
+        args = ("quote", "logo", (0, 0, 0), generator.settings, generator.encoder)
+        key = generator._render_cache_key(*args)
+        with open(font_path, 'ab') as f:
+            f.write(b"\0")
+        self.assertNotEqual(generator._render_cache_key(*args), key)
+
+    def test_generator_reuses_cached_render(self):
+        """Test that ImageGenerator returns the cached artifact on a rerun."""
+        config_manager = ConfigManager()
+        config_manager.update({'RENDER_CACHE_DIR': self.cache_dir})
+        first, first_stats = ImageGenerator(config_manager)._render("This is a test quote.", "Test Logo")
+        second, second_stats = ImageGenerator(config_manager)._render("This is a test quote.", "Test Logo")
+        self.assertFalse(first_stats['cached'])
+        self.assertTrue(second_stats['cached'])
+        self.assertEqual(first, second)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time allowed for the CLI module; loading PIL, requests
+# and every component eagerly took about 200 ms
+IMPORT_BUDGET_MS = 100
+
+HEAVY_MODULES = ('PIL', 'requests', 'urllib3', 'sqlite3')
+
+def parse_import_times(output):
+    """Get the cumulative import time in ms of each module from -X importtime output."""
+    times = {}
+    for line in output.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative) / 1000
+    return times
+
+def import_times(code):
+    """Run code with -X importtime and return the cumulative import time in ms of each module."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return parse_import_times(result.stderr)
+
+class TestStartup(unittest.TestCase):
+
+    def test_cli_import_budget(self):
+        """Test that importing the CLI stays within budget and skips the heavy dependencies."""
+        times = import_times("import src.quote_maker.main")
+        self.assertLess(times['src.quote_maker.main'], IMPORT_BUDGET_MS)
+        loaded = [name for name in times if name.split('.')[0] in HEAVY_MODULES]
+        self.assertEqual(loaded, [])
+
+    def test_help_does_not_load_components(self):
+        """Test that --help exits without importing the components or their dependencies."""
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-m', 'src.quote_maker.main', '--help'],
+                                cwd=ROOT, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0)
+        self.assertIn('--encoder-profile', result.stdout)
+        times = parse_import_times(result.stderr)
+        self.assertIn('config.config', times)
+        loaded = [name for name in times if name.split('.')[0] in HEAVY_MODULES
+                  or name in ('src.quote_maker.generator', 'src.quote_maker.facebook')]
+        self.assertEqual(loaded, [])
+
+    def test_render_path_skips_network_and_database(self):
+        """Test that rendering without posting does not import requests or sqlite3."""
+        times = import_times("from src.quote_maker.generator import ImageGenerator")
+        self.assertIn('PIL', times)
+        self.assertFalse([name for name in times if name.split('.')[0] in ('requests', 'urllib3', 'sqlite3')])
+
+    def test_drain_queue_skips_renderer(self):
+        """Test that --encoder-profile does not load Pillow on a --drain-queue run."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = os.path.join(temp_dir, 'config.json')
+            with open(config_path, 'w') as f:
+                json.dump({'POST_QUEUE_PATH': os.path.join(temp_dir, 'posts.db'),
+                           'LOG_FILE': os.path.join(temp_dir, 'quote_maker.log')}, f)
+            result = subprocess.run([sys.executable, '-X', 'importtime', '-m', 'src.quote_maker.main',
+                                     '--config', config_path, '--drain-queue', '--encoder-profile', 'fast'],
+                                    cwd=ROOT, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stdout)
+        times = parse_import_times(result.stderr)
+        self.assertNotIn('PIL', times)
+        self.assertNotIn('src.quote_maker.generator', times)
+
+    def test_invalid_settings_are_reported(self):
+        """Test that every rendering mode reports invalid render settings instead of crashing."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = os.path.join(temp_dir, 'config.json')
+            with open(config_path, 'w') as f:
+                json.dump({'FONT_SIZE': 0, 'LOG_FILE': os.path.join(temp_dir, 'quote_maker.log')}, f)
+            for mode in (['--batch', 'quotes.txt', '--encoder-profile', 'fast'],
+                         ['--pipeline', '--quote-source', 'file'], ['--daemon'], ['--campaigns']):
+                result = subprocess.run([sys.executable, '-m', 'src.quote_maker.main', '--config', config_path,
+                                         *mode], cwd=ROOT, capture_output=True, text=True)
+                self.assertEqual(result.returncode, 1, mode)
+                self.assertIn('Invalid settings: FONT_SIZE', result.stdout)
+                self.assertNotIn('Traceback', result.stderr)
+
+    def test_config_loads_on_first_use(self):
+        """Test that importing the config module defers loading until a value is read."""
+        code = ("from config import config; assert config._config_manager is None; "
+                "assert config.FONT_SIZE == config.get_config_manager().FONT_SIZE")
+        subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
+
+if __name__ == "__main__":
+    unittest.main()